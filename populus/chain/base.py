@@ -1,7 +1,5 @@
 from __future__ import absolute_import
 
-from pylru import lrucache
-
 from eth_utils import (
     to_ordered_dict,
 )
@@ -10,16 +8,29 @@ from populus.config.backend import (
     ContractBackendConfig,
 )
 
+from populus.contracts.cache import (
+    BytecodeVerificationCache,
+    CodeCache,
+    DEFAULT_CODE_CACHE_MAX_ENTRIES,
+    DEFAULT_LINKED_BYTECODE_CACHE_MAX_ENTRIES,
+    DEFAULT_VERIFICATION_CACHE_MAX_ENTRIES,
+    DEFAULT_VERIFICATION_CONFIRMATIONS,
+)
 from populus.contracts.provider import (
+    DEFAULT_FACTORY_CACHE_SIZE,
     Provider,
 )
 from populus.contracts.registrar import (
+    DEFAULT_ADDRESS_CACHE_SIZE,
     Registrar,
 )
 from populus.wait import (
     Wait,
 )
 
+from populus.utils.chains import (
+    get_chain_id,
+)
 from populus.utils.config import (
     sort_prioritized_configs,
 )
@@ -40,13 +51,11 @@ class BaseChain(object):
     project = None
     chain_name = None
     config = None
-    _factory_cache = None
 
     def __init__(self, project, chain_name, chain_config):
         self.project = project
         self.chain_name = chain_name
         self.config = chain_config
-        self._factory_cache = lrucache(128)
         self.initialize_chain()
 
     def initialize_chain(self):
@@ -68,6 +77,17 @@ class BaseChain(object):
         if not self._running:
             raise ValueError("The Chain is not running")
         self._running = False
+        self.teardown_contract_backends()
+
+    def teardown_contract_backends(self):
+        """
+        Give each of the contract backends which were set up a chance to
+        persist any buffered state.
+        """
+        # Avoid instantiating the backends just to tear them down.
+        contract_backends = self.__dict__.get('contract_backends', {})
+        for backend in contract_backends.values():
+            backend.teardown_backend()
 
     #
     # Chain Interaction API
@@ -93,6 +113,13 @@ class BaseChain(object):
     def wait(self):
         return Wait(self.web3)
 
+    @cached_property
+    def chain_id(self):
+        """
+        The hash of the chain's genesis block.
+        """
+        return get_chain_id(self.web3)
+
     #
     # +--------------+
     # | Contract API |
@@ -119,6 +146,20 @@ class BaseChain(object):
                 ProviderBackendClass(self, backend_config.get_config('settings')),
             )
 
+    @cached_property
+    def code_cache(self):
+        """
+        Per block cache of the code at addresses which is shared by the
+        provider and the registrar.
+        """
+        return CodeCache(
+            max_entries=self.config.get(
+                'contracts.code_cache_size',
+                DEFAULT_CODE_CACHE_MAX_ENTRIES,
+    DEFAULT_LINKED_BYTECODE_CACHE_MAX_ENTRIES,
+            ),
+        )
+
     #
     # Provider
     #
@@ -129,14 +170,37 @@ class BaseChain(object):
             if backend.is_provider:
                 yield backend_name, backend
 
-    @property
+    @cached_property
     def provider(self):
         if not self.provider_backends:
             raise ValueError(
                 "Must have at least one provider backend "
                 "configured\n{0}".format(self.contract_backend_configs)
             )
-        return Provider(self, self.provider_backends)
+        return Provider(
+            self,
+            self.provider_backends,
+            factory_cache_size=self.config.get(
+                'contracts.provider.factory_cache_size',
+                DEFAULT_FACTORY_CACHE_SIZE,
+            ),
+            bytecode_verification_cache=BytecodeVerificationCache(
+                confirmations=self.config.get(
+                    'contracts.provider.verification_confirmations',
+                    DEFAULT_VERIFICATION_CONFIRMATIONS,
+                ),
+                max_entries=self.config.get(
+                    'contracts.provider.verification_cache_size',
+                    DEFAULT_VERIFICATION_CACHE_MAX_ENTRIES,
+                ),
+                code_cache=self.code_cache,
+            ),
+            code_cache=self.code_cache,
+            linked_bytecode_cache_size=self.config.get(
+                'contracts.provider.linked_bytecode_cache_size',
+                DEFAULT_LINKED_BYTECODE_CACHE_MAX_ENTRIES,
+            ),
+        )
 
     #
     # Registrar
@@ -148,11 +212,19 @@ class BaseChain(object):
             if backend.is_registrar:
                 yield backend_name, backend
 
-    @property
+    @cached_property
     def registrar(self):
         if not self.registrar_backends:
             raise ValueError(
                 "Must have at least one registrar backend "
                 "configured\n{0}".format(self.contract_backend_configs)
             )
-        return Registrar(self, self.registrar_backends)
+        return Registrar(
+            self,
+            self.registrar_backends,
+            address_cache_size=self.config.get(
+                'contracts.registrar.address_cache_size',
+                DEFAULT_ADDRESS_CACHE_SIZE,
+            ),
+            code_cache=self.code_cache,
+        )
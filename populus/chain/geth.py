@@ -126,6 +126,7 @@ class BaseGethChain(BaseChain):
     def __exit__(self, *exc_info):
         self.stack.close()
         self._running = False
+        self.teardown_contract_backends()
 
 
 class LocalGethChain(BaseGethChain):
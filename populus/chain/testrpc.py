@@ -51,3 +51,4 @@ class TestRPCChain(BaseChain):
             self.web3.currentProvider.server.server_close()
         finally:
             self._running = False
+            self.teardown_contract_backends()
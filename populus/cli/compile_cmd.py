@@ -2,17 +2,22 @@ import click
 
 from populus.compilation import (
     compile_project_contracts,
+    compile_project_contracts_incrementally,
 )
 
+from populus.compilation.server import (
+    get_compile_server_client,
+)
 from populus.utils.cli import (
+    load_project_build_assets,
+    serve_project_contracts,
     watch_project_contracts,
+    write_combined_build_assets,
+    write_project_build_assets,
 )
 from populus.utils.compat import (
     spawn,
 )
-from populus.utils.compile import (
-    write_compiled_sources,
-)
 
 from .main import main
 
@@ -24,23 +29,59 @@ from .main import main
     is_flag=True,
     help="Watch contract source files and recompile on changes",
 )
+@click.option(
+    '--full/--incremental',
+    default=False,
+    help=(
+        "Recompile every contract source file rather than only the files "
+        "which have changed since the last build"
+    ),
+)
+@click.option(
+    '--serve',
+    is_flag=True,
+    help=(
+        "Run a compile server which keeps the project loaded and compiles on "
+        "request from other populus commands and test runs"
+    ),
+)
 @click.pass_context
-def compile_cmd(ctx, watch):
+def compile_cmd(ctx, watch, full, serve):
     """
-    Compile project contracts, storing their output in `./build/contracts.json`
+    Compile project contracts, storing their output in `./build/contracts/`
 
     Call bare to compile all contracts or specify contract names or file paths
     to restrict to only compiling those contracts.
 
     Pass in a file path and a contract name separated by a colon(":") to
     specify only named contracts in the specified file.
+
+    With `--serve` a compile server is started on `./build/compile-server.sock`
+    after compiling.  While it is running the project's contracts are compiled
+    by the server for other populus commands and the pytest plugin.
     """
     project = ctx.obj['PROJECT']
 
-    _, compiled_contract_data = compile_project_contracts(project)
-    write_compiled_sources(project.compiled_contracts_asset_path, compiled_contract_data)
+    if not full and not serve and get_compile_server_client(project.build_asset_dir):
+        # The compile server writes the per-contract build artifacts itself.
+        write_combined_build_assets(project, project.compiled_contract_data)
+    else:
+        previous_compiled_contract_data, previous_build_mtime = load_project_build_assets(
+            project,
+        )
+        if full or previous_compiled_contract_data is None:
+            _, compiled_contract_data = compile_project_contracts(project)
+        else:
+            _, compiled_contract_data = compile_project_contracts_incrementally(
+                project,
+                previous_compiled_contract_data,
+                previous_build_mtime,
+            )
+        write_project_build_assets(project, compiled_contract_data)
 
-    if watch:
+    if serve:
+        serve_project_contracts(project)
+    elif watch:
         thread = spawn(
             watch_project_contracts,
             project=project,
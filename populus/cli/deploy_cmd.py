@@ -9,7 +9,7 @@ from populus.utils.chains import (
 )
 from populus.utils.cli import (
     select_chain,
-    deploy_contract_and_verify,
+    _deploy_contract_and_verify,
     select_project_contract,
 )
 from populus.utils.compat import (
@@ -115,6 +115,7 @@ def deploy_cmd(ctx, chain_name, wait_for_sync, contracts_to_deploy):
         deploy_order = get_deploy_order(
             contracts_to_deploy,
             contract_data,
+            project.dependency_graph,
         )
 
         # Display Start Message Info.
@@ -130,41 +131,54 @@ def deploy_cmd(ctx, chain_name, wait_for_sync, contracts_to_deploy):
         )
         logger.info(starting_msg)
 
-        for contract_name, _ in deploy_order.items():
-            if not provider.are_contract_dependencies_available(contract_name):
-                raise ValueError(
-                    "Something is wrong with the deploy order.  Some "
-                    "dependencies for {0} are not "
-                    "available.".format(contract_name)
-                )
+        # Resolve which contracts are already available in a single pass.
+        # Contracts deployed below are recorded as available as they go.
+        contract_availability = provider.resolve_contract_availability(deploy_order.keys())
+
+        # Record the deployed addresses as a single batch.
+        with registrar.batch():
+            for contract_name, _ in deploy_order.items():
+                contract_dependencies = project.dependency_graph.get_dependencies(contract_name)
+                if not all(contract_availability[name] for name in contract_dependencies):
+                    raise ValueError(
+                        "Something is wrong with the deploy order.  Some "
+                        "dependencies for {0} are not "
+                        "available.".format(contract_name)
+                    )
 
-            # Check if we already have an existing deployed version of that
-            # contract (via the registry).  For each of these, prompt the user
-            # if they would like to use the existing version.
-            if provider.is_contract_available(contract_name):
-                # TODO: this block should be a standalone cli util.
-                # TODO: this block needs to use the `Provider` API
-                existing_contract_instance = provider.get_contract(contract_name)
-                found_existing_contract_prompt = (
-                    "Found existing version of {name} in registrar. "
-                    "Would you like to use the previously deployed "
-                    "contract @ {address}?".format(
-                        name=contract_name,
-                        address=existing_contract_instance.address,
+                # Check if we already have an existing deployed version of that
+                # contract (via the registry).  For each of these, prompt the user
+                # if they would like to use the existing version.
+                if contract_availability[contract_name]:
+                    # TODO: this block should be a standalone cli util.
+                    # TODO: this block needs to use the `Provider` API
+                    existing_contract_instance = provider.get_contract(contract_name)
+                    found_existing_contract_prompt = (
+                        "Found existing version of {name} in registrar. "
+                        "Would you like to use the previously deployed "
+                        "contract @ {address}?".format(
+                            name=contract_name,
+                            address=existing_contract_instance.address,
+                        )
                     )
+                    if click.prompt(found_existing_contract_prompt, default=True):
+                        continue
+
+                # We don't have an existing version of this contract available so
+                # deploy it.
+                contract_instance, deploy_txn_hash, deploy_receipt = _deploy_contract_and_verify(
+                    chain,
+                    contract_name=contract_name,
                 )
-                if click.prompt(found_existing_contract_prompt, default=True):
-                    continue
-
-            # We don't have an existing version of this contract available so
-            # deploy it.
-            contract_instance = deploy_contract_and_verify(
-                chain,
-                contract_name=contract_name,
-            )
 
-            # Store the contract address for linking of subsequent deployed contracts.
-            registrar.set_contract_address(contract_name, contract_instance.address)
+                # Store the contract address for linking of subsequent deployed contracts.
+                registrar.set_contract_address(
+                    contract_name,
+                    contract_instance.address,
+                    deploy_transaction_hash=deploy_txn_hash,
+                    deploy_block_number=deploy_receipt['blockNumber'],
+                )
+                contract_availability[contract_name] = True
 
         # TODO: fix this message.
         success_msg = (
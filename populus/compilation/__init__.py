@@ -1,26 +1,44 @@
 from __future__ import absolute_import
 
 import itertools
+import json
 import logging
 import os
 
+from populus.utils.artifacts import (
+    get_recorded_source_paths,
+)
 from populus.utils.compile import (
-    get_project_source_paths,
-    get_test_source_paths,
+    get_dependent_source_paths,
+    get_source_import_graph,
 )
 
+from .cache import (
+    get_source_cache_key,
+)
 
-def compile_project_contracts(project):
-    logger = logging.getLogger('populus.compilation.compile_project_contracts')
 
-    project_contract_source_paths = get_project_source_paths(project.contracts_source_dir)
+def find_project_source_paths(project):
+    logger = logging.getLogger('populus.compilation.find_project_source_paths')
+
+    # A source index which is not watching for changes keeps its listing until
+    # it is invalidated, so it is brought up to date before each compilation.
+    if not project.source_index.is_watching:
+        project.source_index.invalidate()
+    indexed_source_files = project.source_index.get_indexed_source_files()
+
+    project_contract_source_paths = tuple(sorted(
+        indexed_source_files[project.contracts_source_dir]
+    ))
     logger.debug(
         "Found %s project source files: %s",
         len(project_contract_source_paths),
         ", ".join(project_contract_source_paths),
     )
 
-    test_contract_source_paths = get_test_source_paths(project.tests_dir)
+    test_contract_source_paths = tuple(sorted(
+        indexed_source_files[project.tests_dir]
+    ))
     logger.debug(
         "Found %s test source files: %s",
         len(test_contract_source_paths),
@@ -31,12 +49,132 @@ def compile_project_contracts(project):
         project_contract_source_paths,
         test_contract_source_paths,
     ))
+    return all_source_paths
+
+
+def get_compiler_backend_path(compiler_backend):
+    return '.'.join((
+        type(compiler_backend).__module__,
+        type(compiler_backend).__name__,
+    ))
 
+
+def get_compiler_info(project):
+    """
+    Return a JSON serializable description of the project compiler backend,
+    its version, settings and the import remappings.  It is recorded in the
+    build artifacts so that they are rebuilt whenever any of these change.
+    The version is `None` if it cannot be determined.
+    """
     compiler_backend = project.get_compiler_backend()
-    compiled_contract_data = compiler_backend.get_compiled_contract_data(
-        source_file_paths=all_source_paths,
-        import_remappings=None,
+    try:
+        compiler_version = compiler_backend.get_compiler_version()
+    except OSError:
+        # The compiler is not installed.
+        compiler_version = None
+
+    compiler_info = {
+        'backend': get_compiler_backend_path(compiler_backend),
+        'version': compiler_version,
+        'settings': compiler_backend.compiler_settings,
+        'import_remappings': project.config.get('compilation.import_remappings'),
+    }
+    # Round trip through JSON so that the result compares equal to the one
+    # read back from the artifact index.
+    return json.loads(json.dumps(compiler_info, sort_keys=True))
+
+
+def compile_source_paths(project, source_paths, import_graph=None):
+    """
+    Compile the given source paths with the project compiler backend.  When
+    the project has a compilation cache, the output for each source file is
+    read from the cache and only the source files which miss the cache are
+    passed to the compiler.
+    """
+    logger = logging.getLogger('populus.compilation.compile_source_paths')
+
+    compiler_backend = project.get_compiler_backend()
+    compilation_cache = project.compilation_cache
+    import_remappings = project.config.get('compilation.import_remappings')
+
+    if compilation_cache is None or not source_paths:
+        compiler_version = None
+    else:
+        compiler_version = compiler_backend.get_compiler_version()
+
+    # Without a known compiler version the cached output cannot be trusted.
+    if compiler_version is None:
+        return compiler_backend.get_compiled_contract_data(
+            source_file_paths=source_paths,
+            import_remappings=import_remappings,
+        )
+
+    if import_graph is None:
+        import_graph = get_source_import_graph(source_paths, import_remappings)
+
+    compiler_backend_path = get_compiler_backend_path(compiler_backend)
+    content_hashes = {}
+    cache_keys = {
+        source_path: get_source_cache_key(
+            source_path,
+            import_graph,
+            compiler_backend_path,
+            compiler_version,
+            compiler_backend.compiler_settings,
+            import_remappings,
+            content_hashes=content_hashes,
+        )
+        for source_path in source_paths
+    }
+    cached_contract_data = {
+        source_path: compilation_cache.get(cache_key)
+        for source_path, cache_key in cache_keys.items()
+    }
+    uncached_source_paths = tuple(
+        source_path
+        for source_path in source_paths
+        if cached_contract_data[source_path] is None
+    )
+    logger.debug(
+        "Compilation cache: %s hits, %s misses",
+        len(source_paths) - len(uncached_source_paths),
+        len(uncached_source_paths),
+    )
+
+    compiled_contract_data = {}
+    for source_path in source_paths:
+        if cached_contract_data[source_path] is not None:
+            compiled_contract_data.update(cached_contract_data[source_path])
+
+    if not uncached_source_paths:
+        return compiled_contract_data
+
+    fresh_contract_data = compiler_backend.get_compiled_contract_data(
+        source_file_paths=uncached_source_paths,
+        import_remappings=import_remappings,
     )
+    compiled_contract_data.update(fresh_contract_data)
+
+    # Contract data which does not record its source path cannot be split
+    # into per-file cache entries.
+    if all('source_path' in data for data in fresh_contract_data.values()):
+        for source_path in uncached_source_paths:
+            compilation_cache.set(cache_keys[source_path], {
+                contract_name: contract_data
+                for contract_name, contract_data
+                in fresh_contract_data.items()
+                if contract_data['source_path'] == source_path
+            })
+
+    return compiled_contract_data
+
+
+def compile_project_contracts(project):
+    logger = logging.getLogger('populus.compilation.compile_project_contracts')
+
+    all_source_paths = find_project_source_paths(project)
+
+    compiled_contract_data = compile_source_paths(project, all_source_paths)
 
     logger.info("> Found %s contract source files", len(all_source_paths))
     for path in all_source_paths:
@@ -47,3 +185,77 @@ def compile_project_contracts(project):
         logger.info("  - %s", contract_name)
 
     return all_source_paths, compiled_contract_data
+
+
+def compile_project_contracts_incrementally(project,
+                                            compiled_contract_data,
+                                            compiled_contracts_mtime):
+    """
+    Recompile only the project sources which have been modified since
+    `compiled_contracts_mtime` along with every source which imports them,
+    merging the results into the previously `compiled_contract_data`.
+
+    Falls back to a full compilation if the previous compiled data does not
+    record the source path for each contract.
+    """
+    logger = logging.getLogger('populus.compilation.compile_project_contracts_incrementally')
+
+    recorded_source_paths = get_recorded_source_paths(compiled_contract_data)
+    if compiled_contracts_mtime is None or None in recorded_source_paths.values():
+        logger.debug("Previous compilation is missing source information.  Compiling all sources")
+        return compile_project_contracts(project)
+
+    all_source_paths = find_project_source_paths(project)
+    source_mtimes = project.source_index.get_source_files()
+    compiled_source_paths = set(recorded_source_paths.values())
+    changed_source_paths = set(
+        source_path
+        for source_path
+        in all_source_paths
+        if source_path not in compiled_source_paths or
+        source_mtimes[source_path] > compiled_contracts_mtime
+    )
+
+    import_graph = get_source_import_graph(
+        all_source_paths,
+        project.config.get('compilation.import_remappings'),
+    )
+    source_paths_to_compile = tuple(sorted(
+        get_dependent_source_paths(changed_source_paths, import_graph).intersection(
+            all_source_paths,
+        )
+    ))
+
+    retained_contract_data = {
+        contract_name: compiled_contract_data[contract_name]
+        for contract_name, source_path
+        in recorded_source_paths.items()
+        if source_path in all_source_paths and
+        source_path not in source_paths_to_compile
+    }
+
+    if source_paths_to_compile:
+        recompiled_contract_data = compile_source_paths(
+            project,
+            source_paths_to_compile,
+            import_graph=import_graph,
+        )
+    else:
+        recompiled_contract_data = {}
+
+    logger.info(
+        "> Found %s contract source files (%s changed)",
+        len(all_source_paths),
+        len(changed_source_paths),
+    )
+    for path in source_paths_to_compile:
+        logger.info("  - %s", os.path.relpath(path))
+
+    logger.info("> Compiled %s contracts", len(recompiled_contract_data))
+    for contract_name in sorted(recompiled_contract_data.keys()):
+        logger.info("  - %s", contract_name)
+
+    merged_contract_data = dict(retained_contract_data)
+    merged_contract_data.update(recompiled_contract_data)
+
+    return source_paths_to_compile, merged_contract_data
@@ -6,3 +6,11 @@ class BaseCompilerBackend(object):
 
     def get_compiled_contract_data(self, source_file_paths, import_remappings):
         raise NotImplementedError("Must be implemented by subclasses")
+
+    def get_compiler_version(self):
+        """
+        Return a string identifying the exact compiler used by this backend,
+        or `None` if it cannot be determined, in which case the output of
+        this backend is never cached.
+        """
+        return None
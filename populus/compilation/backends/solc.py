@@ -2,6 +2,7 @@ from __future__ import absolute_import
 
 import json
 import logging
+import multiprocessing
 import pprint
 
 from eth_utils import (
@@ -12,11 +13,24 @@ from eth_utils import (
 
 from solc import (
     compile_files,
+    compile_standard,
+    get_solc_version_string,
 )
 from solc.exceptions import (
     ContractsNotFound,
 )
 
+from populus.utils.compile import (
+    get_source_import_components,
+    get_source_import_graph,
+)
+from populus.utils.linking import (
+    get_link_reference_index,
+)
+from populus.utils.mappings import (
+    get_nested_key,
+)
+
 from .base import BaseCompilerBackend
 
 
@@ -28,11 +42,15 @@ def _load_json_if_string(value):
 
 
 def _get_contract_name(name_from_compiler):
-    # TODO: use the source path.
     _, _, contract_name = name_from_compiler.rpartition(':')
     return contract_name
 
 
+def _get_contract_source_path(name_from_compiler):
+    source_path, _, _ = name_from_compiler.rpartition(':')
+    return source_path or None
+
+
 def _normalize_contract_metadata(metadata):
     if not metadata:
         return None
@@ -43,13 +61,17 @@ def _normalize_contract_metadata(metadata):
 
 
 @to_dict
-def _normalize_combined_json_contract_data(contract_data):
+def _normalize_combined_json_contract_data(contract_data, source_path=None):
+    if source_path is not None:
+        yield 'source_path', source_path
     if 'metadata' in contract_data:
         yield 'metadata', _normalize_contract_metadata(contract_data['metadata'])
     if 'bin' in contract_data:
         yield 'bytecode', add_0x_prefix(contract_data['bin'])
+        yield 'link_references', get_link_reference_index(contract_data['bin'])
     if 'bin-runtime' in contract_data:
         yield 'bytecode_runtime', add_0x_prefix(contract_data['bin-runtime'])
+        yield 'link_references_runtime', get_link_reference_index(contract_data['bin-runtime'])
     if 'abi' in contract_data:
         yield 'abi', _load_json_if_string(contract_data['abi'])
     if 'userdoc' in contract_data:
@@ -58,31 +80,291 @@ def _normalize_combined_json_contract_data(contract_data):
         yield 'devdoc', _load_json_if_string(contract_data['devdoc'])
 
 
+_solc_version_strings = {}
+
+
+def _get_solc_version_string(compiler_settings):
+    solc_binary = compiler_settings.get('solc_binary')
+    if solc_binary not in _solc_version_strings:
+        if solc_binary is None:
+            _solc_version_strings[solc_binary] = get_solc_version_string()
+        else:
+            _solc_version_strings[solc_binary] = get_solc_version_string(
+                solc_binary=solc_binary,
+            )
+    return _solc_version_strings[solc_binary]
+
+
+@to_dict
+def _normalize_standard_json_contract_data(contract_data, source_path):
+    yield 'source_path', source_path
+    if 'metadata' in contract_data:
+        yield 'metadata', _normalize_contract_metadata(contract_data['metadata'])
+    if 'abi' in contract_data:
+        yield 'abi', contract_data['abi']
+    if 'userdoc' in contract_data:
+        yield 'userdoc', contract_data['userdoc']
+    if 'devdoc' in contract_data:
+        yield 'devdoc', contract_data['devdoc']
+
+    evm_output_keys = (
+        ('bytecode', 'evm.bytecode.object', add_0x_prefix),
+        ('bytecode_runtime', 'evm.deployedBytecode.object', add_0x_prefix),
+        ('opcodes', 'evm.bytecode.opcodes', None),
+        ('src_map', 'evm.bytecode.sourceMap', None),
+        ('src_map_runtime', 'evm.deployedBytecode.sourceMap', None),
+    )
+    for key, output_key, normalizer in evm_output_keys:
+        try:
+            value = get_nested_key(contract_data, output_key)
+        except KeyError:
+            continue
+        yield key, value if normalizer is None else normalizer(value)
+
+    link_reference_keys = (
+        ('link_references', 'evm.bytecode'),
+        ('link_references_runtime', 'evm.deployedBytecode'),
+    )
+    for key, bytecode_output_key in link_reference_keys:
+        try:
+            bytecode_output = get_nested_key(contract_data, bytecode_output_key)
+        except KeyError:
+            continue
+        if 'linkReferences' in bytecode_output:
+            yield key, _normalize_standard_json_link_references(
+                bytecode_output['linkReferences'],
+            )
+        elif 'object' in bytecode_output:
+            yield key, get_link_reference_index(bytecode_output['object'])
+
+
+def _normalize_standard_json_link_references(link_references):
+    """
+    Convert the compiler's `linkReferences` output, which gives byte offsets
+    grouped by source file and library name, into a link reference index.
+    """
+    return sorted(
+        (
+            {
+                'name': library_name,
+                'offset': link_reference['start'] * 2,
+                'length': link_reference['length'] * 2,
+            }
+            for library_link_references in link_references.values()
+            for library_name, library_references in library_link_references.items()
+            for link_reference in library_references
+        ),
+        key=lambda link_reference: link_reference['offset'],
+    )
+
+
+def _compile_source_group(source_file_paths, compiler_settings, import_remappings=None):
+    try:
+        if import_remappings:
+            return compile_files(
+                source_file_paths,
+                import_remappings=list(import_remappings),
+                **compiler_settings
+            )
+        else:
+            return compile_files(source_file_paths, **compiler_settings)
+    except ContractsNotFound:
+        return {}
+
+
+def _compile_source_group_star(args):
+    # `multiprocessing.Pool.map` only passes a single argument to the worker.
+    return _compile_source_group(*args)
+
+
 class SolcCombinedJSONBackend(BaseCompilerBackend):
+    """
+    Compiles contracts using the `--combined-json` output of `solc`.
+
+    The `workers` setting controls how many processes are used.  When it is
+    greater than one the source files are partitioned into groups which are
+    connected through their imports and each group is compiled in a separate
+    worker process.
+    """
     logger = logging.getLogger('populus.compilation.backends.solc.SolcCombinedJSONBackend')
 
+    workers = 1
+
+    def __init__(self, settings):
+        compiler_settings = dict(settings)
+        self.workers = compiler_settings.pop('workers', 1)
+        super(SolcCombinedJSONBackend, self).__init__(compiler_settings)
+
     def get_compiled_contract_data(self, source_file_paths, import_remappings):
         self.logger.debug("Compiler Settings: %s", pprint.pformat(self.compiler_settings))
 
-        try:
-            compiled_contracts = compile_files(source_file_paths, **self.compiler_settings)
-        except ContractsNotFound:
-            return {}
+        if self.workers > 1 and len(source_file_paths) > 1:
+            compiled_contracts = self._compile_in_parallel(source_file_paths, import_remappings)
+        else:
+            compiled_contracts = _compile_source_group(
+                source_file_paths,
+                self.compiler_settings,
+                import_remappings,
+            )
 
         normalized_compiled_contracts = dict(
             (
                 _get_contract_name(name_from_compiler),
-                _normalize_combined_json_contract_data(data_from_compiler),
+                _normalize_combined_json_contract_data(
+                    data_from_compiler,
+                    source_path=_get_contract_source_path(name_from_compiler),
+                ),
             )
             for name_from_compiler, data_from_compiler
-            in compiled_contracts.items()
+            in sorted(compiled_contracts.items())
         )
 
         return normalized_compiled_contracts
 
+    def get_compiler_version(self):
+        return _get_solc_version_string(self.compiler_settings)
+
+    #
+    # Private API
+    #
+    def _compile_in_parallel(self, source_file_paths, import_remappings):
+        source_groups = get_source_import_components(
+            source_file_paths,
+            get_source_import_graph(source_file_paths, import_remappings),
+        )
+        num_workers = min(self.workers, len(source_groups))
+
+        self.logger.debug(
+            "Compiling %s source groups across %s worker processes",
+            len(source_groups),
+            num_workers,
+        )
+
+        if num_workers <= 1:
+            return _compile_source_group(
+                source_file_paths,
+                self.compiler_settings,
+                import_remappings,
+            )
+
+        pool = multiprocessing.Pool(processes=num_workers)
+        try:
+            group_outputs = pool.map(_compile_source_group_star, [
+                (source_group, self.compiler_settings, import_remappings)
+                for source_group in source_groups
+            ])
+        finally:
+            pool.close()
+            pool.join()
+
+        compiled_contracts = {}
+        for group_output in group_outputs:
+            compiled_contracts.update(group_output)
+        return compiled_contracts
+
+
+DEFAULT_STANDARD_JSON_OUTPUT_SELECTION = (
+    'abi',
+    'evm.bytecode.object',
+    'evm.bytecode.linkReferences',
+    'evm.deployedBytecode.object',
+    'evm.deployedBytecode.linkReferences',
+)
+
+# The settings which are passed through to `solc.compile_standard`.
+STANDARD_JSON_SOLC_KWARGS = (
+    'allow_empty',
+    'allow_paths',
+    'solc_binary',
+)
+
 
 class SolcStandardJSONBackend(BaseCompilerBackend):
+    """
+    Compiles contracts using the `--standard-json` interface of `solc`.
+
+    Only the outputs named in the `output_selection` setting are requested
+    from the compiler.  It may either be a list of output names which is
+    requested for every contract in the compiled source files, or a full
+    standard JSON `outputSelection` object.
+    """
     logger = logging.getLogger('populus.compilation.backends.solc.SolcStandardJSONBackend')
 
     def get_compiled_contract_data(self, source_file_paths, import_remappings):
-        raise NotImplementedError("Not yet implemented")
+        self.logger.debug("Compiler Settings: %s", pprint.pformat(self.compiler_settings))
+
+        if not source_file_paths:
+            return {}
+
+        compiler_input = self._get_compiler_input(source_file_paths, import_remappings)
+
+        try:
+            compiler_output = compile_standard(compiler_input, **self._get_solc_kwargs())
+        except ContractsNotFound:
+            return {}
+
+        normalized_compiled_contracts = dict(
+            (
+                contract_name,
+                _normalize_standard_json_contract_data(
+                    data_from_compiler,
+                    source_path=source_path,
+                ),
+            )
+            for source_path, contracts_from_compiler
+            in sorted(compiler_output.get('contracts', {}).items())
+            for contract_name, data_from_compiler
+            in sorted(contracts_from_compiler.items())
+        )
+
+        return normalized_compiled_contracts
+
+    def get_compiler_version(self):
+        return _get_solc_version_string(self.compiler_settings)
+
+    #
+    # Private API
+    #
+    def _get_output_selection(self, source_file_paths):
+        output_selection = self.compiler_settings.get(
+            'output_selection',
+            DEFAULT_STANDARD_JSON_OUTPUT_SELECTION,
+        )
+        if isinstance(output_selection, dict):
+            return output_selection
+        return {
+            source_path: {'*': list(output_selection)}
+            for source_path in source_file_paths
+        }
+
+    def _get_compiler_input(self, source_file_paths, import_remappings):
+        # Imported files must be provided as sources as well, but outputs are
+        # only selected for the requested files.
+        import_graph = get_source_import_graph(source_file_paths, import_remappings)
+        sources = {}
+        for source_path in sorted(import_graph.keys()):
+            with open(source_path) as source_file:
+                sources[source_path] = {'content': source_file.read()}
+
+        return {
+            'language': 'Solidity',
+            'sources': sources,
+            'settings': {
+                'remappings': list(import_remappings or []),
+                'optimizer': {
+                    'enabled': bool(self.compiler_settings.get('optimize', False)),
+                    'runs': self.compiler_settings.get('optimize_runs', 200),
+                },
+                'outputSelection': self._get_output_selection(source_file_paths),
+            },
+        }
+
+    def _get_solc_kwargs(self):
+        # Settings such as `output_values` or `workers` which are meant for
+        # the combined JSON backend are not understood by `compile_standard`.
+        return {
+            key: value
+            for key, value
+            in self.compiler_settings.items()
+            if key in STANDARD_JSON_SOLC_KWARGS
+        }
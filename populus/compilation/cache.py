@@ -0,0 +1,163 @@
+from __future__ import absolute_import
+
+import hashlib
+import json
+import logging
+import os
+
+from populus.utils.compile import (
+    get_imported_source_paths,
+)
+from populus.utils.filesystem import (
+    remove_file_if_exists,
+    write_file_atomically,
+)
+
+
+DEFAULT_CACHE_MAX_SIZE = 256 * 1024 * 1024  # 256 MB
+
+
+def get_file_content_hash(file_path):
+    with open(file_path, 'rb') as source_file:
+        return hashlib.sha256(source_file.read()).hexdigest()
+
+
+def get_source_cache_key(source_path,
+                         import_graph,
+                         compiler_backend_path,
+                         compiler_version,
+                         compiler_settings,
+                         import_remappings=None,
+                         content_hashes=None):
+    """
+    Compute the cache key for the compiled output of a single source file.  The
+    key covers the contents of the file and of everything it imports, along
+    with the compiler backend, compiler version, compiler settings and import
+    remappings.
+
+    `content_hashes` may be a dictionary which is shared between calls so that
+    each file is only read and hashed once.
+    """
+    if content_hashes is None:
+        content_hashes = {}
+
+    source_paths = sorted(
+        {source_path}.union(get_imported_source_paths(source_path, import_graph))
+    )
+    for path in source_paths:
+        if path not in content_hashes:
+            content_hashes[path] = get_file_content_hash(path) if os.path.isfile(path) else None
+
+    key_data = {
+        'source_path': source_path,
+        'sources': [
+            (path, content_hashes[path])
+            for path in source_paths
+        ],
+        'compiler_backend': compiler_backend_path,
+        'compiler_version': compiler_version,
+        'compiler_settings': compiler_settings,
+        'import_remappings': list(import_remappings or []),
+    }
+    return hashlib.sha256(
+        json.dumps(key_data, sort_keys=True).encode('utf8')
+    ).hexdigest()
+
+
+class CompilationCache(object):
+    """
+    Content addressed on-disk store of the compiled contracts produced by
+    each source file.  The least recently used entries are evicted once the
+    total size of the cache exceeds `max_size` bytes.
+    """
+    logger = logging.getLogger('populus.compilation.cache.CompilationCache')
+
+    cache_dir = None
+    max_size = None
+
+    def __init__(self, cache_dir, max_size=DEFAULT_CACHE_MAX_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self._total_size = None
+
+    def get_entry_path(self, cache_key):
+        return os.path.join(self.cache_dir, '{0}.json'.format(cache_key))
+
+    def get(self, cache_key):
+        """
+        Return the cached contract data for `cache_key` or `None` if there is
+        no such entry.
+        """
+        entry_path = self.get_entry_path(cache_key)
+        try:
+            with open(entry_path) as entry_file:
+                contract_data = json.load(entry_file)
+        except (IOError, OSError, ValueError):
+            return None
+
+        # Mark the entry as recently used.
+        try:
+            os.utime(entry_path, None)
+        except OSError:
+            pass
+        return contract_data
+
+    def set(self, cache_key, contract_data):
+        entry_path = self.get_entry_path(cache_key)
+        content = json.dumps(contract_data, sort_keys=True, separators=(',', ':'))
+
+        # The total size is measured before the write so that the new entry
+        # is not counted twice.
+        total_size = self.get_total_size()
+        try:
+            total_size -= os.path.getsize(entry_path)
+        except OSError:
+            pass
+
+        write_file_atomically(entry_path, content)
+        self._total_size = total_size + len(content.encode('utf8'))
+
+        if self._total_size > self.max_size:
+            self.evict()
+
+    def get_total_size(self):
+        """
+        Return the total size of the cache entries.  The cache directory is
+        only scanned the first time, after which the size is kept up to date
+        by `set` and `evict`.
+        """
+        if self._total_size is None:
+            self._total_size = sum(size for _, size, _ in self._get_entries())
+        return self._total_size
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache fits within
+        `max_size`.
+        """
+        entries = self._get_entries()
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            self.logger.debug("Evicting compilation cache entry: %s", entry_path)
+            remove_file_if_exists(entry_path)
+            total_size -= size
+        self._total_size = total_size
+
+    def _get_entries(self):
+        if not os.path.isdir(self.cache_dir):
+            return []
+
+        entries = []
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith('.json'):
+                continue
+            entry_path = os.path.join(self.cache_dir, filename)
+            try:
+                entry_stat = os.stat(entry_path)
+            except OSError:
+                continue
+            entries.append((entry_stat.st_mtime, entry_stat.st_size, entry_path))
+        return entries
@@ -0,0 +1,214 @@
+from __future__ import absolute_import
+
+import errno
+import json
+import logging
+import os
+import socket
+
+from populus.utils.filesystem import (
+    normpath,
+)
+from populus.utils.six import (
+    socketserver,
+)
+
+
+COMPILE_SERVER_SOCKET_FILENAME = './compile-server.sock'
+
+# Seconds to wait on the compile server, which may need to recompile the
+# project before it can respond to a `sync`.
+DEFAULT_COMPILE_SERVER_TIMEOUT = 120
+
+
+@normpath
+def get_compile_server_socket_path(build_asset_dir):
+    compile_server_socket_path = os.path.join(
+        build_asset_dir,
+        COMPILE_SERVER_SOCKET_FILENAME,
+    )
+    return compile_server_socket_path
+
+
+class CompileServerError(Exception):
+    """
+    Raised when the compile server cannot be reached or fails to handle a
+    request.
+    """
+    pass
+
+
+#
+# Protocol
+#
+# Each request and response is a single line of JSON.  Requests have a
+# `command` of either `ping` or `sync`.  Responses have a `status` of `ok` or
+# `error`, with errors carrying a `message`.
+#
+def _encode_message(message):
+    return (json.dumps(message) + '\n').encode('utf8')
+
+
+def _decode_message(raw_message):
+    return json.loads(raw_message.decode('utf8'))
+
+
+class CompileServerClient(object):
+    """
+    Client for a compile server listening on `socket_path`.  A socket which
+    refuses the connection was left behind by a server which did not shut
+    down cleanly and is removed.
+    """
+    socket_path = None
+    timeout = None
+
+    def __init__(self, socket_path, timeout=DEFAULT_COMPILE_SERVER_TIMEOUT):
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def request(self, command):
+        client_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client_socket.settimeout(self.timeout)
+        try:
+            try:
+                client_socket.connect(self.socket_path)
+            except socket.error as err:
+                if err.errno == errno.ECONNREFUSED:
+                    try:
+                        os.remove(self.socket_path)
+                    except OSError:
+                        pass
+                raise
+            client_socket.sendall(_encode_message({'command': command}))
+            raw_response = b''
+            while not raw_response.endswith(b'\n'):
+                chunk = client_socket.recv(4096)
+                if not chunk:
+                    break
+                raw_response += chunk
+        except socket.error as err:
+            raise CompileServerError(
+                "Unable to reach compile server at {0}: {1}".format(self.socket_path, err)
+            )
+        finally:
+            client_socket.close()
+
+        try:
+            response = _decode_message(raw_response)
+        except ValueError:
+            raise CompileServerError("Invalid response from compile server")
+
+        if response.get('status') != 'ok':
+            raise CompileServerError(response.get('message', "Compile server request failed"))
+        return response
+
+    def ping(self):
+        return self.request('ping')
+
+    def sync(self):
+        """
+        Ask the server to bring the build artifacts up to date with the project
+        sources.  Returns the `build_id` of the artifacts, which only changes
+        when they are rewritten, and the `source_mtime` they were built from.
+        """
+        return self.request('sync')
+
+
+def get_compile_server_client(build_asset_dir):
+    """
+    Return a client for the compile server of the project with the given build
+    directory, or `None` if no compile server is running.
+    """
+    socket_path = get_compile_server_socket_path(build_asset_dir)
+    if not os.path.exists(socket_path):
+        return None
+    return CompileServerClient(socket_path)
+
+
+class CompileServerRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        raw_request = self.rfile.readline()
+        try:
+            request = _decode_message(raw_request)
+        except ValueError:
+            response = {'status': 'error', 'message': "Invalid request"}
+        else:
+            response = self.server.handle_command(request.get('command'))
+        self.wfile.write(_encode_message(response))
+
+
+class CompileServer(socketserver.UnixStreamServer):
+    """
+    Holds a warm `Project` and keeps its build artifacts up to date on request
+    from other populus processes.
+
+    Requests are handled one at a time.  The project's source index watches
+    the source directories so that a request for which nothing has changed
+    does not touch the filesystem.
+    """
+    logger = logging.getLogger('populus.compilation.server.CompileServer')
+
+    project = None
+    build_count = 0
+
+    def __init__(self, project, socket_path=None):
+        if socket_path is None:
+            socket_path = get_compile_server_socket_path(project.build_asset_dir)
+
+        if os.path.exists(socket_path):
+            try:
+                CompileServerClient(socket_path).ping()
+            except CompileServerError:
+                # Left behind by a server which did not shut down cleanly.
+                os.remove(socket_path)
+            else:
+                raise CompileServerError(
+                    "A compile server is already running at {0}".format(socket_path)
+                )
+
+        # The served project must never try to delegate to itself.
+        project.use_compile_server = False
+        self.project = project
+        self.socket_path = socket_path
+        self._compiled_contract_data = None
+
+        socketserver.UnixStreamServer.__init__(
+            self,
+            socket_path,
+            CompileServerRequestHandler,
+        )
+        self.project.source_index.watch()
+
+    def sync(self):
+        compiled_contract_data = self.project.compiled_contract_data
+        if compiled_contract_data is not self._compiled_contract_data:
+            self._compiled_contract_data = compiled_contract_data
+            self.build_count += 1
+        return {
+            'build_id': '{0}-{1}'.format(os.getpid(), self.build_count),
+            'source_mtime': self.project.get_source_modification_time(),
+        }
+
+    def handle_command(self, command):
+        try:
+            if command == 'ping':
+                response = {}
+            elif command == 'sync':
+                response = self.sync()
+            else:
+                return {
+                    'status': 'error',
+                    'message': "Unknown command: {0}".format(command),
+                }
+        except Exception as err:
+            self.logger.exception("Error handling compile server command: %s", command)
+            return {'status': 'error', 'message': str(err)}
+
+        response['status'] = 'ok'
+        return response
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        self.project.source_index.stop_watching()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
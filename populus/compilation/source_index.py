@@ -0,0 +1,232 @@
+from __future__ import absolute_import
+
+import fnmatch
+import logging
+import os
+import time
+
+try:
+    from os import scandir
+except ImportError:
+    scandir = None
+
+
+def _iter_directory(dir_path):
+    """
+    Yield `(name, path, is_dir, mtime)` for each entry of the directory.
+    Directory entries have an mtime of `None` and symlinked directories are
+    not reported as directories so that they are not descended into, which
+    matches the behavior of `os.walk`.
+    """
+    if scandir is not None:
+        for entry in scandir(dir_path):
+            if entry.is_dir(follow_symlinks=False):
+                yield entry.name, entry.path, True, None
+            elif entry.is_dir():
+                continue
+            else:
+                try:
+                    yield entry.name, entry.path, False, entry.stat().st_mtime
+                except OSError:
+                    continue
+    else:
+        for name in os.listdir(dir_path):
+            path = os.path.join(dir_path, name)
+            if os.path.isdir(path):
+                if not os.path.islink(path):
+                    yield name, path, True, None
+            else:
+                try:
+                    yield name, path, False, os.path.getmtime(path)
+                except OSError:
+                    continue
+
+
+def scan_source_files(base_dir, pattern='*.sol'):
+    """
+    Return a mapping of the paths of all files under `base_dir` which match
+    `pattern` to their modification times, gathered in a single pass over the
+    directory tree.
+    """
+    source_files = {}
+    dirs_to_scan = [base_dir]
+    while dirs_to_scan:
+        dir_path = dirs_to_scan.pop()
+        try:
+            entries = tuple(_iter_directory(dir_path))
+        except OSError:
+            continue
+        for name, path, is_dir, mtime in entries:
+            if is_dir:
+                dirs_to_scan.append(path)
+            elif fnmatch.fnmatch(name, pattern):
+                source_files[os.path.relpath(path)] = mtime
+    return source_files
+
+
+# A directory listing is only trusted while the directory has not been
+# modified since.  Directories modified within this many seconds of being
+# listed are listed again on the next read, as a further change within the
+# same timestamp granularity would go unnoticed.
+RACY_DIRECTORY_MTIME_WINDOW = 2
+
+
+class SourceIndex(object):
+    """
+    Index of the solidity source files under a set of base directories along
+    with their modification times.
+
+    The file list and stat results are cached until the index is invalidated,
+    either explicitly with `invalidate()` or, while the index is watching its
+    base directories, when a change is observed.  The `generation` is
+    incremented on each invalidation.  When the index is rebuilt only the
+    directories whose modification time has changed are listed again, while
+    the previously found source files are stat'ed for their modification
+    times.
+    """
+    logger = logging.getLogger('populus.compilation.source_index.SourceIndex')
+
+    base_dirs = None
+    generation = 0
+
+    def __init__(self, base_dirs, pattern='*.sol'):
+        self.base_dirs = tuple(base_dirs)
+        self.pattern = pattern
+        self._source_files = None
+        self._directory_listings = {}
+        self._watchers = []
+
+    @property
+    def is_watching(self):
+        return bool(self._watchers)
+
+    def invalidate(self, file_path=None, event_name=None):
+        """
+        Drop the cached file list.  The signature matches the callback of a
+        `DirWatcher` so that this can be used directly as one.
+        """
+        self._source_files = None
+        self.generation += 1
+
+    def watch(self):
+        """
+        Start watching the base directories, keeping the cached file list until
+        a change is observed.
+        """
+        # The observer backend is only imported when it is needed as it pulls
+        # in either watchdog or gevent.
+        from populus.utils.observers import (
+            DirWatcher,
+        )
+
+        if self.is_watching:
+            return
+        for base_dir in self.base_dirs:
+            if not os.path.isdir(base_dir):
+                continue
+            self.logger.debug("Watching for source changes in: %s", base_dir)
+            watcher = DirWatcher(base_dir, self.invalidate)
+            watcher.start()
+            self._watchers.append(watcher)
+        self.invalidate()
+
+    def stop_watching(self):
+        for watcher in self._watchers:
+            watcher.stop()
+        self._watchers = []
+        self.invalidate()
+
+    def get_indexed_source_files(self):
+        """
+        Return a mapping of each base directory to the source files found under
+        it along with their modification times.
+        """
+        if self._source_files is None:
+            self._source_files = {
+                base_dir: self._revalidate_source_files(base_dir)
+                for base_dir in self.base_dirs
+            }
+        return self._source_files
+
+    def _revalidate_source_files(self, base_dir):
+        """
+        Return the source files under `base_dir` along with their modification
+        times, reusing the previous listing of each directory which has not
+        been modified since it was made.
+        """
+        previous_listings = self._directory_listings.get(base_dir, {})
+        directory_listings = {}
+        source_files = {}
+
+        dirs_to_scan = [base_dir]
+        while dirs_to_scan:
+            dir_path = dirs_to_scan.pop()
+            try:
+                dir_mtime = os.stat(dir_path).st_mtime
+            except OSError:
+                continue
+
+            listing = previous_listings.get(dir_path)
+            if listing is not None and listing[0] == dir_mtime and not listing[3]:
+                _, sub_dir_paths, source_paths, _ = listing
+                for source_path in source_paths:
+                    try:
+                        source_files[source_path] = os.path.getmtime(source_path)
+                    except OSError:
+                        continue
+            else:
+                listed_at = time.time()
+                try:
+                    entries = tuple(_iter_directory(dir_path))
+                except OSError:
+                    continue
+                sub_dir_paths = tuple(path for _, path, is_dir, _ in entries if is_dir)
+                dir_source_files = {
+                    os.path.relpath(path): mtime
+                    for name, path, is_dir, mtime in entries
+                    if not is_dir and fnmatch.fnmatch(name, self.pattern)
+                }
+                source_files.update(dir_source_files)
+                listing = (
+                    dir_mtime,
+                    sub_dir_paths,
+                    tuple(dir_source_files),
+                    dir_mtime >= listed_at - RACY_DIRECTORY_MTIME_WINDOW,
+                )
+
+            directory_listings[dir_path] = listing
+            dirs_to_scan.extend(sub_dir_paths)
+
+        self._directory_listings[base_dir] = directory_listings
+        return source_files
+
+    def get_source_files(self, base_dir=None):
+        """
+        Return a mapping of the indexed source file paths to their modification
+        times, either for all of the base directories or only for `base_dir`.
+        """
+        indexed_source_files = self.get_indexed_source_files()
+        if base_dir is not None:
+            return indexed_source_files[base_dir]
+
+        source_files = {}
+        for base_dir_source_files in indexed_source_files.values():
+            source_files.update(base_dir_source_files)
+        return source_files
+
+    def get_source_paths(self, base_dir):
+        """
+        Return the sorted paths of the indexed source files under `base_dir`,
+        which must be one of the base directories of the index.
+        """
+        return tuple(sorted(self.get_source_files(base_dir)))
+
+    def get_modification_time(self):
+        """
+        Return the most recent modification time of all indexed source files or
+        `None` if there are none.
+        """
+        source_files = self.get_source_files()
+        if not source_files:
+            return None
+        return max(source_files.values())
@@ -72,5 +72,6 @@ class ContractBackendConfig(BaseBackendConfig):
     backend_class_shortnames = {
         'memory': 'populus.contracts.backends.memory.MemoryBackend',
         'jsonfile': 'populus.contracts.backends.filesystem.JSONFileBackend',
+        'sqlite': 'populus.contracts.backends.sqlite.SQLiteBackend',
         'project': 'populus.contracts.backends.project.ProjectContractsBackend',
     }
@@ -34,6 +34,7 @@ NEW_V4_PATHS = {
     'compilation.backends.SolcCombinedJSON',
     'compilation.backend',
     'compilation.import_remappings',
+    'contracts.backends.SQLite',
 }
 
 MOVED_V3_PATHS = {
@@ -1,9 +1,14 @@
+import contextlib
+
 from populus.contracts.exceptions import (
     UnknownContract,
 )
 from populus.contracts.contract import (
     construct_contract_factory,
 )
+from populus.utils.contracts import (
+    get_contract_names_under_path,
+)
 
 
 class BaseContractBackend(object):
@@ -32,6 +37,13 @@ class BaseContractBackend(object):
         """
         pass
 
+    def teardown_backend(self):
+        """
+        Hook for subclasses to release resources or persist buffered state
+        when the chain exits.
+        """
+        pass
+
     #
     # Registrar API
     #
@@ -47,6 +59,37 @@ class BaseContractBackend(object):
         """
         raise NotImplementedError("Must be implemented by subclasses")
 
+    def set_deploy_info(self, instance_name, address, deploy_info):
+        """
+        Records the `block_number` and `transaction_hash` of the deployment of
+        the contract instance at the given address.  Backends which do not
+        store deploy information ignore it.
+        """
+        pass
+
+    def get_deploy_info(self, instance_name, address):
+        """
+        Returns the recorded deploy information for the contract instance at
+        the given address or `None` if there is none.
+        """
+        return None
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Context manager within which the backend may defer persisting writes
+        until the block exits.
+        """
+        yield
+
+    def get_cache_version(self):
+        """
+        Returns a value which changes whenever the recorded addresses may have
+        been changed by another process, or `None` for backends which can only
+        be written to through this instance.
+        """
+        return None
+
     #
     # Provider API
     #
@@ -102,3 +145,48 @@ class BaseContractBackend(object):
         Returns a set of all of thec ontract names for this backend.
         """
         return set(self.get_all_contract_data().keys())
+
+
+class BaseCompiledContractsBackend(BaseContractBackend):
+    """
+    Base class for backends which provide the subset of the project's compiled
+    contracts whose source files are located under `source_dir`.  Lookups go
+    straight to the project's compiled contract data so only the contracts
+    which are actually requested are loaded.
+    """
+    @property
+    def source_dir(self):
+        raise NotImplementedError("Must be implemented by subclasses")
+
+    _contract_names_cache = None
+
+    def get_all_contract_names(self):
+        compiled_contract_data = self.chain.project.compiled_contract_data
+
+        # The set of names only changes when the project recompiles, which
+        # always produces a new compiled contract data object.
+        if self._contract_names_cache is None or \
+                self._contract_names_cache[0] is not compiled_contract_data:
+            self._contract_names_cache = (
+                compiled_contract_data,
+                frozenset(get_contract_names_under_path(
+                    self.source_dir,
+                    compiled_contract_data,
+                )),
+            )
+        return set(self._contract_names_cache[1])
+
+    def get_contract_data(self, contract_name):
+        contract_identifier = self.get_contract_identifier(contract_name)
+        if contract_identifier not in self.get_all_contract_names():
+            raise UnknownContract(
+                "No contract found for the name '{0}'".format(contract_name)
+            )
+        return self.chain.project.compiled_contract_data[contract_identifier]
+
+    def get_all_contract_data(self):
+        compiled_contract_data = self.chain.project.compiled_contract_data
+        return {
+            contract_name: compiled_contract_data[contract_name]
+            for contract_name in self.get_all_contract_names()
+        }
@@ -1,16 +1,17 @@
 from __future__ import absolute_import
 
+import collections
+import contextlib
 import json
 import os
 
-from eth_utils import (
-    to_tuple,
-)
-
 from populus.contracts.exceptions import (
     NoKnownAddress,
 )
 
+from populus.utils.filesystem import (
+    write_file_atomically,
+)
 from populus.utils.mappings import (
     set_nested_key,
 )
@@ -24,59 +25,118 @@ from .base import (
 )
 
 
-@to_tuple
-def get_matching_chain_definitions(web3, values):
-    for chain_definition in values:
-        if check_if_chain_matches_chain_uri(web3, chain_definition):
-            yield chain_definition
+JOURNAL_SUFFIX = '.journal'
+DEFAULT_JOURNAL_COMPACTION_THRESHOLD = 100
+
+
+def _get_file_key(file_path):
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        return None
+    return (
+        getattr(file_stat, 'st_mtime_ns', file_stat.st_mtime),
+        file_stat.st_size,
+        file_stat.st_ino,
+    )
+
+
+def _serialize_registrar_data(registrar_data):
+    return json.dumps(
+        registrar_data,
+        sort_keys=True,
+        indent=2,
+        separators=(',', ': '),
+    )
 
 
 class JSONFileBackend(BaseContractBackend):
+    """
+    Registrar backend which stores contract addresses in a JSON file.
+
+    Writes are appended to a journal next to the registrar file, one JSON
+    encoded entry per line, and each write is flushed to disk with a single
+    `fsync`.  Writes made within `batch()` are flushed together when the
+    batch exits.  The journal is compacted into the registrar file once it
+    holds `journal_compaction_threshold` entries and when the chain exits.
+    Partially written journal entries, as left behind by a crash, are
+    ignored.
+
+    The parsed contents of the registrar file and journal are kept in memory
+    together with an index of the addresses recorded for the chain.  Both are
+    only rebuilt when the modification time, size or inode of either file
+    changes, so repeated lookups cost a `stat` call per file.
+    """
     is_registrar = True
     is_provider = False
 
+    def setup_backend(self):
+        self._registrar_data = None
+        self._registrar_file_key = None
+        self._registrar_index = None
+        self._chain_definition_matches = {}
+        self._journal_entry_count = 0
+        self._pending_journal_entries = []
+        self._batch_depth = 0
+
+    def teardown_backend(self):
+        self.compact()
+
     #
     # Registrar API
     #
     def set_contract_address(self, instance_identifier, address):
-        registrar_data = self.registrar_data
-
         chain_definition = get_chain_definition(self.chain.web3)
-        set_nested_key(
-            registrar_data,
+        self._record(
             'deployments.{0}.{1}'.format(chain_definition, instance_identifier),
             address,
         )
 
-        with open(self.registrar_path, 'w') as registrar_file:
-            json.dump(
-                registrar_data,
-                registrar_file,
-                sort_keys=True,
-                indent=2,
-                separators=(',', ': '),
-            )
+    def set_deploy_info(self, instance_identifier, address, deploy_info):
+        chain_definition = get_chain_definition(self.chain.web3)
+        self._record(
+            'deploy_info.{0}.{1}.{2}'.format(chain_definition, instance_identifier, address),
+            dict(deploy_info),
+        )
+
+    def get_deploy_info(self, instance_identifier, address):
+        deploy_info_index = self.registrar_index['deploy_info']
+        return deploy_info_index.get((instance_identifier, address))
 
-    @to_tuple
     def get_contract_addresses(self, instance_identifier):
+        address_index = self.registrar_index['deployments']
+        if instance_identifier not in address_index:
+            raise NoKnownAddress("No known address for '{0}'".format(instance_identifier))
+        return address_index[instance_identifier]
+
+    @contextlib.contextmanager
+    def batch(self):
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush_journal()
+
+    def get_cache_version(self):
+        return self._get_registrar_file_key()
+
+    def compact(self):
+        """
+        Fold the journal into the registrar file, which is replaced
+        atomically, and remove the journal.
+        """
+        self._flush_journal()
         registrar_data = self.registrar_data
-        matching_chain_definitions = get_matching_chain_definitions(
-            self.chain.web3,
-            registrar_data.get('deployments', {}),
-        )
+        if not os.path.exists(self.journal_path):
+            return
 
-        identifier_exists = any(
-            instance_identifier in registrar_data['deployments'][chain_definition]
-            for chain_definition
-            in matching_chain_definitions
-        )
-        if not identifier_exists:
-            raise NoKnownAddress("No known address for '{0}'".format(instance_identifier))
+        write_file_atomically(self.registrar_path, _serialize_registrar_data(registrar_data))
+        os.remove(self.journal_path)
 
-        for chain_definition in matching_chain_definitions:
-            chain_deployments = registrar_data['deployments'][chain_definition]
-            if instance_identifier in chain_deployments:
-                yield chain_deployments[instance_identifier]
+        self._journal_entry_count = 0
+        self._registrar_file_key = self._get_registrar_file_key()
 
     #
     # Private API
@@ -85,14 +145,161 @@ class JSONFileBackend(BaseContractBackend):
     def registrar_path(self):
         return self.config.get('file_path', './registrar.json')
 
-    _registrar_data = None
+    @property
+    def journal_path(self):
+        return self.registrar_path + JOURNAL_SUFFIX
 
     @property
-    def registrar_data(self):
-        # TODO: this could be cached using mtime of the file.
-        if os.path.exists(self.registrar_path):
-            with open(self.registrar_path, 'r') as registrar_file:
-                registrar_data = json.load(registrar_file)
+    def journal_compaction_threshold(self):
+        return self.config.get(
+            'journal_compaction_threshold',
+            DEFAULT_JOURNAL_COMPACTION_THRESHOLD,
+        )
+
+    def _get_registrar_file_key(self):
+        return (_get_file_key(self.registrar_path), _get_file_key(self.journal_path))
+
+    def _record(self, key, value):
+        registrar_data = self.registrar_data
+        set_nested_key(registrar_data, key, value)
+        self._registrar_index = None
+
+        self._pending_journal_entries.append((key, value))
+        if self._batch_depth == 0:
+            self._flush_journal()
+
+    def _flush_journal(self):
+        if not self._pending_journal_entries:
+            return
+
+        journal_entries = ''.join(
+            json.dumps({'key': key, 'value': value}, sort_keys=True) + '\n'
+            for key, value in self._pending_journal_entries
+        )
+
+        # Make sure nothing written by another process is missed.
+        self.registrar_data
+        registrar_file_key, journal_file_key = self._registrar_file_key
+
+        if self._has_partial_journal_entry():
+            # Keep the new entries apart from what a crash left behind.
+            journal_entries = '\n' + journal_entries
+
+        with open(self.journal_path, 'a') as journal_file:
+            journal_file.write(journal_entries)
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+
+        self._journal_entry_count += len(self._pending_journal_entries)
+        self._pending_journal_entries = []
+
+        # Only trust the in memory copy if the journal grew by exactly the
+        # entries which were just written.
+        journal_size = 0 if journal_file_key is None else journal_file_key[1]
+        new_registrar_file_key = self._get_registrar_file_key()
+        new_journal_file_key = new_registrar_file_key[1]
+        if new_registrar_file_key[0] == registrar_file_key and \
+                new_journal_file_key is not None and \
+                new_journal_file_key[1] == journal_size + len(journal_entries.encode('utf8')):
+            self._registrar_file_key = new_registrar_file_key
         else:
-            registrar_data = {}
-        return registrar_data
+            self._registrar_data = None
+
+        if self._journal_entry_count >= self.journal_compaction_threshold:
+            self.compact()
+
+    def _has_partial_journal_entry(self):
+        try:
+            with open(self.journal_path, 'rb') as journal_file:
+                journal_file.seek(0, os.SEEK_END)
+                if journal_file.tell() == 0:
+                    return False
+                journal_file.seek(-1, os.SEEK_END)
+                return journal_file.read(1) != b'\n'
+        except (IOError, OSError):
+            return False
+
+    def _replay_journal(self, registrar_data):
+        journal_entry_count = 0
+        with open(self.journal_path, 'r') as journal_file:
+            for line in journal_file:
+                try:
+                    journal_entry = json.loads(line)
+                except ValueError:
+                    # A partially written entry left behind by a crash.
+                    continue
+                set_nested_key(registrar_data, journal_entry['key'], journal_entry['value'])
+                journal_entry_count += 1
+        return journal_entry_count
+
+    @property
+    def registrar_data(self):
+        """
+        The parsed contents of the registrar file with the journal applied.
+        This must not be modified in place.
+        """
+        registrar_file_key = self._get_registrar_file_key()
+        if self._registrar_data is None or registrar_file_key != self._registrar_file_key:
+            if registrar_file_key[0] is None:
+                registrar_data = {}
+            else:
+                with open(self.registrar_path, 'r') as registrar_file:
+                    registrar_data = json.load(registrar_file)
+
+            if registrar_file_key[1] is None:
+                self._journal_entry_count = 0
+            else:
+                self._journal_entry_count = self._replay_journal(registrar_data)
+
+            # Entries of an unfinished batch are not in the journal yet.
+            for key, value in self._pending_journal_entries:
+                set_nested_key(registrar_data, key, value)
+
+            self._registrar_data = registrar_data
+            self._registrar_file_key = registrar_file_key
+            self._registrar_index = None
+        return self._registrar_data
+
+    def _is_matching_chain_definition(self, chain_definition):
+        if chain_definition not in self._chain_definition_matches:
+            self._chain_definition_matches[chain_definition] = check_if_chain_matches_chain_uri(
+                self.chain.web3,
+                chain_definition,
+            )
+        return self._chain_definition_matches[chain_definition]
+
+    @property
+    def registrar_index(self):
+        """
+        Index of the registrar data for the chain with the `deployments` entry
+        mapping each instance identifier to its addresses and the
+        `deploy_info` entry mapping `(instance_identifier, address)` to the
+        recorded deploy information.
+        """
+        registrar_data = self.registrar_data
+        if self._registrar_index is None:
+            address_index = collections.defaultdict(list)
+            for chain_definition, chain_deployments in sorted(
+                    registrar_data.get('deployments', {}).items()):
+                if not self._is_matching_chain_definition(chain_definition):
+                    continue
+                for instance_identifier, address in chain_deployments.items():
+                    address_index[instance_identifier].append(address)
+
+            deploy_info_index = {}
+            for chain_definition, chain_deploy_info in sorted(
+                    registrar_data.get('deploy_info', {}).items()):
+                if not self._is_matching_chain_definition(chain_definition):
+                    continue
+                for instance_identifier, address_deploy_info in chain_deploy_info.items():
+                    for address, deploy_info in address_deploy_info.items():
+                        deploy_info_index.setdefault((instance_identifier, address), deploy_info)
+
+            self._registrar_index = {
+                'deployments': {
+                    instance_identifier: tuple(addresses)
+                    for instance_identifier, addresses in address_index.items()
+                },
+                'deploy_info': deploy_info_index,
+            }
+        return self._registrar_index
@@ -16,9 +16,11 @@ class MemoryBackend(BaseContractBackend):
     is_provider = False
 
     contract_addresses = None
+    deploy_info = None
 
     def setup_backend(self):
         self.contract_addresses = collections.defaultdict(set)
+        self.deploy_info = {}
 
     #
     # Registrar API
@@ -31,3 +33,9 @@ class MemoryBackend(BaseContractBackend):
 
     def set_contract_address(self, instance_name, address):
         self.contract_addresses[instance_name].add(address)
+
+    def set_deploy_info(self, instance_name, address, deploy_info):
+        self.deploy_info[(instance_name, address)] = dict(deploy_info)
+
+    def get_deploy_info(self, instance_name, address):
+        return self.deploy_info.get((instance_name, address))
@@ -0,0 +1,354 @@
+from __future__ import absolute_import
+
+import contextlib
+import json
+import os
+import sqlite3
+
+from eth_utils import (
+    add_0x_prefix,
+    remove_0x_prefix,
+)
+
+from populus.contracts.exceptions import (
+    NoKnownAddress,
+)
+
+from populus.utils.chains import (
+    check_if_chain_matches_chain_uri,
+    get_chain_definition,
+    parse_BIP122_uri,
+)
+from populus.utils.filesystem import (
+    ensure_path_exists,
+    write_file_atomically,
+)
+from populus.utils.mappings import (
+    set_nested_key,
+)
+
+from .base import (
+    BaseContractBackend,
+)
+
+
+DEFAULT_DATABASE_PATH = './registrar.sqlite3'
+DEFAULT_JOURNAL_MODE = 'WAL'
+DEFAULT_TIMEOUT = 30
+
+
+REGISTRAR_SCHEMA = """
+CREATE TABLE IF NOT EXISTS deployments (
+    chain_id TEXT NOT NULL,
+    block_uri TEXT NOT NULL,
+    instance_identifier TEXT NOT NULL,
+    address TEXT NOT NULL,
+    PRIMARY KEY (chain_id, block_uri, instance_identifier)
+);
+CREATE INDEX IF NOT EXISTS deployments_by_instance_identifier
+    ON deployments (chain_id, instance_identifier, block_uri);
+
+CREATE TABLE IF NOT EXISTS deploy_info (
+    chain_id TEXT NOT NULL,
+    block_uri TEXT NOT NULL,
+    instance_identifier TEXT NOT NULL,
+    address TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    transaction_hash TEXT,
+    PRIMARY KEY (chain_id, block_uri, instance_identifier, address)
+);
+CREATE INDEX IF NOT EXISTS deploy_info_by_address
+    ON deploy_info (chain_id, instance_identifier, address, block_uri);
+"""
+
+INSERT_DEPLOYMENT_QUERY = (
+    "INSERT OR REPLACE INTO deployments "
+    "(chain_id, block_uri, instance_identifier, address) "
+    "VALUES (?, ?, ?, ?)"
+)
+INSERT_DEPLOY_INFO_QUERY = (
+    "INSERT OR REPLACE INTO deploy_info "
+    "(chain_id, block_uri, instance_identifier, address, block_number, transaction_hash) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+
+def normalize_chain_id(chain_id):
+    return add_0x_prefix(remove_0x_prefix(chain_id).lower())
+
+
+def get_chain_id_from_uri(chain_definition):
+    chain_id, _, _ = parse_BIP122_uri(chain_definition)
+    return normalize_chain_id(chain_id)
+
+
+def connect_registrar_database(database_path,
+                               journal_mode=DEFAULT_JOURNAL_MODE,
+                               timeout=DEFAULT_TIMEOUT):
+    """
+    Open the registrar database at `database_path`, creating it if needed.
+    The connection is in autocommit mode so that write transactions can be
+    started explicitly with `BEGIN IMMEDIATE`.
+    """
+    ensure_path_exists(os.path.dirname(os.path.abspath(database_path)))
+
+    connection = sqlite3.connect(database_path, timeout=timeout, isolation_level=None)
+    if journal_mode is not None:
+        connection.execute('PRAGMA journal_mode={0}'.format(journal_mode))
+    connection.executescript(REGISTRAR_SCHEMA)
+    return connection
+
+
+def get_registrar_data_rows(registrar_data):
+    """
+    Convert registrar data in the layout of `registrar.json` into the rows of
+    the `deployments` and `deploy_info` tables.
+    """
+    deployment_rows = [
+        (get_chain_id_from_uri(chain_definition), chain_definition, instance_identifier, address)
+        for chain_definition, chain_deployments
+        in registrar_data.get('deployments', {}).items()
+        for instance_identifier, address
+        in chain_deployments.items()
+    ]
+    deploy_info_rows = [
+        (
+            get_chain_id_from_uri(chain_definition),
+            chain_definition,
+            instance_identifier,
+            address,
+            deploy_info['block_number'],
+            deploy_info.get('transaction_hash'),
+        )
+        for chain_definition, chain_deploy_info
+        in registrar_data.get('deploy_info', {}).items()
+        for instance_identifier, address_deploy_info
+        in chain_deploy_info.items()
+        for address, deploy_info
+        in address_deploy_info.items()
+    ]
+    return deployment_rows, deploy_info_rows
+
+
+class SQLiteBackend(BaseContractBackend):
+    """
+    Registrar backend which stores contract addresses in a SQLite database,
+    indexed by chain genesis hash, block URI and instance identifier.
+
+    The database is opened in WAL mode by default so that any number of
+    processes can read it while another one writes to it.  Writes are
+    committed as they are made, except within `batch()` where they are
+    inserted together in a single transaction when the batch exits.
+
+    The contents can be imported from and exported to the layout of the
+    `registrar.json` file used by the `JSONFile` backend.
+    """
+    is_registrar = True
+    is_provider = False
+
+    def setup_backend(self):
+        self._connection = None
+        self._chain_definition_matches = {}
+        self._pending_deployment_rows = []
+        self._pending_deploy_info_rows = []
+        self._batch_depth = 0
+
+    def teardown_backend(self):
+        self._flush()
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    #
+    # Registrar API
+    #
+    def set_contract_address(self, instance_identifier, address):
+        chain_definition = get_chain_definition(self.chain.web3)
+        self._pending_deployment_rows.append((
+            get_chain_id_from_uri(chain_definition),
+            chain_definition,
+            instance_identifier,
+            address,
+        ))
+        if self._batch_depth == 0:
+            self._flush()
+
+    def set_deploy_info(self, instance_identifier, address, deploy_info):
+        chain_definition = get_chain_definition(self.chain.web3)
+        self._pending_deploy_info_rows.append((
+            get_chain_id_from_uri(chain_definition),
+            chain_definition,
+            instance_identifier,
+            address,
+            deploy_info['block_number'],
+            deploy_info.get('transaction_hash'),
+        ))
+        if self._batch_depth == 0:
+            self._flush()
+
+    def get_contract_addresses(self, instance_identifier):
+        chain_id = normalize_chain_id(self.chain.chain_id)
+        addresses_by_block_uri = dict(self.connection.execute(
+            "SELECT block_uri, address FROM deployments "
+            "WHERE chain_id = ? AND instance_identifier = ?",
+            (chain_id, instance_identifier),
+        ).fetchall())
+        for row_chain_id, block_uri, row_instance_identifier, address in \
+                self._pending_deployment_rows:
+            if (row_chain_id, row_instance_identifier) == (chain_id, instance_identifier):
+                addresses_by_block_uri[block_uri] = address
+
+        addresses = tuple(
+            address
+            for block_uri, address
+            in sorted(addresses_by_block_uri.items())
+            if self._is_matching_chain_definition(block_uri)
+        )
+        if not addresses:
+            raise NoKnownAddress("No known address for '{0}'".format(instance_identifier))
+        return addresses
+
+    def get_deploy_info(self, instance_identifier, address):
+        chain_id = normalize_chain_id(self.chain.chain_id)
+        deploy_info_by_block_uri = {
+            block_uri: (block_number, transaction_hash)
+            for block_uri, block_number, transaction_hash
+            in self.connection.execute(
+                "SELECT block_uri, block_number, transaction_hash FROM deploy_info "
+                "WHERE chain_id = ? AND instance_identifier = ? AND address = ?",
+                (chain_id, instance_identifier, address),
+            ).fetchall()
+        }
+        for row in self._pending_deploy_info_rows:
+            if row[0] == chain_id and row[2:4] == (instance_identifier, address):
+                deploy_info_by_block_uri[row[1]] = row[4:]
+
+        for block_uri, (block_number, transaction_hash) in sorted(
+                deploy_info_by_block_uri.items()):
+            if self._is_matching_chain_definition(block_uri):
+                return {
+                    'block_number': block_number,
+                    'transaction_hash': transaction_hash,
+                }
+        return None
+
+    def get_cache_version(self):
+        # Only changes when another connection commits to the database.
+        return self.connection.execute('PRAGMA data_version').fetchone()[0]
+
+    @contextlib.contextmanager
+    def batch(self):
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush()
+
+    #
+    # Import / Export
+    #
+    def import_registrar_data(self, registrar_data):
+        """
+        Insert all of the entries, for every chain, of registrar data in the
+        layout of `registrar.json` in a single transaction.
+        """
+        deployment_rows, deploy_info_rows = get_registrar_data_rows(registrar_data)
+        with self._write_transaction() as connection:
+            connection.executemany(INSERT_DEPLOYMENT_QUERY, deployment_rows)
+            connection.executemany(INSERT_DEPLOY_INFO_QUERY, deploy_info_rows)
+
+    def export_registrar_data(self):
+        """
+        Return all of the entries, for every chain, in the layout of
+        `registrar.json`.
+        """
+        self._flush()
+        registrar_data = {}
+        for block_uri, instance_identifier, address in self.connection.execute(
+                "SELECT block_uri, instance_identifier, address FROM deployments"):
+            set_nested_key(
+                registrar_data,
+                'deployments.{0}.{1}'.format(block_uri, instance_identifier),
+                address,
+            )
+        for block_uri, instance_identifier, address, block_number, transaction_hash in \
+                self.connection.execute(
+                    "SELECT block_uri, instance_identifier, address, block_number, "
+                    "transaction_hash FROM deploy_info"):
+            set_nested_key(
+                registrar_data,
+                'deploy_info.{0}.{1}.{2}'.format(block_uri, instance_identifier, address),
+                {'block_number': block_number, 'transaction_hash': transaction_hash},
+            )
+        return registrar_data
+
+    def import_registrar_file(self, registrar_path):
+        """
+        Import the entries of a `registrar.json` file.
+        """
+        with open(registrar_path) as registrar_file:
+            self.import_registrar_data(json.load(registrar_file))
+
+    def export_registrar_file(self, registrar_path):
+        """
+        Write all of the entries to `registrar_path` as a `registrar.json` file.
+        """
+        write_file_atomically(registrar_path, json.dumps(
+            self.export_registrar_data(),
+            sort_keys=True,
+            indent=2,
+            separators=(',', ': '),
+        ))
+        return registrar_path
+
+    #
+    # Private API
+    #
+    @property
+    def database_path(self):
+        return self.config.get('file_path', DEFAULT_DATABASE_PATH)
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            self._connection = connect_registrar_database(
+                self.database_path,
+                journal_mode=self.config.get('journal_mode', DEFAULT_JOURNAL_MODE),
+                timeout=self.config.get('timeout', DEFAULT_TIMEOUT),
+            )
+        return self._connection
+
+    @contextlib.contextmanager
+    def _write_transaction(self):
+        connection = self.connection
+        # Take the write lock up front so that concurrent writers wait on the
+        # busy timeout rather than failing part way through the transaction.
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        else:
+            connection.execute('COMMIT')
+
+    def _flush(self):
+        if not self._pending_deployment_rows and not self._pending_deploy_info_rows:
+            return
+
+        with self._write_transaction() as connection:
+            connection.executemany(INSERT_DEPLOYMENT_QUERY, self._pending_deployment_rows)
+            connection.executemany(INSERT_DEPLOY_INFO_QUERY, self._pending_deploy_info_rows)
+
+        self._pending_deployment_rows = []
+        self._pending_deploy_info_rows = []
+
+    def _is_matching_chain_definition(self, chain_definition):
+        if chain_definition not in self._chain_definition_matches:
+            self._chain_definition_matches[chain_definition] = check_if_chain_matches_chain_uri(
+                self.chain.web3,
+                chain_definition,
+            )
+        return self._chain_definition_matches[chain_definition]
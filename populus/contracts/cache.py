@@ -0,0 +1,203 @@
+from __future__ import absolute_import
+
+import collections
+import hashlib
+
+from pylru import lrucache
+
+from eth_utils import (
+    force_bytes,
+)
+
+from populus.utils.contracts import (
+    verify_contract_bytecode,
+)
+
+from .exceptions import (
+    BytecodeMismatch,
+)
+
+
+def get_linked_bytecode_cache_key(contract_identifier,
+                                  artifact_hashes,
+                                  address_version,
+                                  block_number):
+    """
+    Compute the cache key for the linked bytecode of a contract.  The key
+    covers the artifact hashes of the contract and of each of its link
+    dependencies along with the registrar's `address_version` and the block
+    number, which together determine the addresses the dependencies resolve
+    to.
+    """
+    return (
+        contract_identifier,
+        tuple(sorted(artifact_hashes.items())),
+        address_version,
+        block_number,
+    )
+
+
+DEFAULT_LINKED_BYTECODE_CACHE_MAX_ENTRIES = 256
+
+
+class LinkedBytecodeCache(object):
+    """
+    In memory cache of the linked bytecodes of contracts holding up to
+    `max_entries` of the most recently used entries.
+    """
+    def __init__(self, max_entries=DEFAULT_LINKED_BYTECODE_CACHE_MAX_ENTRIES):
+        self._linked_bytecodes = lrucache(max_entries)
+
+    def get(self, cache_key):
+        """
+        Return the cached mapping of bytecode fields to linked bytecode for
+        `cache_key` or `None` if there is no such entry.
+        """
+        return self._linked_bytecodes.get(cache_key)
+
+    def set(self, cache_key, linked_bytecodes):
+        self._linked_bytecodes[cache_key] = linked_bytecodes
+
+    def clear(self):
+        self._linked_bytecodes.clear()
+
+
+DEFAULT_CODE_CACHE_MAX_ENTRIES = 1024
+
+
+class CodeCache(object):
+    """
+    Cache of the code found at addresses, keyed by the address and the block
+    number it was fetched at.  Shared by the registrar and the provider so
+    that the code at an address is fetched at most once per block.
+    """
+    def __init__(self, max_entries=DEFAULT_CODE_CACHE_MAX_ENTRIES):
+        self._code = lrucache(max_entries)
+
+    def get_code(self, web3, address, block_number=None):
+        """
+        Return the code at `address` as of `block_number`, which defaults to
+        the latest block.
+        """
+        if block_number is None:
+            block_number = web3.eth.blockNumber
+        cache_key = (address, block_number)
+        if cache_key not in self._code:
+            self._code[cache_key] = web3.eth.getCode(address, block_identifier=block_number)
+        return self._code[cache_key]
+
+    def clear(self):
+        self._code.clear()
+
+
+def get_bytecode_hash(bytecode):
+    return hashlib.sha256(force_bytes(bytecode)).hexdigest()
+
+
+DEFAULT_VERIFICATION_CACHE_MAX_ENTRIES = 1024
+DEFAULT_VERIFICATION_CONFIRMATIONS = 12
+
+
+BytecodeVerdict = collections.namedtuple(
+    'BytecodeVerdict',
+    ['block_number', 'first_match_block_number', 'error_message', 'is_final'],
+)
+
+
+class BytecodeVerificationCache(object):
+    """
+    Records whether the code at an address matched the expected bytecode,
+    keyed by the address and the hash of the expected bytecode.
+
+    A verdict is reused for the rest of the block it was reached in.  Once the
+    code at an address matches and the contract was deployed at least
+    `confirmations` blocks ago the match is treated as final and is never
+    checked again.  When the deploy block of the contract is not known the
+    confirmations are counted from the first block the match was seen in.
+    Mismatches are always checked again in later blocks since a contract may
+    yet be deployed to the address.  Setting `confirmations` to `None`
+    disables final matches.
+
+    When a `code_cache` is given the code at each address is read through it.
+    """
+    confirmations = None
+    code_cache = None
+
+    def __init__(self,
+                 confirmations=DEFAULT_VERIFICATION_CONFIRMATIONS,
+                 max_entries=DEFAULT_VERIFICATION_CACHE_MAX_ENTRIES,
+                 code_cache=None):
+        self.confirmations = confirmations
+        self.code_cache = code_cache
+        self._verdicts = lrucache(max_entries)
+
+    def verify_contract_bytecode(self,
+                                 web3,
+                                 expected_bytecode,
+                                 address,
+                                 get_deploy_block_number=None):
+        """
+        Same as `populus.utils.contracts.verify_contract_bytecode` but skips
+        checking the code at the address when a recorded verdict is still
+        valid.
+
+        `get_deploy_block_number` may be given as a callable which returns the
+        number of the block the contract at the address was deployed in, or
+        `None` if it is not known.  It is only called once the code at the
+        address first matches.
+        """
+        cache_key = (address, get_bytecode_hash(expected_bytecode))
+        verdict = self._verdicts.get(cache_key)
+
+        if verdict is not None and verdict.is_final:
+            return
+
+        block_number = web3.eth.blockNumber
+        if verdict is None or verdict.block_number != block_number:
+            verdict = self._check(
+                web3,
+                expected_bytecode,
+                address,
+                block_number,
+                verdict,
+                get_deploy_block_number,
+            )
+            self._verdicts[cache_key] = verdict
+
+        if verdict.error_message is not None:
+            raise BytecodeMismatch(verdict.error_message)
+
+    def _check(self,
+               web3,
+               expected_bytecode,
+               address,
+               block_number,
+               previous_verdict,
+               get_deploy_block_number):
+        if self.code_cache is None:
+            chain_bytecode = None
+        else:
+            chain_bytecode = self.code_cache.get_code(web3, address, block_number)
+
+        try:
+            verify_contract_bytecode(web3, expected_bytecode, address, chain_bytecode)
+        except BytecodeMismatch as err:
+            return BytecodeVerdict(block_number, None, str(err), False)
+
+        if previous_verdict is not None and previous_verdict.first_match_block_number is not None:
+            first_match_block_number = previous_verdict.first_match_block_number
+        else:
+            first_match_block_number = block_number
+            if get_deploy_block_number is not None:
+                deploy_block_number = get_deploy_block_number()
+                if deploy_block_number is not None:
+                    first_match_block_number = min(deploy_block_number, block_number)
+
+        is_final = (
+            self.confirmations is not None and
+            block_number - first_match_block_number >= self.confirmations
+        )
+        return BytecodeVerdict(block_number, first_match_block_number, None, is_final)
+
+    def clear(self):
+        self._verdicts.clear()
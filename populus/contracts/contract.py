@@ -20,8 +20,36 @@ from populus.utils.string import (
 )
 
 
+class LazyContractField(object):
+    """
+    Class level attribute of a contract factory which reads its value from the
+    factory's contract data the first time it is accessed.
+    """
+    def __init__(self, field_name):
+        self.field_name = field_name
+
+    def __get__(self, instance, owner):
+        if owner.populus_contract_data is None:
+            return None
+        return owner.populus_contract_data.get(self.field_name)
+
+
 class PopulusContract(Contract):
     populus_meta = None
+    populus_contract_data = None
+
+    asm = LazyContractField('asm')
+    ast = LazyContractField('ast')
+    clone_bin = LazyContractField('clone_bin')
+    dev_doc = LazyContractField('dev_doc')
+    interface = LazyContractField('interface')
+    link_references = LazyContractField('link_references')
+    link_references_runtime = LazyContractField('link_references_runtime')
+    metadata = LazyContractField('metadata')
+    opcodes = LazyContractField('opcodes')
+    src_map = LazyContractField('src_map')
+    src_map_runtime = LazyContractField('src_map_runtime')
+    user_doc = LazyContractField('user_doc')
 
 
 @to_object('PopulusMeta')
@@ -47,6 +75,8 @@ CONTRACT_FACTORY_FIELDS = {
     'clone_bin',
     'dev_doc',
     'interface',
+    'link_references',
+    'link_references_runtime',
     'metadata',
     'opcodes',
     'src_map',
@@ -55,16 +85,26 @@ CONTRACT_FACTORY_FIELDS = {
 }
 
 
+# The fields which are set directly on the contract factory.  The remaining
+# `CONTRACT_FACTORY_FIELDS` are read from the contract data on first access.
+HOT_CONTRACT_FACTORY_FIELDS = {
+    'abi',
+    'bytecode',
+    'bytecode_runtime',
+}
+
+
 def construct_contract_factory(chain, contract_identifier, contract_data):
     factory_kwargs = {
         key: contract_data[key]
         for key
-        in CONTRACT_FACTORY_FIELDS
+        in HOT_CONTRACT_FACTORY_FIELDS
         if key in contract_data
     }
     populus_meta = build_populus_meta(chain, contract_identifier, contract_data)
     return chain.web3.eth.contract(
         ContractFactoryClass=PopulusContract,
         populus_meta=populus_meta,
+        populus_contract_data=contract_data,
         **factory_kwargs
     )
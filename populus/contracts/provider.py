@@ -1,24 +1,34 @@
+import functools
 import itertools
 
 from pylru import lrucache
 
 from eth_utils import (
+    to_dict,
     to_tuple,
 )
 
+from populus.utils.artifacts import (
+    get_contract_data_hash,
+)
 from populus.utils.contracts import (
-    get_shallow_dependency_graph,
-    get_recursive_contract_dependencies,
+    CodeFingerprintIndex,
     verify_contract_bytecode,
 )
-from populus.utils.deploy import (
-    compute_deploy_order,
-)
 from populus.utils.linking import (
-    link_bytecode,
+    ContractNameIndex,
+    link_bytecodes,
     find_link_references,
+    get_link_references_from_index,
 )
 
+from .cache import (
+    BytecodeVerificationCache,
+    CodeCache,
+    DEFAULT_LINKED_BYTECODE_CACHE_MAX_ENTRIES,
+    LinkedBytecodeCache,
+    get_linked_bytecode_cache_key,
+)
 from .exceptions import (
     BytecodeMismatch,
     NoKnownAddress,
@@ -40,69 +50,136 @@ def get_base_contract_factory(contract_identifier, store_backends):
 
 
 @to_tuple
-def filter_addresses_by_bytecode_match(web3, expected_bytecode, addresses):
+def filter_addresses_by_bytecode_match(web3,
+                                       expected_bytecode,
+                                       addresses,
+                                       verification_cache=None,
+                                       get_deploy_block_number=None):
     for address in addresses:
         try:
-            verify_contract_bytecode(web3, expected_bytecode, address)
+            if verification_cache is None:
+                verify_contract_bytecode(web3, expected_bytecode, address)
+            elif get_deploy_block_number is None:
+                verification_cache.verify_contract_bytecode(web3, expected_bytecode, address)
+            else:
+                verification_cache.verify_contract_bytecode(
+                    web3,
+                    expected_bytecode,
+                    address,
+                    functools.partial(get_deploy_block_number, address),
+                )
         except BytecodeMismatch:
             continue
         else:
             yield address
 
 
+DEFAULT_FACTORY_CACHE_SIZE = 128
+DEFAULT_AVAILABILITY_CACHE_SIZE = 1024
+
+
 class Provider(object):
     """
     Abstraction for retrieving contracts on a given chain.
+
+    The contract factories and the results of availability checks are cached
+    until either the project's compiled contract data changes or a contract
+    address is set in the chain's registrar.  Availability is additionally
+    recorded per block.
     """
     provider_backends = None
 
-    def __init__(self, chain, provider_backends):
+    def __init__(self,
+                 chain,
+                 provider_backends,
+                 factory_cache_size=DEFAULT_FACTORY_CACHE_SIZE,
+                 availability_cache_size=DEFAULT_AVAILABILITY_CACHE_SIZE,
+                 bytecode_verification_cache=None,
+                 code_cache=None,
+                 linked_bytecode_cache_size=DEFAULT_LINKED_BYTECODE_CACHE_MAX_ENTRIES):
         self.chain = chain
         self.provider_backends = provider_backends
-        self._factory_cache = lrucache(128)
-
-    def is_contract_available(self, contract_identifier):
-        try:
-            contract_addresses = self.chain.registrar.get_contract_addresses(contract_identifier)
-        except NoKnownAddress:
-            return False
-
-        if not self.are_contract_dependencies_available(contract_identifier):
-            return False
-
-        ContractFactory = self.get_contract_factory(contract_identifier)
-        bytecode_matched_addresses = filter_addresses_by_bytecode_match(
-            self.chain.web3,
-            ContractFactory.bytecode_runtime,
-            contract_addresses,
+        if code_cache is None:
+            code_cache = CodeCache()
+        self.code_cache = code_cache
+        if bytecode_verification_cache is None:
+            bytecode_verification_cache = BytecodeVerificationCache(code_cache=code_cache)
+        self.bytecode_verification_cache = bytecode_verification_cache
+        self._factory_cache = lrucache(factory_cache_size)
+        self._availability_cache = lrucache(availability_cache_size)
+        self.linked_bytecode_cache = LinkedBytecodeCache(linked_bytecode_cache_size)
+        self._cache_version = None
+        self._contract_name_index = None
+        self._code_fingerprint_index = None
+
+    def get_cache_version(self):
+        """
+        Returns a value which changes whenever the cached contract factories
+        may no longer be valid.
+        """
+        project = self.chain.project
+        if self.chain.registrar_backends:
+            address_version = self.chain.registrar.get_cache_version()
+        else:
+            address_version = None
+        return (project.compiled_contract_data_version, address_version)
+
+    def clear_caches(self):
+        self._factory_cache.clear()
+        self._availability_cache.clear()
+        self._cache_version = None
+        self._contract_name_index = None
+        self._code_fingerprint_index = None
+
+    def _validate_caches(self):
+        # Reading the compiled contract data brings it up to date first, so
+        # that a recompilation is reflected in the cache version.
+        self.chain.project.compiled_contract_data
+        cache_version = self.get_cache_version()
+        if cache_version != self._cache_version:
+            self.clear_caches()
+            self._cache_version = cache_version
+
+    def resolve_contract_availability(self, contract_identifiers):
+        """
+        Returns a dictionary mapping each of the given contract identifiers and
+        all of their dependencies to whether an instance of the contract is
+        available on the chain.
+
+        The contracts are checked once each in deploy order so that every
+        dependency is resolved before the contracts which link against it.
+        The result for each contract is recorded against the current block
+        number.
+        """
+        self._validate_caches()
+        dependency_graph = self.chain.project.dependency_graph
+        block_number = self.chain.web3.eth.blockNumber
+
+        deploy_order = dependency_graph.get_deploy_order(contract_identifiers)
+        contracts_to_resolve = itertools.chain(
+            deploy_order,
+            sorted(set(contract_identifiers).difference(deploy_order)),
         )
 
-        if not bytecode_matched_addresses:
-            return False
+        availability = {}
+        for contract_identifier in contracts_to_resolve:
+            cache_key = (contract_identifier, block_number)
+            if cache_key not in self._availability_cache:
+                self._availability_cache[cache_key] = all(
+                    availability[dependency_name]
+                    for dependency_name
+                    in dependency_graph.get_dependencies(contract_identifier)
+                ) and self._is_contract_deployed(contract_identifier)
+            availability[contract_identifier] = self._availability_cache[cache_key]
+        return availability
 
-        return True
+    def is_contract_available(self, contract_identifier):
+        return self.resolve_contract_availability([contract_identifier])[contract_identifier]
 
     def are_contract_dependencies_available(self, contract_identifier):
-        full_dependency_graph = get_shallow_dependency_graph(
-            self.chain.project.compiled_contract_data,
-        )
-        contract_dependencies = get_recursive_contract_dependencies(
-            contract_identifier,
-            full_dependency_graph,
-        )
-
-        dependency_deploy_order = [
-            dependency_name
-            for dependency_name
-            in compute_deploy_order(full_dependency_graph)
-            if dependency_name in contract_dependencies
-        ]
-        for dependency_name in dependency_deploy_order:
-            if self.is_contract_available(dependency_name):
-                continue
-            return False
-        else:
-            return True
+        dependencies = self.chain.project.dependency_graph.get_dependencies(contract_identifier)
+        availability = self.resolve_contract_availability(dependencies)
+        return all(availability.values())
 
     def get_contract(self, contract_identifier):
         ContractFactory = self.get_contract_factory(contract_identifier)
@@ -112,12 +189,13 @@ class Provider(object):
             self.chain.web3,
             ContractFactory.bytecode_runtime,
             contract_addresses,
+            self.bytecode_verification_cache,
+            functools.partial(self._get_deploy_block_number, contract_identifier),
         )
         if not bytecode_matched_addresses:
             raise BytecodeMismatch("None of the known addresses matched the expected bytecode")
         else:
-            # TODO: don't just default to the first address.
-            contract_address = contract_addresses[0]
+            contract_address = bytecode_matched_addresses[0]
 
         return ContractFactory(address=contract_address)
 
@@ -130,20 +208,9 @@ class Provider(object):
         Same as get_contract but it will also lazily deploy the contract with
         the provided deployment arguments
         """
-        full_dependency_graph = get_shallow_dependency_graph(
-            self.chain.project.compiled_contract_data,
-        )
-        contract_dependencies = get_recursive_contract_dependencies(
+        dependency_deploy_order = self.chain.project.dependency_graph.get_dependency_deploy_order(
             contract_identifier,
-            full_dependency_graph,
         )
-
-        dependency_deploy_order = [
-            dependency_name
-            for dependency_name
-            in compute_deploy_order(full_dependency_graph)
-            if dependency_name in contract_dependencies
-        ]
         for dependency_name in dependency_deploy_order:
             self.get_or_deploy_contract(dependency_name, deploy_transaction=deploy_transaction)
 
@@ -155,7 +222,11 @@ class Provider(object):
         )
         contract_address = self.chain.wait.for_contract_address(deploy_transaction_hash)
         registrar = self.chain.registrar
-        registrar.set_contract_address(contract_identifier, contract_address)
+        registrar.set_contract_address(
+            contract_identifier,
+            contract_address,
+            deploy_transaction_hash=deploy_transaction_hash,
+        )
 
         return self.get_contract(contract_identifier), deploy_transaction_hash
 
@@ -193,7 +264,7 @@ class Provider(object):
         Returns a dictionary containing the compiler output for the given
         contract identifier.
         """
-        for backend in self.provider_backends.value():
+        for backend in self.provider_backends.values():
             try:
                 return backend.get_contract_data(contract_identifier)
             except UnknownContract:
@@ -225,24 +296,71 @@ class Provider(object):
             in self.provider_backends.values()
         ))
 
+    def get_contract_name_index(self):
+        """
+        Returns a `ContractNameIndex` of all of the known contract identifiers
+        which is only rebuilt along with the other provider caches.
+        """
+        self._validate_caches()
+        if self._contract_name_index is None:
+            self._contract_name_index = ContractNameIndex(self.get_all_contract_names())
+        return self._contract_name_index
+
+    def get_code_fingerprint_index(self):
+        """
+        Returns a `CodeFingerprintIndex` of the runtime bytecode of all of the
+        known contracts which is only rebuilt along with the other provider
+        caches.
+        """
+        self._validate_caches()
+        if self._code_fingerprint_index is None:
+            self._code_fingerprint_index = CodeFingerprintIndex(self.get_all_contract_data())
+        return self._code_fingerprint_index
+
+    @to_dict
+    def identify_contracts(self, addresses):
+        """
+        Returns a dictionary mapping each of the given addresses to the sorted
+        contract identifiers whose runtime bytecode matches the code at that
+        address.  The code at each address is only fetched once.
+        """
+        code_fingerprint_index = self.get_code_fingerprint_index()
+        web3 = self.chain.web3
+        block_number = web3.eth.blockNumber
+        for address in set(addresses):
+            yield address, code_fingerprint_index.identify(
+                self.code_cache.get_code(web3, address, block_number),
+            )
+
     def get_contract_factory(self, contract_identifier):
         """
         Returns the contract factory for the given `contract_identifier`.  The
         `bytecode` and `bytecode_runtime` values for this factory will be fully
         linked.
         """
+        self._validate_caches()
         if contract_identifier in self._factory_cache:
             return self._factory_cache[contract_identifier]
 
         BaseContractFactory = self.get_base_contract_factory(contract_identifier)
 
-        bytecode = self._link_bytecode(BaseContractFactory.bytecode)
-        bytecode_runtime = self._link_bytecode(BaseContractFactory.bytecode_runtime)
+        linked_bytecodes = self._link_bytecodes(
+            contract_identifier,
+            BaseContractFactory.populus_contract_data,
+            bytecodes={
+                'bytecode': BaseContractFactory.bytecode,
+                'bytecode_runtime': BaseContractFactory.bytecode_runtime,
+            },
+            link_reference_indexes={
+                'bytecode': BaseContractFactory.link_references,
+                'bytecode_runtime': BaseContractFactory.link_references_runtime,
+            },
+        )
 
         ContractFactory = BaseContractFactory.factory(
             web3=BaseContractFactory.web3,
-            bytecode=bytecode,
-            bytecode_runtime=bytecode_runtime,
+            bytecode=linked_bytecodes['bytecode'],
+            bytecode_runtime=linked_bytecodes['bytecode_runtime'],
         )
 
         self._factory_cache[contract_identifier] = ContractFactory
@@ -251,23 +369,108 @@ class Provider(object):
     #
     # Private API
     #
-    def _link_bytecode(self, bytecode):
+    def _is_contract_deployed(self, contract_identifier):
+        """
+        Return whether any of the registered addresses for the contract has
+        the expected bytecode.  The contract's dependencies must already be
+        known to be available.
+        """
+        try:
+            contract_addresses = self.chain.registrar.get_contract_addresses(contract_identifier)
+        except NoKnownAddress:
+            return False
+
+        ContractFactory = self.get_contract_factory(contract_identifier)
+        bytecode_matched_addresses = filter_addresses_by_bytecode_match(
+            self.chain.web3,
+            ContractFactory.bytecode_runtime,
+            contract_addresses,
+            self.bytecode_verification_cache,
+            functools.partial(self._get_deploy_block_number, contract_identifier),
+        )
+        return bool(bytecode_matched_addresses)
+
+    def _get_deploy_block_number(self, contract_identifier, contract_address):
+        """
+        Return the block number the registrar records for the deployment of
+        the contract at the address, or `None` if it is not known.
+        """
+        deploy_info = self.chain.registrar.get_deploy_info(contract_identifier, contract_address)
+        if deploy_info is None:
+            return None
+        return deploy_info['block_number']
+
+    def _get_link_references(self, bytecode, link_reference_index=None):
+        """
+        Return the link references of the bytecode.  When the stored
+        `link_reference_index` for the bytecode is available it is used in
+        place of scanning the bytecode for link placeholders.
+        """
+        if bytecode is None or link_reference_index == []:
+            return tuple()
+        elif link_reference_index is not None:
+            return get_link_references_from_index(
+                link_reference_index,
+                self.get_contract_name_index(),
+            )
+        else:
+            return find_link_references(
+                bytecode,
+                self.get_contract_name_index(),
+            )
+
+    def _link_bytecodes(self,
+                        contract_identifier,
+                        contract_data,
+                        bytecodes,
+                        link_reference_indexes):
         """
-        Return the fully linked contract bytecode.
+        Return the fully linked bytecodes.  The address of each link dependency
+        is resolved once and shared by all of the bytecodes.
+
+        Linked bytecodes are cached by the artifact hashes of the contract and
+        its dependencies, the registrar's address version and the block
+        number.  The dependencies would resolve to the same verified addresses
+        for as long as these are unchanged, so a cache hit skips resolving
+        them.
 
         Note: This *must* use `get_contract` and **not** `get_contract_address`
         for resolution of link dependencies.  If it merely uses
         `get_contract_address` then the bytecode of sub-dependencies is not
         verified.
         """
-        resolved_link_references = tuple((
-            (link_reference, self.chain.provider.get_contract(link_reference.full_name).address)
+        link_references = {
+            key: self._get_link_references(bytecode, link_reference_indexes.get(key))
+            for key, bytecode in bytecodes.items()
+        }
+        dependency_names = set(
+            link_reference.full_name
             for link_reference
-            in find_link_references(
-                bytecode,
-                self.get_all_contract_names(),
-            )
-        ))
+            in itertools.chain.from_iterable(link_references.values())
+        )
+        if not dependency_names:
+            return bytecodes
 
-        linked_bytecode = link_bytecode(bytecode, resolved_link_references)
-        return linked_bytecode
+        artifact_hashes = {
+            dependency_name: get_contract_data_hash(self.get_contract_data(dependency_name))
+            for dependency_name
+            in dependency_names.union(
+                self.chain.project.dependency_graph.get_dependencies(contract_identifier),
+            )
+        }
+        artifact_hashes[contract_identifier] = get_contract_data_hash(contract_data)
+        cache_key = get_linked_bytecode_cache_key(
+            contract_identifier,
+            artifact_hashes,
+            self.chain.registrar.get_cache_version(),
+            self.chain.web3.eth.blockNumber,
+        )
+        linked_bytecodes = self.linked_bytecode_cache.get(cache_key)
+        if linked_bytecodes is None:
+            link_values = {
+                dependency_name: self.get_contract(dependency_name).address
+                for dependency_name in dependency_names
+            }
+            linked_bytecodes = link_bytecodes(bytecodes, link_values, link_references)
+            self.linked_bytecode_cache.set(cache_key, linked_bytecodes)
+        return linked_bytecodes
@@ -1,6 +1,14 @@
+import contextlib
 import functools
 import itertools
 
+try:
+    from contextlib import ExitStack
+except ImportError:
+    from contextlib2 import ExitStack
+
+from pylru import lrucache
+
 from eth_utils import (
     to_tuple,
 )
@@ -11,41 +19,161 @@ from populus.utils.contracts import (
 )
 from populus.utils.functional import chain_return
 
+from .cache import (
+    CodeCache,
+)
 from .exceptions import (
     NoKnownAddress,
 )
 
 
-def address_sort_fn(web3, address):
-    try:
-        return find_deploy_block_number(web3, address)
-    except ValueError:
-        return -1
+DEFAULT_ADDRESS_CACHE_SIZE = 128
 
 
 class Registrar(object):
     """
     Abstraction for recording known contracts on a given chain.
+
+    When a contract has more than one known address the addresses are ordered
+    from the most recently deployed using the deploy block recorded for each
+    of them.
+
+    The addresses found for each contract are cached until a contract address
+    is set through the registrar or the cache version of one of the backends
+    changes, as happens when another process writes to a shared backend.  The
+    `address_version` is incremented each time the cache is dropped so that
+    anything derived from the known addresses can tell when it needs to be
+    rebuilt.
     """
     registrar_backends = None
+    address_version = 0
 
-    def __init__(self, chain, registrar_backends):
+    def __init__(self,
+                 chain,
+                 registrar_backends,
+                 address_cache_size=DEFAULT_ADDRESS_CACHE_SIZE,
+                 code_cache=None):
         self.chain = chain
         self.registrar_backends = registrar_backends
+        if code_cache is None:
+            code_cache = CodeCache()
+        self.code_cache = code_cache
+        self._address_cache = lrucache(address_cache_size)
+        self._backends_cache_version = None
+
+    def clear_caches(self):
+        self._address_cache.clear()
+        self.address_version += 1
 
-    def set_contract_address(self, contract_name, contract_address):
+    def get_cache_version(self):
         """
-        Set a contract address in the registrar
+        Returns the `address_version` after dropping the cached addresses if
+        any of the backends have been changed by another process.
         """
-        return [
-            registrar.set_contract_address(contract_name, contract_address)
-            for registrar in self.registrar_backends.values()
-        ]
+        self._validate_caches()
+        return self.address_version
+
+    def _validate_caches(self):
+        backends_cache_version = tuple(
+            registrar.get_cache_version()
+            for registrar
+            in self.registrar_backends.values()
+        )
+        if backends_cache_version != self._backends_cache_version:
+            self.clear_caches()
+            self._backends_cache_version = backends_cache_version
+
+    def set_contract_address(self,
+                             contract_name,
+                             contract_address,
+                             deploy_transaction_hash=None,
+                             deploy_block_number=None):
+        """
+        Set a contract address in the registrar, along with the hash and block
+        number of the transaction which deployed it when they are known.  The
+        block number is looked up from the transaction receipt if only the
+        transaction hash is given.
+        """
+        self.clear_caches()
+
+        if deploy_block_number is None and deploy_transaction_hash is not None:
+            deploy_receipt = self.chain.web3.eth.getTransactionReceipt(deploy_transaction_hash)
+            if deploy_receipt is not None:
+                deploy_block_number = deploy_receipt['blockNumber']
+
+        if deploy_block_number is None:
+            deploy_info = None
+        else:
+            deploy_info = {
+                'block_number': deploy_block_number,
+                'transaction_hash': deploy_transaction_hash,
+            }
+
+        results = []
+        with self.batch():
+            for registrar in self.registrar_backends.values():
+                results.append(registrar.set_contract_address(contract_name, contract_address))
+                if deploy_info is not None:
+                    registrar.set_deploy_info(contract_name, contract_address, deploy_info)
+        return results
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Group a series of writes to the registrar so that each backend may
+        persist them together once the block exits.
+        """
+        with ExitStack() as stack:
+            for registrar in self.registrar_backends.values():
+                stack.enter_context(registrar.batch())
+            yield
 
     def get_contract_addresses(self, contract_identifier):
         """
         Retrieve a contract address from the registrar
         """
+        self._validate_caches()
+        if contract_identifier not in self._address_cache:
+            self._address_cache[contract_identifier] = self._get_contract_addresses(
+                contract_identifier,
+            )
+        return self._address_cache[contract_identifier]
+
+    def get_deploy_info(self, contract_identifier, contract_address):
+        """
+        Retrieve the `block_number` and `transaction_hash` of the deployment of
+        the contract at the given address, or `None` if they are not known.
+
+        Entries which were registered without this information have their
+        deploy block found on the chain once, which is then stored in all of
+        the registrar backends.
+        """
+        for registrar in self.registrar_backends.values():
+            deploy_info = registrar.get_deploy_info(contract_identifier, contract_address)
+            if deploy_info is not None:
+                return deploy_info
+
+        try:
+            deploy_block_number = find_deploy_block_number(self.chain.web3, contract_address)
+        except (ValueError, NotImplementedError):
+            return None
+
+        deploy_info = {
+            'block_number': deploy_block_number,
+            'transaction_hash': None,
+        }
+        with self.batch():
+            for registrar in self.registrar_backends.values():
+                registrar.set_deploy_info(contract_identifier, contract_address, deploy_info)
+        return deploy_info
+
+    def _get_deploy_block_number(self, contract_identifier, contract_address):
+        deploy_info = self.get_deploy_info(contract_identifier, contract_address)
+        if deploy_info is None:
+            return -1
+        return deploy_info['block_number']
+
+    def _get_contract_addresses(self, contract_identifier):
         found_addresses = self._get_contract_addresses_from_backends(contract_identifier)
         if not found_addresses:
             raise NoKnownAddress("No known address for contract")
@@ -53,23 +181,21 @@ class Registrar(object):
         if len(found_addresses) == 1:
             return found_addresses
 
-        addresses_with_code = tuple(set(
+        web3 = self.chain.web3
+        block_number = web3.eth.blockNumber
+        unique_addresses = set(found_addresses)
+        empty_addresses = tuple(
             address
             for address
-            in found_addresses
-            if self.chain.web3.eth.getCode(address) not in EMPTY_BYTECODE_VALUES
-        ))
-        empty_addresses = tuple(set(
-            address
-            for address
-            in found_addresses
-            if self.chain.web3.eth.getCode(address) in EMPTY_BYTECODE_VALUES
-        ))
+            in unique_addresses
+            if self.code_cache.get_code(web3, address, block_number) in EMPTY_BYTECODE_VALUES
+        )
+        addresses_with_code = tuple(unique_addresses.difference(empty_addresses))
 
         if len(addresses_with_code) > 1:
             sorted_addresses = tuple(sorted(
                 addresses_with_code,
-                key=functools.partial(address_sort_fn, self.chain.web3),
+                key=functools.partial(self._get_deploy_block_number, contract_identifier),
                 reverse=True,
             ))
         else:
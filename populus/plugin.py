@@ -7,22 +7,13 @@ from populus.utils.contracts import (
 )
 
 
-CACHE_KEY_MTIME = "populus/project/compiled_contracts_mtime"
-CACHE_KEY_CONTRACTS = "populus/project/compiled_contracts"
-
-
 @pytest.fixture(scope="session")
-def project(request):
-    contracts = request.config.cache.get(CACHE_KEY_CONTRACTS, None)
-    mtime = request.config.cache.get(CACHE_KEY_MTIME, None)
-
-    project = Project()
-
-    project.fill_contracts_cache(contracts, mtime)
-    request.config.cache.set(CACHE_KEY_CONTRACTS, project.compiled_contract_data)
-    request.config.cache.set(CACHE_KEY_MTIME, project.get_source_modification_time())
-
-    return project
+def project():
+    # The compiled contracts are served lazily from the project's build
+    # artifacts, which are only recompiled when the sources have changed.
+    # When a `populus compile --serve` compile server is running for the
+    # project the recompilation is done by the server.
+    return Project()
 
 
 @pytest.yield_fixture()
@@ -1,8 +1,21 @@
+import logging
 import os
-import itertools
 
 from populus.compilation import (
     compile_project_contracts,
+    compile_project_contracts_incrementally,
+    get_compiler_info,
+)
+from populus.compilation.cache import (
+    CompilationCache,
+    DEFAULT_CACHE_MAX_SIZE,
+)
+from populus.compilation.server import (
+    CompileServerError,
+    get_compile_server_client,
+)
+from populus.compilation.source_index import (
+    SourceIndex,
 )
 from populus.config import (
     ChainConfig,
@@ -14,19 +27,33 @@ from populus.config import (
     write_config as _write_config,
 )
 
+from populus.utils.artifacts import (
+    ContractArtifactsMapping,
+    DEFAULT_RESIDENT_CONTRACT_LIMIT,
+    get_contract_artifacts_dir,
+    get_contract_artifacts_index_path,
+    load_contract_artifacts_compiler_info,
+    load_contract_artifacts_index,
+    write_contract_artifacts,
+)
 from populus.utils.chains import (
     get_base_blockchain_storage_dir,
 )
 from populus.utils.compile import (
     get_build_asset_dir,
+    get_compilation_cache_dir,
     get_compiled_contracts_asset_path,
     get_contracts_source_dir,
-    get_project_source_paths,
-    get_test_source_paths,
+)
+from populus.utils.deploy import (
+    DependencyGraph,
 )
 from populus.utils.filesystem import (
     relpath,
 )
+from populus.utils.linking import (
+    ContractNameIndex,
+)
 from populus.utils.config import (
     check_if_json_config_file_exists,
     get_default_project_config_file_path,
@@ -130,6 +157,16 @@ class Project(object):
     def compiled_contracts_asset_path(self):
         return get_compiled_contracts_asset_path(self.build_asset_dir)
 
+    @property
+    @relpath
+    def contract_artifacts_dir(self):
+        return get_contract_artifacts_dir(self.build_asset_dir)
+
+    @property
+    @relpath
+    def contract_artifacts_index_path(self):
+        return get_contract_artifacts_index_path(self.build_asset_dir)
+
     @property
     @relpath
     def contracts_source_dir(self):
@@ -146,16 +183,29 @@ class Project(object):
     _cached_compiled_contracts_mtime = None
     _cached_compiled_contracts = None
 
+    # Incremented each time the compiled contract data is replaced so that
+    # anything derived from it can tell when it needs to be rebuilt.
+    compiled_contract_data_version = 0
+
+    _source_index = None
+
+    @property
+    def source_index(self):
+        """
+        The index of the project and test source files.  The file list is
+        kept until `source_index.invalidate()` is called or, after calling
+        `source_index.watch()`, until a change is observed on disk.  Compiling
+        the project brings an unwatched index up to date.
+        """
+        base_dirs = (self.contracts_source_dir, self.tests_dir)
+        if self._source_index is None or self._source_index.base_dirs != base_dirs:
+            if self._source_index is not None:
+                self._source_index.stop_watching()
+            self._source_index = SourceIndex(base_dirs)
+        return self._source_index
+
     def get_source_modification_time(self):
-        all_source_paths = tuple(itertools.chain(
-            get_project_source_paths(self.contracts_source_dir),
-            get_test_source_paths(self.tests_dir),
-        ))
-        return max(
-            os.path.getmtime(source_file_path)
-            for source_file_path
-            in all_source_paths
-        ) if len(all_source_paths) > 0 else None
+        return self.source_index.get_modification_time()
 
     def is_compiled_contract_cache_stale(self):
         if self._cached_compiled_contracts is None:
@@ -178,14 +228,188 @@ class Project(object):
         """
         self._cached_compiled_contracts_mtime = contracts_mtime
         self._cached_compiled_contracts = contracts
+        self._compile_server_build_id = None
+        self.compiled_contract_data_version += 1
+
+    def is_built_with_project_compiler(self):
+        """
+        Return whether the build artifacts were produced by the project
+        compiler backend with its current version and settings.  The version
+        is not compared if the current one cannot be determined, so that the
+        artifacts can still be used where the compiler is not installed.
+        """
+        built_compiler_info = load_contract_artifacts_compiler_info(self.build_asset_dir)
+        if built_compiler_info is None:
+            return False
+
+        compiler_info = get_compiler_info(self)
+        if compiler_info['version'] is None:
+            built_compiler_info = dict(built_compiler_info, version=None)
+        return built_compiler_info == compiler_info
+
+    def load_contract_artifacts(self):
+        """
+        Return a lazily loaded mapping of the contract data in the project's
+        build artifacts along with the time the artifacts were last written,
+        or `(None, None)` if there are no build artifacts.
+        """
+        artifacts_index = load_contract_artifacts_index(self.build_asset_dir)
+        if artifacts_index is None:
+            return None, None
+        contract_artifacts = ContractArtifactsMapping(
+            self.build_asset_dir,
+            artifacts_index,
+            max_resident=self.config.get(
+                'compilation.max_resident_contracts',
+                DEFAULT_RESIDENT_CONTRACT_LIMIT,
+            ),
+        )
+        return contract_artifacts, os.path.getmtime(self.contract_artifacts_index_path)
+
+    #
+    # Compile Server
+    #
+    use_compile_server = True
+    _compile_server_build_id = None
+    _compile_server_source_generation = None
+
+    def _sync_with_compile_server(self):
+        """
+        Have a running compile server bring the build artifacts up to date,
+        returning the served contract data, or `None` if there is no compile
+        server available.  The server is only asked again once the source
+        index has been invalidated.
+        """
+        is_synced = (
+            self._compile_server_build_id is not None and
+            self._compile_server_source_generation == self.source_index.generation
+        )
+        if is_synced:
+            return self._cached_compiled_contracts
+
+        compile_server_client = get_compile_server_client(self.build_asset_dir)
+        if compile_server_client is None:
+            return None
+
+        try:
+            response = compile_server_client.sync()
+        except CompileServerError as err:
+            logger = logging.getLogger('populus.project.Project')
+            logger.warning("Compile server unavailable, compiling locally: %s", err)
+            return None
+
+        is_new_build = (
+            self._cached_compiled_contracts is None or
+            response['build_id'] != self._compile_server_build_id
+        )
+        if is_new_build:
+            contract_artifacts, _ = self.load_contract_artifacts()
+            if contract_artifacts is None:
+                return None
+            self.fill_contracts_cache(contract_artifacts, response['source_mtime'])
+            self._compile_server_build_id = response['build_id']
+        self._compile_server_source_generation = self.source_index.generation
+        return self._cached_compiled_contracts
 
     @property
     def compiled_contract_data(self):
+        if self.use_compile_server:
+            served_contract_data = self._sync_with_compile_server()
+            if served_contract_data is not None:
+                return served_contract_data
+
+        # Artifacts built with a different compiler, compiler version or
+        # compiler settings are not reused and everything is recompiled.
+        if self._cached_compiled_contracts is None and self.is_built_with_project_compiler():
+            self.fill_contracts_cache(*self.load_contract_artifacts())
+
         if self.is_compiled_contract_cache_stale():
-            self._cached_compiled_contracts_mtime = self.get_source_modification_time()
-            _, self._cached_compiled_contracts = compile_project_contracts(self)
+            source_mtime = self.get_source_modification_time()
+            if self._cached_compiled_contracts is None:
+                _, compiled_contracts = compile_project_contracts(self)
+            else:
+                _, compiled_contracts = compile_project_contracts_incrementally(
+                    self,
+                    self._cached_compiled_contracts,
+                    self._cached_compiled_contracts_mtime,
+                )
+            # The freshly compiled data is written out to the build artifacts
+            # and then served lazily from there so that only the contracts
+            # which are actually used are held in memory.
+            write_contract_artifacts(
+                self.build_asset_dir,
+                compiled_contracts,
+                compiler_info=get_compiler_info(self),
+            )
+            contract_artifacts, _ = self.load_contract_artifacts()
+            self.fill_contracts_cache(contract_artifacts, source_mtime)
         return self._cached_compiled_contracts
 
+    _contract_name_index = None
+
+    @property
+    def contract_name_index(self):
+        """
+        A `ContractNameIndex` of the names of all of the compiled contracts,
+        rebuilt only when the compiled contract data changes.
+        """
+        compiled_contract_data = self.compiled_contract_data
+        if self._contract_name_index is None or \
+                self._contract_name_index[0] != self.compiled_contract_data_version:
+            self._contract_name_index = (
+                self.compiled_contract_data_version,
+                ContractNameIndex(compiled_contract_data.keys()),
+            )
+        return self._contract_name_index[1]
+
+    _dependency_graph = None
+
+    @property
+    def dependency_graph(self):
+        """
+        The `DependencyGraph` of the link dependencies between the compiled
+        contracts, rebuilt only when the compiled contract data changes.
+        """
+        compiled_contract_data = self.compiled_contract_data
+        if self._dependency_graph is None or \
+                self._dependency_graph[0] != self.compiled_contract_data_version:
+            self._dependency_graph = (
+                self.compiled_contract_data_version,
+                DependencyGraph.from_compiled_contracts(
+                    compiled_contract_data,
+                    self.contract_name_index,
+                ),
+            )
+        return self._dependency_graph[1]
+
+    @property
+    @relpath
+    def compilation_cache_dir(self):
+        return get_compilation_cache_dir(self.build_asset_dir)
+
+    _compilation_cache = None
+
+    @property
+    def compilation_cache(self):
+        """
+        The persistent cache of per-source compiler output, or `None` if it
+        has been disabled with the `compilation.cache.enabled` setting.  The
+        same cache is returned for as long as its settings are unchanged so
+        that it keeps track of its total size.
+        """
+        if not self.config.get('compilation.cache.enabled', True):
+            return None
+        cache_dir = self.compilation_cache_dir
+        max_size = self.config.get('compilation.cache.max_size', DEFAULT_CACHE_MAX_SIZE)
+        is_outdated = (
+            self._compilation_cache is None or
+            self._compilation_cache.cache_dir != cache_dir or
+            self._compilation_cache.max_size != max_size
+        )
+        if is_outdated:
+            self._compilation_cache = CompilationCache(cache_dir, max_size=max_size)
+        return self._compilation_cache
+
     #
     # Compiler Backend
     #
@@ -0,0 +1,575 @@
+from __future__ import absolute_import
+
+import hashlib
+import itertools
+import json
+import logging
+import os
+
+from pylru import lrucache
+
+from .filesystem import (
+    remove_file_if_exists,
+    write_file_atomically,
+)
+from .linking import (
+    get_link_reference_index,
+)
+from .six import (
+    Mapping,
+)
+
+
+CONTRACT_ARTIFACTS_DIRNAME = './contracts'
+
+
+def get_contract_artifacts_dir(build_asset_dir):
+    contract_artifacts_dir = os.path.join(
+        build_asset_dir,
+        CONTRACT_ARTIFACTS_DIRNAME,
+    )
+    return contract_artifacts_dir
+
+
+CONTRACT_ARTIFACTS_INDEX_FILENAME = './contracts.index.json'
+
+
+def get_contract_artifacts_index_path(build_asset_dir):
+    contract_artifacts_index_path = os.path.join(
+        build_asset_dir,
+        CONTRACT_ARTIFACTS_INDEX_FILENAME,
+    )
+    return contract_artifacts_index_path
+
+
+def get_contract_artifact_path(contract_artifacts_dir, contract_name):
+    return os.path.join(contract_artifacts_dir, '{0}.json'.format(contract_name))
+
+
+def get_contract_artifact_extras_path(contract_artifacts_dir, contract_name):
+    return os.path.join(contract_artifacts_dir, '{0}.extras.json'.format(contract_name))
+
+
+ARTIFACTS_INDEX_VERSION = 4
+
+
+# The fields which are needed to deploy and interact with a contract.  These
+# are stored in the main artifact for each contract while the remaining
+# compiler outputs (metadata, docs, source maps, etc) are stored alongside it
+# in a separate extras file which is only read on demand.
+HOT_CONTRACT_FIELDS = (
+    'abi',
+    'bytecode',
+    'bytecode_runtime',
+    'link_references',
+    'link_references_runtime',
+    'source_path',
+)
+
+
+def split_contract_data(contract_data):
+    """
+    Split the contract data into its hot fields and the remaining heavy
+    fields.
+    """
+    hot_contract_data = {
+        key: value
+        for key, value in contract_data.items()
+        if key in HOT_CONTRACT_FIELDS
+    }
+    heavy_contract_data = {
+        key: value
+        for key, value in contract_data.items()
+        if key not in HOT_CONTRACT_FIELDS
+    }
+    return hot_contract_data, heavy_contract_data
+
+
+def serialize_contract_data(contract_data):
+    return json.dumps(contract_data, sort_keys=True, separators=(',', ':'))
+
+
+def get_artifact_hash(serialized_contract_data):
+    return hashlib.sha256(serialized_contract_data.encode('utf8')).hexdigest()
+
+
+class StaleArtifactError(ValueError):
+    """
+    Raised when an artifact file does not match the hash recorded for it in
+    the artifact index, which happens when the artifacts are rewritten after
+    the index was read.
+    """
+    pass
+
+
+def get_link_dependency_names(contract_data):
+    """
+    Return the sorted reference names of the link placeholders in the
+    contract's bytecode or `None` if the contract has no bytecode.  The stored
+    link reference index is used when present.
+    """
+    if contract_data.get('link_references') is not None:
+        link_reference_index = contract_data['link_references']
+    elif contract_data.get('bytecode') is not None:
+        link_reference_index = get_link_reference_index(contract_data['bytecode'])
+    else:
+        return None
+    return sorted(set(
+        link_reference['name'] for link_reference in link_reference_index
+    ))
+
+
+def _load_contract_artifacts_index_data(build_asset_dir):
+    index_path = get_contract_artifacts_index_path(build_asset_dir)
+    if not os.path.exists(index_path):
+        return None
+
+    with open(index_path) as index_file:
+        try:
+            index_data = json.load(index_file)
+        except ValueError:
+            return None
+
+    if index_data.get('version') != ARTIFACTS_INDEX_VERSION:
+        return None
+    return index_data
+
+
+def load_contract_artifacts_index(build_asset_dir):
+    """
+    Load the index of the per-contract build artifacts, returning a mapping
+    of contract names to their artifact `hash`, the hashes of the main
+    artifact file and of the extras file, `source_path`, `path`, the names of
+    the `heavy_fields` stored in the extras file and the reference names of
+    its `link_dependencies`, or `None` if no readable index exists.
+    """
+    index_data = _load_contract_artifacts_index_data(build_asset_dir)
+    if index_data is None:
+        return None
+    return index_data['contracts']
+
+
+def load_contract_artifacts_compiler_info(build_asset_dir):
+    """
+    Load the description of the compiler which produced the build artifacts,
+    as recorded by `write_contract_artifacts`, or `None` if there is no
+    readable index or no compiler was recorded.
+    """
+    index_data = _load_contract_artifacts_index_data(build_asset_dir)
+    if index_data is None:
+        return None
+    return index_data.get('compiler')
+
+
+def _read_artifact_file(file_path, expected_hash=None):
+    with open(file_path) as artifact_file:
+        serialized_contract_data = artifact_file.read()
+    if expected_hash is not None and get_artifact_hash(serialized_contract_data) != expected_hash:
+        raise StaleArtifactError(
+            "The artifact at {0} does not match the artifact index".format(file_path)
+        )
+    return json.loads(serialized_contract_data)
+
+
+def load_hot_contract_data(build_asset_dir, contract_name, expected_hash=None):
+    """
+    Load the main artifact for the contract.  When `expected_hash` is given a
+    `StaleArtifactError` is raised if the file contents do not match it.
+    """
+    artifact_path = get_contract_artifact_path(
+        get_contract_artifacts_dir(build_asset_dir),
+        contract_name,
+    )
+    return _read_artifact_file(artifact_path, expected_hash)
+
+
+def load_heavy_contract_data(build_asset_dir, contract_name, expected_hash=None):
+    """
+    Load the extras artifact for the contract.  When `expected_hash` is given a
+    `StaleArtifactError` is raised if the file contents do not match it.
+    """
+    extras_path = get_contract_artifact_extras_path(
+        get_contract_artifacts_dir(build_asset_dir),
+        contract_name,
+    )
+    if not os.path.exists(extras_path):
+        return {}
+    return _read_artifact_file(extras_path, expected_hash)
+
+
+def load_contract_artifact(build_asset_dir, contract_name):
+    """
+    Load the full contract data for a single contract from the build
+    artifacts.
+    """
+    contract_data = load_hot_contract_data(build_asset_dir, contract_name)
+    contract_data.update(load_heavy_contract_data(build_asset_dir, contract_name))
+    return contract_data
+
+
+def load_contract_artifacts(build_asset_dir):
+    """
+    Load the contract data for every contract in the build artifacts, or
+    `None` if there is no artifact index.
+    """
+    artifacts_index = load_contract_artifacts_index(build_asset_dir)
+    if artifacts_index is None:
+        return None
+
+    return {
+        contract_name: load_contract_artifact(build_asset_dir, contract_name)
+        for contract_name in artifacts_index
+    }
+
+
+def write_contract_artifacts(build_asset_dir, compiled_contract_data, compiler_info=None):
+    """
+    Write one artifact file per contract along with a compact index of the
+    contract names, content hashes and source paths.  The heavy compiler
+    outputs for each contract are written to a separate extras file.  The
+    `compiler_info` describing the compiler which produced the contract data
+    is recorded in the index.
+
+    Every file is written through an atomic rename and an artifact is only
+    rewritten when its content hash has changed.  Artifacts for contracts which
+    are no longer present are removed.  Returns the names of the contracts
+    whose artifacts were written.
+    """
+    logger = logging.getLogger('populus.utils.artifacts.write_contract_artifacts')
+
+    contract_artifacts_dir = get_contract_artifacts_dir(build_asset_dir)
+    previous_index = load_contract_artifacts_index(build_asset_dir) or {}
+
+    artifacts_index = {}
+    written_contract_names = []
+
+    for contract_name, contract_data in sorted(compiled_contract_data.items()):
+        artifact_path = get_contract_artifact_path(contract_artifacts_dir, contract_name)
+        previous_entry = previous_index.get(contract_name, {})
+
+        # Contract data which was read from these same artifacts is known to
+        # be unchanged without needing to load and serialize it again.
+        is_retained = (
+            isinstance(contract_data, ProjectedContractData) and
+            contract_data.build_asset_dir == build_asset_dir and
+            contract_data.artifact_hash == previous_entry.get('hash') and
+            os.path.exists(artifact_path)
+        )
+        if is_retained:
+            artifacts_index[contract_name] = previous_entry
+            continue
+
+        contract_data = dict(contract_data)
+        artifact_hash = get_artifact_hash(serialize_contract_data(contract_data))
+        hot_contract_data, heavy_contract_data = split_contract_data(contract_data)
+        serialized_hot_contract_data = serialize_contract_data(hot_contract_data)
+        serialized_heavy_contract_data = serialize_contract_data(heavy_contract_data)
+        extras_path = get_contract_artifact_extras_path(contract_artifacts_dir, contract_name)
+
+        is_unchanged = (
+            previous_entry.get('hash') == artifact_hash and
+            os.path.exists(artifact_path) and
+            (not heavy_contract_data or os.path.exists(extras_path))
+        )
+        if not is_unchanged:
+            write_file_atomically(artifact_path, serialized_hot_contract_data)
+            if heavy_contract_data:
+                write_file_atomically(extras_path, serialized_heavy_contract_data)
+            else:
+                remove_file_if_exists(extras_path)
+            written_contract_names.append(contract_name)
+
+        artifacts_index[contract_name] = {
+            'hash': artifact_hash,
+            'hot_hash': get_artifact_hash(serialized_hot_contract_data),
+            'heavy_hash': (
+                get_artifact_hash(serialized_heavy_contract_data)
+                if heavy_contract_data
+                else None
+            ),
+            'source_path': contract_data.get('source_path'),
+            'path': os.path.relpath(artifact_path, build_asset_dir),
+            'heavy_fields': sorted(heavy_contract_data.keys()),
+            'link_dependencies': get_link_dependency_names(contract_data),
+        }
+
+    for contract_name in set(previous_index).difference(artifacts_index):
+        remove_file_if_exists(
+            get_contract_artifact_path(contract_artifacts_dir, contract_name),
+        )
+        remove_file_if_exists(
+            get_contract_artifact_extras_path(contract_artifacts_dir, contract_name),
+        )
+
+    is_index_unchanged = (
+        artifacts_index == previous_index and
+        compiler_info == load_contract_artifacts_compiler_info(build_asset_dir)
+    )
+    if is_index_unchanged:
+        # The index modification time records when the artifacts were last
+        # brought up to date with the project sources.
+        os.utime(get_contract_artifacts_index_path(build_asset_dir), None)
+    else:
+        write_file_atomically(
+            get_contract_artifacts_index_path(build_asset_dir),
+            json.dumps(
+                {
+                    'version': ARTIFACTS_INDEX_VERSION,
+                    'compiler': compiler_info,
+                    'contracts': artifacts_index,
+                },
+                sort_keys=True,
+                separators=(',', ':'),
+            ),
+        )
+
+    logger.info(
+        "> Wrote %s of %s contract artifacts to: %s",
+        len(written_contract_names),
+        len(artifacts_index),
+        os.path.relpath(contract_artifacts_dir),
+    )
+
+    return tuple(written_contract_names)
+
+
+class ProjectedContractData(Mapping):
+    """
+    Read-only contract data for a single contract from the build artifacts.
+    The hot fields are held in memory while the heavy fields are only read
+    from the extras file the first time one of them is accessed.
+
+    If the extras file has been rewritten since the hot fields were read, the
+    artifact index is read again, through `contract_artifacts` when given.
+    The heavy fields are then loaded if the artifacts still hold the same
+    contract, and otherwise a `KeyError` is raised for them.
+    """
+    build_asset_dir = None
+    contract_name = None
+    artifact_hash = None
+
+    def __init__(self,
+                 build_asset_dir,
+                 contract_name,
+                 hot_contract_data,
+                 artifact_index_entry,
+                 contract_artifacts=None):
+        self.build_asset_dir = build_asset_dir
+        self.contract_name = contract_name
+        self.artifact_hash = artifact_index_entry['hash']
+        self._hot_contract_data = hot_contract_data
+        self._heavy_fields = tuple(artifact_index_entry.get('heavy_fields', ()))
+        self._heavy_hash = artifact_index_entry.get('heavy_hash')
+        self._heavy_contract_data = None
+        self._contract_artifacts = contract_artifacts
+
+    def __getitem__(self, key):
+        if key in self._hot_contract_data:
+            return self._hot_contract_data[key]
+        elif key in self._heavy_fields:
+            if self._heavy_contract_data is None:
+                try:
+                    self._heavy_contract_data = self._load_heavy_contract_data()
+                except StaleArtifactError:
+                    raise KeyError(key)
+            return self._heavy_contract_data[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self._hot_contract_data or key in self._heavy_fields
+
+    def __iter__(self):
+        return itertools.chain(self._hot_contract_data, self._heavy_fields)
+
+    def __len__(self):
+        return len(self._hot_contract_data) + len(self._heavy_fields)
+
+    @property
+    def is_heavy_data_loaded(self):
+        return self._heavy_contract_data is not None
+
+    def _load_heavy_contract_data(self):
+        try:
+            return load_heavy_contract_data(
+                self.build_asset_dir,
+                self.contract_name,
+                expected_hash=self._heavy_hash,
+            )
+        except StaleArtifactError:
+            pass
+
+        if self._contract_artifacts is None:
+            artifacts_index = load_contract_artifacts_index(self.build_asset_dir) or {}
+        else:
+            self._contract_artifacts.reload_index()
+            artifacts_index = self._contract_artifacts.artifacts_index
+        artifact_index_entry = artifacts_index.get(self.contract_name)
+
+        if artifact_index_entry is None or artifact_index_entry['hash'] != self.artifact_hash:
+            raise StaleArtifactError(
+                "The artifacts for {0} have changed since its contract data was "
+                "read".format(self.contract_name)
+            )
+        self._heavy_hash = artifact_index_entry.get('heavy_hash')
+        return load_heavy_contract_data(
+            self.build_asset_dir,
+            self.contract_name,
+            expected_hash=self._heavy_hash,
+        )
+
+
+def get_contract_data_hash(contract_data):
+    """
+    Return the artifact hash of the contract data, using the hash recorded in
+    the artifact index for contract data which was read from the build
+    artifacts.
+    """
+    if isinstance(contract_data, ProjectedContractData):
+        return contract_data.artifact_hash
+    return get_artifact_hash(serialize_contract_data(dict(contract_data)))
+
+
+DEFAULT_RESIDENT_CONTRACT_LIMIT = 128
+
+
+class ContractArtifactsMapping(Mapping):
+    """
+    Read-only mapping of contract names to contract data backed by the
+    per-contract build artifacts.  All of the contract names are known up front
+    from the artifact index but the data for each contract is only read from
+    disk the first time it is accessed, and its heavy compiler outputs only
+    once they are asked for.  At most `max_resident` contracts are held in
+    memory with the least recently used ones being dropped.
+
+    Each artifact file is checked against the hash recorded for it in the
+    index as it is loaded.  If the artifacts have been rewritten since the
+    index was read, the index is read again and the contract data which was
+    loaded from the previous artifacts is dropped.
+    """
+    build_asset_dir = None
+    artifacts_index = None
+
+    def __init__(self,
+                 build_asset_dir,
+                 artifacts_index=None,
+                 max_resident=DEFAULT_RESIDENT_CONTRACT_LIMIT):
+        if artifacts_index is None:
+            artifacts_index = load_contract_artifacts_index(build_asset_dir)
+        if artifacts_index is None:
+            raise ValueError(
+                "No contract artifacts index found in: {0}".format(build_asset_dir)
+            )
+        self.build_asset_dir = build_asset_dir
+        self.artifacts_index = artifacts_index
+        self._resident_contract_data = lrucache(max_resident)
+
+    def __getitem__(self, contract_name):
+        if contract_name not in self.artifacts_index:
+            raise KeyError(contract_name)
+        try:
+            return self._resident_contract_data[contract_name]
+        except KeyError:
+            pass
+
+        try:
+            hot_contract_data = self._load_hot_contract_data(contract_name)
+        except StaleArtifactError:
+            self.reload_index()
+            if contract_name not in self.artifacts_index:
+                raise KeyError(contract_name)
+            hot_contract_data = self._load_hot_contract_data(contract_name)
+
+        contract_data = ProjectedContractData(
+            self.build_asset_dir,
+            contract_name,
+            hot_contract_data,
+            self.artifacts_index[contract_name],
+            contract_artifacts=self,
+        )
+        self._resident_contract_data[contract_name] = contract_data
+        return contract_data
+
+    def __contains__(self, contract_name):
+        return contract_name in self.artifacts_index
+
+    def __iter__(self):
+        return iter(self.artifacts_index)
+
+    def __len__(self):
+        return len(self.artifacts_index)
+
+    def reload_index(self):
+        """
+        Read the artifact index again, dropping any contract data which was
+        loaded using the previous index.
+        """
+        artifacts_index = load_contract_artifacts_index(self.build_asset_dir)
+        if artifacts_index is None:
+            raise StaleArtifactError(
+                "No contract artifacts index found in: {0}".format(self.build_asset_dir)
+            )
+        self.artifacts_index = artifacts_index
+        self._resident_contract_data.clear()
+
+    def _load_hot_contract_data(self, contract_name):
+        return load_hot_contract_data(
+            self.build_asset_dir,
+            contract_name,
+            expected_hash=self.artifacts_index[contract_name]['hot_hash'],
+        )
+
+    def get_source_path(self, contract_name):
+        """
+        Return the source path recorded in the artifact index for the
+        contract without loading its data.
+        """
+        return self.artifacts_index[contract_name]['source_path']
+
+    def get_link_dependencies(self, contract_name):
+        """
+        Return the link reference names recorded in the artifact index for the
+        contract's bytecode without loading its data.
+        """
+        return self.artifacts_index[contract_name]['link_dependencies']
+
+
+def get_recorded_source_paths(compiled_contract_data):
+    """
+    Return a mapping of contract names to the `source_path` recorded for each
+    contract, reading it from the artifact index rather than the contract data
+    when possible.
+    """
+    if isinstance(compiled_contract_data, ContractArtifactsMapping):
+        return {
+            contract_name: compiled_contract_data.get_source_path(contract_name)
+            for contract_name in compiled_contract_data
+        }
+    return {
+        contract_name: contract_data.get('source_path')
+        for contract_name, contract_data in compiled_contract_data.items()
+    }
+
+
+def get_recorded_link_dependencies(compiled_contract_data):
+    """
+    Return a mapping of contract names to the reference names of the link
+    placeholders in each contract's bytecode, reading them from the artifact
+    index rather than the contract data when possible.  Contracts without
+    bytecode are omitted.
+    """
+    if isinstance(compiled_contract_data, ContractArtifactsMapping):
+        link_dependencies = {
+            contract_name: compiled_contract_data.get_link_dependencies(contract_name)
+            for contract_name in compiled_contract_data
+        }
+    else:
+        link_dependencies = {
+            contract_name: get_link_dependency_names(contract_data)
+            for contract_name, contract_data in compiled_contract_data.items()
+        }
+    return {
+        contract_name: reference_names
+        for contract_name, reference_names in link_dependencies.items()
+        if reference_names is not None
+    }
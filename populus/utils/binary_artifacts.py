@@ -0,0 +1,316 @@
+from __future__ import absolute_import
+
+import binascii
+import json
+import mmap
+import os
+import re
+import struct
+
+from eth_utils import (
+    add_0x_prefix,
+    remove_0x_prefix,
+)
+
+from .compile import (
+    write_compiled_sources,
+)
+from .filesystem import (
+    write_file_atomically,
+)
+from .linking import (
+    DEPENDENCY_RE,
+)
+from .six import (
+    Mapping,
+)
+
+
+BINARY_ARTIFACTS_FILENAME = './contracts.bin'
+
+
+def get_binary_artifacts_path(build_asset_dir):
+    binary_artifacts_path = os.path.join(
+        build_asset_dir,
+        BINARY_ARTIFACTS_FILENAME,
+    )
+    return binary_artifacts_path
+
+
+#
+# Container layout
+#
+#   magic          8 bytes
+#   version        uint32
+#   index length   uint64
+#   index          JSON encoded, `index length` bytes
+#   data           the sections referenced by the index
+#
+# The index maps each contract name to the `[offset, length]` of each of its
+# sections, with offsets being relative to the start of the data.  All
+# integers are big endian.
+#
+BINARY_ARTIFACTS_MAGIC = b'POPULUS\x00'
+BINARY_ARTIFACTS_VERSION = 1
+
+HEADER_FORMAT = '>8sIQ'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# The contract data fields which are stored as raw bytes.  Every other field
+# is stored in the JSON encoded `data` section of the contract.
+BINARY_CONTRACT_FIELDS = (
+    'bytecode',
+    'bytecode_runtime',
+)
+
+
+def encode_bytecode(bytecode):
+    """
+    Convert hex encoded bytecode into raw bytes.  Unlinked bytecode cannot be
+    decoded directly so each link placeholder is replaced with zero bytes and
+    returned as a list of `(byte_offset, placeholder)` pairs.
+    """
+    unprefixed_bytecode = remove_0x_prefix(bytecode)
+
+    link_placeholders = []
+    for match in re.finditer(DEPENDENCY_RE, unprefixed_bytecode):
+        if match.start() % 2 or len(match.group()) % 2:
+            raise ValueError(
+                "Link placeholder '{0}' is not aligned to a byte boundary".format(
+                    match.group(),
+                )
+            )
+        link_placeholders.append([match.start() // 2, match.group()])
+
+    zeroed_bytecode = re.sub(
+        DEPENDENCY_RE,
+        lambda match: '0' * len(match.group()),
+        unprefixed_bytecode,
+    )
+    return binascii.unhexlify(zeroed_bytecode), link_placeholders
+
+
+def decode_bytecode(raw_bytecode, link_placeholders=()):
+    """
+    Convert raw bytecode back into its hex encoded form, restoring any link
+    placeholders.
+    """
+    hex_bytecode = binascii.hexlify(memoryview(raw_bytecode).tobytes()).decode('ascii')
+    for byte_offset, placeholder in link_placeholders:
+        hex_offset = byte_offset * 2
+        hex_bytecode = ''.join((
+            hex_bytecode[:hex_offset],
+            placeholder,
+            hex_bytecode[hex_offset + len(placeholder):],
+        ))
+    return add_0x_prefix(hex_bytecode)
+
+
+def serialize_binary_artifacts(compiled_contract_data):
+    """
+    Serialize the compiled contract data into the binary container format.
+    """
+    sections = []
+    index = {}
+    data_length = 0
+
+    for contract_name, contract_data in sorted(compiled_contract_data.items()):
+        contract_sections = {}
+        other_data = {
+            key: value
+            for key, value in contract_data.items()
+            if key not in BINARY_CONTRACT_FIELDS
+        }
+        link_placeholders = {}
+
+        for field in BINARY_CONTRACT_FIELDS:
+            if contract_data.get(field) is None:
+                continue
+            raw_bytecode, placeholders = encode_bytecode(contract_data[field])
+            if placeholders:
+                link_placeholders[field] = placeholders
+            contract_sections[field] = raw_bytecode
+
+        other_data['link_placeholders'] = link_placeholders
+        contract_sections['data'] = json.dumps(
+            other_data,
+            sort_keys=True,
+            separators=(',', ':'),
+        ).encode('utf8')
+
+        index[contract_name] = {}
+        for section_name, section in sorted(contract_sections.items()):
+            index[contract_name][section_name] = [data_length, len(section)]
+            sections.append(section)
+            data_length += len(section)
+
+    encoded_index = json.dumps(
+        index,
+        sort_keys=True,
+        separators=(',', ':'),
+    ).encode('utf8')
+
+    header = struct.pack(
+        HEADER_FORMAT,
+        BINARY_ARTIFACTS_MAGIC,
+        BINARY_ARTIFACTS_VERSION,
+        len(encoded_index),
+    )
+    return b''.join([header, encoded_index] + sections)
+
+
+def write_binary_artifacts(binary_artifacts_path, compiled_contract_data):
+    write_file_atomically(
+        binary_artifacts_path,
+        serialize_binary_artifacts(compiled_contract_data),
+        mode='wb',
+    )
+    return binary_artifacts_path
+
+
+class BinaryArtifacts(Mapping):
+    """
+    Read-only mapping of contract names to contract data backed by a memory
+    mapped binary artifacts file.
+
+    The `get_bytecode` and `get_bytecode_runtime` methods return `memoryview`
+    slices of the mapped file without copying them.  Link placeholders are
+    zeroed in these views and are available from `get_link_placeholders`.
+    Accessing a contract by name returns its contract data in the same form
+    as `contracts.json`.
+
+    All views returned by this object must be released before it is closed.
+    """
+    binary_artifacts_path = None
+
+    def __init__(self, binary_artifacts_path):
+        self.binary_artifacts_path = binary_artifacts_path
+
+        with open(binary_artifacts_path, 'rb') as binary_artifacts_file:
+            self._mmap = mmap.mmap(
+                binary_artifacts_file.fileno(),
+                0,
+                access=mmap.ACCESS_READ,
+            )
+
+        try:
+            self._buffer = memoryview(self._mmap)
+        except TypeError:
+            # Python 2 mmap objects do not support the new buffer protocol.
+            self._buffer = memoryview(self._mmap[:])
+
+        magic, version, index_length = struct.unpack(
+            HEADER_FORMAT,
+            self._buffer[:HEADER_SIZE].tobytes(),
+        )
+        if magic != BINARY_ARTIFACTS_MAGIC:
+            self.close()
+            raise ValueError(
+                "Not a binary artifacts file: {0}".format(binary_artifacts_path)
+            )
+        if version != BINARY_ARTIFACTS_VERSION:
+            self.close()
+            raise ValueError(
+                "Unsupported binary artifacts version {0} in: {1}".format(
+                    version,
+                    binary_artifacts_path,
+                )
+            )
+
+        self.index = json.loads(
+            self._buffer[HEADER_SIZE:HEADER_SIZE + index_length].tobytes().decode('utf8')
+        )
+        self._data_offset = HEADER_SIZE + index_length
+        self._contract_data = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if hasattr(self._buffer, 'release'):
+            self._buffer.release()
+        self._mmap.close()
+
+    def _get_section(self, contract_name, section_name):
+        offset, length = self.index[contract_name][section_name]
+        start = self._data_offset + offset
+        return self._buffer[start:start + length]
+
+    def _get_data(self, contract_name):
+        if contract_name not in self._contract_data:
+            self._contract_data[contract_name] = json.loads(
+                self._get_section(contract_name, 'data').tobytes().decode('utf8')
+            )
+        return self._contract_data[contract_name]
+
+    def get_bytecode(self, contract_name):
+        """
+        Return the raw contract bytecode as a `memoryview` or `None` if the
+        contract has no bytecode.
+        """
+        if 'bytecode' not in self.index[contract_name]:
+            return None
+        return self._get_section(contract_name, 'bytecode')
+
+    def get_bytecode_runtime(self, contract_name):
+        """
+        Return the raw runtime bytecode as a `memoryview` or `None` if the
+        contract has no runtime bytecode.
+        """
+        if 'bytecode_runtime' not in self.index[contract_name]:
+            return None
+        return self._get_section(contract_name, 'bytecode_runtime')
+
+    def get_link_placeholders(self, contract_name, field='bytecode'):
+        """
+        Return the `(byte_offset, placeholder)` pairs of the link placeholders
+        which were zeroed in the raw `field` bytecode.
+        """
+        return tuple(
+            (byte_offset, placeholder)
+            for byte_offset, placeholder
+            in self._get_data(contract_name)['link_placeholders'].get(field, [])
+        )
+
+    def __getitem__(self, contract_name):
+        if contract_name not in self.index:
+            raise KeyError(contract_name)
+
+        contract_data = {
+            key: value
+            for key, value in self._get_data(contract_name).items()
+            if key != 'link_placeholders'
+        }
+        for field in BINARY_CONTRACT_FIELDS:
+            if field in self.index[contract_name]:
+                contract_data[field] = decode_bytecode(
+                    self._get_section(contract_name, field),
+                    self.get_link_placeholders(contract_name, field),
+                )
+        return contract_data
+
+    def __contains__(self, contract_name):
+        return contract_name in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+
+def convert_contracts_json_to_binary(contracts_json_path, binary_artifacts_path):
+    with open(contracts_json_path) as contracts_json_file:
+        compiled_contract_data = json.load(contracts_json_file)
+    return write_binary_artifacts(binary_artifacts_path, compiled_contract_data)
+
+
+def convert_binary_to_contracts_json(binary_artifacts_path, contracts_json_path):
+    with BinaryArtifacts(binary_artifacts_path) as binary_artifacts:
+        compiled_contract_data = dict(binary_artifacts)
+
+    write_compiled_sources(contracts_json_path, compiled_contract_data)
+    return contracts_json_path
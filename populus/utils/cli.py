@@ -2,11 +2,15 @@ from __future__ import absolute_import
 
 import itertools
 import logging
+import os
 
 import click
 
 from populus.compilation import (
-    compile_project_contracts,
+    get_compiler_info,
+)
+from populus.compilation.server import (
+    CompileServer,
 )
 from populus.config import (
     Config,
@@ -19,12 +23,17 @@ from .compat import (
     Timeout,
     sleep,
 )
+from .artifacts import (
+    write_contract_artifacts,
+)
+from .binary_artifacts import (
+    get_binary_artifacts_path,
+    write_binary_artifacts,
+)
 from .compile import (
+    load_compiled_sources,
     write_compiled_sources,
 )
-from .contracts import (
-    verify_contract_bytecode,
-)
 from .geth import (
     get_data_dir as get_local_chain_datadir,
     get_geth_ipc_path,
@@ -268,6 +277,27 @@ def deploy_contract_and_verify(chain,
     happens.  This also verifies that the deployed contract's bytecode matches
     the expected value.
     """
+    contract_instance, _, _ = _deploy_contract_and_verify(
+        chain,
+        contract_name,
+        ContractFactory=ContractFactory,
+        deploy_transaction=deploy_transaction,
+        deploy_args=deploy_args,
+        deploy_kwargs=deploy_kwargs,
+    )
+    return contract_instance
+
+
+def _deploy_contract_and_verify(chain,
+                                contract_name,
+                                ContractFactory=None,
+                                deploy_transaction=None,
+                                deploy_args=None,
+                                deploy_kwargs=None):
+    """
+    Implementation of `deploy_contract_and_verify` which also returns the hash
+    and the receipt of the deploy transaction.
+    """
     web3 = chain.web3
     logger = logging.getLogger('populus.utils.cli.deploy_contract_and_verify')
 
@@ -316,11 +346,19 @@ def deploy_contract_and_verify(chain,
         )
     ))
 
-    # Verification
-    deployed_bytecode = web3.eth.getCode(contract_address)
+    # Verification.  The code is read through the chain's code cache so that
+    # verifying the bytecode below does not fetch it a second time.
+    deployed_bytecode = chain.code_cache.get_code(web3, contract_address)
 
     if ContractFactory.bytecode_runtime:
-        verify_contract_bytecode(web3, ContractFactory.bytecode_runtime, contract_address)
+        # Recording the verdict lets the provider skip checking the fresh
+        # deployment again.
+        chain.provider.bytecode_verification_cache.verify_contract_bytecode(
+            web3,
+            ContractFactory.bytecode_runtime,
+            contract_address,
+            lambda: deploy_receipt['blockNumber'],
+        )
         logger.info("Verified contract bytecode @ {0}".format(contract_address))
     else:
         logger.info(
@@ -334,34 +372,126 @@ def deploy_contract_and_verify(chain,
             logger.info(
                 "Verified bytecode @ {0} is non-empty".format(contract_address)
             )
-    return ContractFactory(address=contract_address)
+    return ContractFactory(address=contract_address), deploy_txn_hash, deploy_receipt
+
+
+def load_project_build_assets(project):
+    """
+    Load the previously written compiled contracts along with the time they
+    were written, preferring the per-contract artifacts over
+    `build/contracts.json`.  Returns `(None, None)` if nothing has been built
+    or the build was made with a different compiler or compiler settings.
+    Contract data from the artifacts is loaded lazily.
+    """
+    if project.is_built_with_project_compiler():
+        contract_artifacts, artifacts_mtime = project.load_contract_artifacts()
+        if contract_artifacts is not None:
+            return contract_artifacts, artifacts_mtime
+    elif os.path.exists(project.contract_artifacts_index_path):
+        # `build/contracts.json` was written alongside the artifacts by the
+        # same, now outdated, compiler.
+        return None, None
+
+    compiled_contract_data = load_compiled_sources(project.compiled_contracts_asset_path)
+    if compiled_contract_data is not None:
+        return (
+            compiled_contract_data,
+            os.path.getmtime(project.compiled_contracts_asset_path),
+        )
+
+    return None, None
+
+
+def write_project_build_assets(project, compiled_contract_data):
+    """
+    Write the per-contract build artifacts along with the combined build
+    assets which have been enabled for the project.
+    """
+    write_contract_artifacts(
+        project.build_asset_dir,
+        compiled_contract_data,
+        compiler_info=get_compiler_info(project),
+    )
+    write_combined_build_assets(project, compiled_contract_data)
+
+
+def write_combined_build_assets(project, compiled_contract_data):
+    """
+    Write the build assets which combine every contract into a single file.
+    `build/contracts.json` is written when enabled with the
+    `compilation.write_contracts_json` setting and the binary
+    `build/contracts.bin` when enabled with the
+    `compilation.write_binary_artifacts` setting.
+    """
+    if project.config.get('compilation.write_binary_artifacts', False):
+        write_binary_artifacts(
+            get_binary_artifacts_path(project.build_asset_dir),
+            compiled_contract_data,
+        )
+
+    if project.config.get('compilation.write_contracts_json', False):
+        write_compiled_sources(
+            project.compiled_contracts_asset_path,
+            {
+                contract_name: dict(contract_data)
+                for contract_name, contract_data
+                in compiled_contract_data.items()
+            },
+        )
 
 
-def watch_project_contracts(project, compiler_settings):
+def watch_project_contracts(project):
     logger = logging.getLogger('populus.utils.cli.watch_project_contracts')
 
     def callback(file_path, event_name):
-        if event_name in {'modified', 'created'}:
+        # Invalidate the source index directly as its own watcher may not have
+        # been notified of this change yet.
+        project.source_index.invalidate()
+        if event_name in {'modified', 'created'} and file_path.endswith('.sol'):
             logger.info("============ Compiling ==============")
             logger.info("> Change detected in: %s", file_path)
             logger.info("> Loading source files from: %s", project.contracts_source_dir)
 
-            contract_source_paths, compiled_sources = compile_project_contracts(project)
-            write_compiled_sources(
-                project.compiled_contracts_asset_path,
-                compiled_sources,
-            )
+            # Reading the compiled contract data compiles the changes and
+            # writes the per-contract build artifacts.
+            write_combined_build_assets(project, project.compiled_contract_data)
 
             logger.info("> Watching ...")
 
-    watcher = DirWatcher(project.contracts_dir, callback)
-    watcher.start()
+    project.source_index.watch()
+    watchers = [
+        DirWatcher(source_dir, callback)
+        for source_dir
+        in (project.contracts_source_dir, project.tests_dir)
+        if os.path.isdir(source_dir)
+    ]
+    for watcher in watchers:
+        watcher.start()
 
     try:
         while True:
             sleep(0.1)
     except KeyboardInterrupt:
         pass
+    finally:
+        for watcher in watchers:
+            watcher.stop()
+        project.source_index.stop_watching()
+
+
+def serve_project_contracts(project):
+    logger = logging.getLogger('populus.utils.cli.serve_project_contracts')
+
+    compile_server = CompileServer(project)
+    compile_server.sync()
+    logger.info("> Serving compiled contracts on: %s", compile_server.socket_path)
+
+    try:
+        compile_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        compile_server.server_close()
 
 
 def select_project_contract(project):
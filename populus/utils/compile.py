@@ -1,8 +1,10 @@
 from __future__ import absolute_import
 
+import collections
 import os
 import json
 import logging
+import re
 
 from eth_utils import (
     to_tuple,
@@ -10,7 +12,7 @@ from eth_utils import (
 
 from .filesystem import (
     recursive_find_files,
-    ensure_file_exists,
+    write_file_atomically,
 )
 
 
@@ -41,6 +43,17 @@ def get_compiled_contracts_asset_path(build_asset_dir):
     return compiled_contracts_asset_path
 
 
+COMPILATION_CACHE_DIRNAME = './compilation-cache'
+
+
+def get_compilation_cache_dir(build_asset_dir):
+    compilation_cache_dir = os.path.join(
+        build_asset_dir,
+        COMPILATION_CACHE_DIRNAME,
+    )
+    return compilation_cache_dir
+
+
 @to_tuple
 def find_solidity_source_files(base_dir):
     return (
@@ -60,17 +73,169 @@ def get_test_source_paths(tests_dir):
     return test_source_paths
 
 
+SOLIDITY_COMMENT_REGEX = r'//[^\n]*|/\*.*?\*/'
+
+SOLIDITY_IMPORT_REGEX = (
+    r'\bimport\s+'  # The `import` keyword
+    r'(?:[^;"\']*?\bfrom\s+)?'  # Optional symbol list or alias ending with `from`
+    r'["\']([^"\']+)["\']'  # The quoted import path
+)
+
+
+@to_tuple
+def find_solidity_imports(source):
+    """
+    Return the raw import paths found in the given solidity source code.
+    """
+    source_without_comments = re.sub(SOLIDITY_COMMENT_REGEX, '', source, flags=re.DOTALL)
+    for match in re.finditer(SOLIDITY_IMPORT_REGEX, source_without_comments):
+        yield match.group(1)
+
+
+def resolve_solidity_import_path(import_path, source_path, import_remappings=None):
+    """
+    Resolve an import path found in `source_path` the same way that `solc`
+    does; relative imports are resolved against the directory of the importing
+    file while all other imports are subject to the import remappings.
+    """
+    if import_path.startswith('.'):
+        return os.path.normpath(os.path.join(os.path.dirname(source_path), import_path))
+
+    for remapping in import_remappings or tuple():
+        context_and_prefix, _, target = remapping.partition('=')
+        _, _, prefix = context_and_prefix.rpartition(':')
+        if prefix and import_path.startswith(prefix):
+            return os.path.normpath(target + import_path[len(prefix):])
+    return os.path.normpath(import_path)
+
+
+def get_source_import_graph(source_paths, import_remappings=None):
+    """
+    Return a mapping of each source path to the set of source paths that it
+    directly imports.  Imported files which exist on the filesystem are
+    followed so that the graph also covers sources outside of `source_paths`.
+    """
+    import_graph = {}
+    to_visit = list(source_paths)
+
+    while to_visit:
+        source_path = to_visit.pop()
+        if source_path in import_graph:
+            continue
+
+        with open(source_path) as source_file:
+            source = source_file.read()
+        import_graph[source_path] = set(
+            resolve_solidity_import_path(import_path, source_path, import_remappings)
+            for import_path
+            in find_solidity_imports(source)
+        )
+        to_visit.extend(
+            imported_path
+            for imported_path
+            in import_graph[source_path]
+            if imported_path not in import_graph and os.path.isfile(imported_path)
+        )
+    return import_graph
+
+
+def get_imported_source_paths(source_path, import_graph):
+    """
+    Return every source path which `source_path` directly or transitively
+    imports.
+    """
+    imported_source_paths = set()
+    to_visit = [source_path]
+
+    while to_visit:
+        for imported_path in import_graph.get(to_visit.pop(), set()):
+            if imported_path not in imported_source_paths:
+                imported_source_paths.add(imported_path)
+                to_visit.append(imported_path)
+
+    return imported_source_paths
+
+
+def get_dependent_source_paths(source_paths, import_graph):
+    """
+    Return the given source paths along with every source path which directly
+    or transitively imports any of them.
+    """
+    reverse_import_graph = collections.defaultdict(set)
+    for source_path, imported_paths in import_graph.items():
+        for imported_path in imported_paths:
+            reverse_import_graph[imported_path].add(source_path)
+
+    dependent_source_paths = set(source_paths)
+    to_visit = list(source_paths)
+
+    while to_visit:
+        for importer_path in reverse_import_graph[to_visit.pop()]:
+            if importer_path not in dependent_source_paths:
+                dependent_source_paths.add(importer_path)
+                to_visit.append(importer_path)
+
+    return dependent_source_paths
+
+
+def get_source_import_components(source_paths, import_graph):
+    """
+    Partition `source_paths` into groups of sources which are connected
+    through their (direct or transitive) imports.  Sources from different
+    groups share no imported files and can be compiled independently.
+    """
+    parents = {}
+
+    def find_root(path):
+        parents.setdefault(path, path)
+        while parents[path] != path:
+            parents[path] = parents[parents[path]]
+            path = parents[path]
+        return path
+
+    for source_path in source_paths:
+        source_root = find_root(source_path)
+        for imported_path in import_graph.get(source_path, set()):
+            imported_root = find_root(imported_path)
+            if imported_root != source_root:
+                parents[imported_root] = source_root
+
+    components = collections.defaultdict(list)
+    for source_path in source_paths:
+        components[find_root(source_path)].append(source_path)
+
+    return tuple(sorted(
+        tuple(sorted(component))
+        for component
+        in components.values()
+    ))
+
+
+def load_compiled_sources(compiled_contracts_asset_path):
+    """
+    Load previously written compiled assets, returning `None` if they are
+    missing or unreadable.
+    """
+    if not os.path.exists(compiled_contracts_asset_path):
+        return None
+
+    with open(compiled_contracts_asset_path) as infile:
+        try:
+            return json.load(infile)
+        except ValueError:
+            return None
+
+
 def write_compiled_sources(compiled_contracts_asset_path, compiled_sources):
     logger = logging.getLogger('populus.compilation.write_compiled_sources')
-    ensure_file_exists(compiled_contracts_asset_path)
-
-    with open(compiled_contracts_asset_path, 'w') as outfile:
-        outfile.write(
-            json.dumps(compiled_sources,
-                       sort_keys=True,
-                       indent=4,
-                       separators=(',', ': '))
-        )
+
+    write_file_atomically(
+        compiled_contracts_asset_path,
+        json.dumps(compiled_sources,
+                   sort_keys=True,
+                   indent=4,
+                   separators=(',', ': ')),
+    )
 
     logger.info(
         "> Wrote compiled assets to: %s",
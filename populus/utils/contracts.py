@@ -1,16 +1,29 @@
+import binascii
+import collections
+import hashlib
 import itertools
 import re
+import struct
 
 from eth_utils import (
-    is_string,
+    decode_hex,
     remove_0x_prefix,
+    to_tuple,
 )
 
+from .artifacts import (
+    get_recorded_link_dependencies,
+    get_recorded_source_paths,
+)
 from .filesystem import (
     is_under_path,
 )
 from .linking import (
-    find_link_references,
+    DEPENDENCY_RE,
+    LINK_REFERENCE_INDEX_FIELDS,
+    ContractNameIndex,
+    expand_shortened_reference_name,
+    get_link_reference_index,
 )
 from .mappings import (
     get_nested_key,
@@ -21,6 +34,13 @@ from .string import (
 
 
 def get_contract_source_file_path(contract_data):
+    """
+    Return the path of the source file that the contract was compiled from,
+    preferring the `source_path` recorded by the compiler backend and falling
+    back to the compilation target from the contract metadata.
+    """
+    if contract_data.get('source_path'):
+        return contract_data['source_path']
     compilation_target = get_nested_key(contract_data, 'metadata.settings.compilationTarget')
     assert len(compilation_target) == 1
     return tuple(compilation_target.keys())[0]
@@ -30,7 +50,8 @@ def is_project_contract(contracts_source_dir, contract_data):
     try:
         contract_source_file_path = get_contract_source_file_path(contract_data)
     except KeyError:
-        # TODO: abstract contracts don't have a metadata value.  How do we handle this....
+        # Abstract contracts compiled by older compilers have neither a
+        # `source_path` nor a metadata value.
         return False
     return is_under_path(contracts_source_dir, contract_source_file_path)
 
@@ -39,11 +60,32 @@ def is_test_contract(tests_dir, contract_data):
     try:
         contract_source_file_path = get_contract_source_file_path(contract_data)
     except KeyError:
-        # TODO: abstract contracts don't have a metadata value.  How do we handle this....
+        # Abstract contracts compiled by older compilers have neither a
+        # `source_path` nor a metadata value.
         return False
     return is_under_path(tests_dir, contract_source_file_path)
 
 
+@to_tuple
+def get_contract_names_under_path(base_path, compiled_contract_data):
+    """
+    Return the names of the compiled contracts whose source file is located
+    under `base_path`.  Recorded source paths are used where available so
+    that the data for each contract does not need to be loaded.
+    """
+    recorded_source_paths = get_recorded_source_paths(compiled_contract_data)
+    for contract_name, source_path in sorted(recorded_source_paths.items()):
+        if source_path is None:
+            try:
+                source_path = get_contract_source_file_path(
+                    compiled_contract_data[contract_name],
+                )
+            except KeyError:
+                continue
+        if is_under_path(base_path, source_path):
+            yield contract_name
+
+
 def package_contracts(contract_factories):
     _dict = {
         '__len__': lambda s: len(contract_factories),
@@ -98,19 +140,26 @@ def construct_contract_factories(web3, contracts):
     return package_contracts(contract_classes)
 
 
-def get_shallow_dependency_graph(contracts):
+def get_shallow_dependency_graph(contracts, contract_name_index=None):
     """
     Given a dictionary of compiled contract data, this returns a *shallow*
-    dependency graph of each contracts explicit link dependencies.
+    dependency graph of each contracts explicit link dependencies.  The link
+    references are read from the stored link reference index rather than by
+    scanning the bytecode whenever possible.
+
+    A prebuilt `contract_name_index` of the contract names may be provided,
+    otherwise one is built from `contracts`.
     """
+    if contract_name_index is None:
+        contract_name_index = ContractNameIndex(contracts.keys())
+
     link_dependencies = {
-        contract_name: set(ref.full_name for ref in find_link_references(
-            contract_data['bytecode'],
-            contracts.keys(),
-        ))
-        for contract_name, contract_data
-        in contracts.items()
-        if is_string(contract_data.get('bytecode'))
+        contract_name: set(
+            expand_shortened_reference_name(reference_name, contract_name_index)
+            for reference_name in reference_names
+        )
+        for contract_name, reference_names
+        in get_recorded_link_dependencies(contracts).items()
     }
     return link_dependencies
 
@@ -138,56 +187,214 @@ def is_contract_name(value):
 EMPTY_BYTECODE_VALUES = {None, "0x"}
 
 
-SWARM_HASH_PREFIX = "a165627a7a72305820"
-SWARM_HASH_SUFFIX = "0029"
-EMBEDDED_SWARM_HASH_REGEX = (
-    SWARM_HASH_PREFIX +
-    "[0-9a-zA-Z]{64}" +
-    SWARM_HASH_SUFFIX +
-    "$"
-)
+def _skip_cbor_item(data, offset):
+    """
+    Return the offset just past the CBOR data item which starts at `offset`.
+    Only the definite length encodings which the solidity compiler emits are
+    supported.  Raises `ValueError` if the data is not a well formed item.
+    """
+    if offset >= len(data):
+        raise ValueError("Unexpected end of CBOR data")
+
+    major_type = data[offset] >> 5
+    additional_info = data[offset] & 0x1f
+    offset += 1
+
+    if additional_info < 24:
+        argument = additional_info
+    elif additional_info < 28:
+        argument_length = 1 << (additional_info - 24)
+        if offset + argument_length > len(data):
+            raise ValueError("Unexpected end of CBOR data")
+        argument = 0
+        for value in data[offset:offset + argument_length]:
+            argument = (argument << 8) | value
+        offset += argument_length
+    else:
+        raise ValueError("Unsupported CBOR encoding: {0}".format(additional_info))
+
+    if major_type in {0, 1, 7}:
+        # integers, simple values and floats carry no further data.
+        return offset
+    elif major_type in {2, 3}:
+        if offset + argument > len(data):
+            raise ValueError("Unexpected end of CBOR data")
+        return offset + argument
+    elif major_type == 4:
+        for _ in range(argument):
+            offset = _skip_cbor_item(data, offset)
+        return offset
+    elif major_type == 5:
+        for _ in range(argument * 2):
+            offset = _skip_cbor_item(data, offset)
+        return offset
+    else:
+        raise ValueError("Unsupported CBOR major type: {0}".format(major_type))
+
+
+def get_metadata_length(raw_bytecode):
+    """
+    Return the number of bytes, including the two trailing length bytes, taken
+    up by the CBOR encoded metadata which the compiler appends to the
+    bytecode, or `0` if the bytecode does not end with a metadata section.
+    """
+    raw_bytecode = bytearray(raw_bytecode)
+    if len(raw_bytecode) < 2:
+        return 0
+
+    cbor_length = (raw_bytecode[-2] << 8) | raw_bytecode[-1]
+    cbor_start = len(raw_bytecode) - 2 - cbor_length
+    if cbor_length == 0 or cbor_start < 0:
+        return 0
+
+    # The metadata is always a single CBOR map spanning the whole section.
+    if raw_bytecode[cbor_start] >> 5 != 5:
+        return 0
+    try:
+        cbor_end = _skip_cbor_item(raw_bytecode, cbor_start)
+    except ValueError:
+        return 0
+    if cbor_end != len(raw_bytecode) - 2:
+        return 0
 
-SWARM_HASH_REPLACEMENT = (
-    SWARM_HASH_PREFIX +
-    "<" +
-    "-" * 20 +
-    "swarm-hash-placeholder" +
-    "-" * 20 +
-    ">" +
-    SWARM_HASH_SUFFIX
-)
+    return cbor_length + 2
 
 
-def compare_bytecode(left, right):
-    unprefixed_left = remove_0x_prefix(left)
-    unprefixed_right = remove_0x_prefix(right)
+def _decode_bytecode(bytecode):
+    if bytecode is None:
+        bytecode = ''
+    try:
+        return decode_hex(bytecode)
+    except (binascii.Error, TypeError) as err:
+        raise ValueError("Invalid bytecode: {0}".format(err))
 
-    norm_left = re.sub(EMBEDDED_SWARM_HASH_REGEX, SWARM_HASH_REPLACEMENT, unprefixed_left)
-    norm_right = re.sub(EMBEDDED_SWARM_HASH_REGEX, SWARM_HASH_REPLACEMENT, unprefixed_right)
 
-    if len(norm_left) != len(unprefixed_left) or len(norm_right) != len(unprefixed_right):
-        raise ValueError(
-            "Invariant.  Normalized bytecodes are not the correct lengths:" +
-            "\n- left  (original)  :" +
-            left, +
-            "\n- left  (unprefixed):" +
-            unprefixed_left +
-            "\n- left  (normalized):" +
-            norm_left +
-            "\n- right (original)  :" +
-            right +
-            "\n- right (unprefixed):" +
-            unprefixed_right +
-            "\n- right (normalized):" +
-            norm_right
-        )
+def _split_raw_bytecode_metadata(raw_bytecode):
+    split_at = len(raw_bytecode) - get_metadata_length(raw_bytecode)
+    return raw_bytecode[:split_at], raw_bytecode[split_at:]
+
+
+def _get_raw_code_fingerprint(raw_bytecode):
+    executable_bytecode, metadata = _split_raw_bytecode_metadata(raw_bytecode)
+    return hashlib.sha256(
+        executable_bytecode + struct.pack('>I', len(metadata))
+    ).hexdigest()
 
-    return norm_left == norm_right
+
+def split_bytecode_metadata(bytecode):
+    """
+    Split hex encoded bytecode into its executable part and its trailing
+    metadata section, both as raw bytes.  Raises `ValueError` if the bytecode
+    is not valid hex, such as unlinked bytecode.
+    """
+    return _split_raw_bytecode_metadata(_decode_bytecode(bytecode))
+
+
+def get_code_fingerprint(bytecode):
+    """
+    Return a hash of the bytecode which ignores the contents of its metadata
+    section.  Two bytecodes have the same fingerprint exactly when
+    `compare_bytecode` considers them equal.
+    """
+    return _get_raw_code_fingerprint(_decode_bytecode(bytecode))
+
+
+def _zero_byte_ranges(raw_bytecode, byte_ranges):
+    zeroed_bytecode = bytearray(raw_bytecode)
+    for offset, length in byte_ranges:
+        zeroed_bytecode[offset:offset + length] = bytearray(length)
+    return bytes(zeroed_bytecode)
+
+
+class CodeFingerprintIndex(object):
+    """
+    Index of the runtime bytecode of a set of contracts by code fingerprint,
+    used to identify which of the contracts the code found at an address
+    belongs to.
+
+    Runtime bytecode without link references is looked up directly by its
+    fingerprint.  Unlinked runtime bytecode is indexed by its length along
+    with the byte ranges of its link placeholders, which are zeroed in both
+    the indexed and the identified code before their fingerprints are
+    compared.
+    """
+    def __init__(self, contracts):
+        self._fingerprints = collections.defaultdict(set)
+        self._unlinked = collections.defaultdict(list)
+
+        for contract_name, contract_data in contracts.items():
+            bytecode_runtime = contract_data.get('bytecode_runtime')
+            if bytecode_runtime in EMPTY_BYTECODE_VALUES:
+                continue
+
+            link_reference_index = contract_data.get(
+                LINK_REFERENCE_INDEX_FIELDS['bytecode_runtime'],
+            )
+            if link_reference_index is None:
+                link_reference_index = get_link_reference_index(bytecode_runtime)
+
+            if link_reference_index:
+                link_ranges = tuple(
+                    (link_reference['offset'] // 2, link_reference['length'] // 2)
+                    for link_reference in link_reference_index
+                )
+                raw_bytecode = _decode_bytecode(re.sub(
+                    DEPENDENCY_RE,
+                    lambda match: '0' * len(match.group()),
+                    bytecode_runtime,
+                ))
+                self._unlinked[len(raw_bytecode)].append((
+                    contract_name,
+                    link_ranges,
+                    _get_raw_code_fingerprint(raw_bytecode),
+                ))
+            else:
+                fingerprint = _get_raw_code_fingerprint(_decode_bytecode(bytecode_runtime))
+                self._fingerprints[fingerprint].add(contract_name)
+
+    def identify(self, bytecode):
+        """
+        Return the sorted names of the contracts whose runtime bytecode matches
+        the given code.
+        """
+        if bytecode in EMPTY_BYTECODE_VALUES:
+            return tuple()
+        try:
+            raw_bytecode = _decode_bytecode(bytecode)
+        except ValueError:
+            return tuple()
+
+        contract_names = set(self._fingerprints.get(_get_raw_code_fingerprint(raw_bytecode), ()))
+        for contract_name, link_ranges, fingerprint in self._unlinked.get(len(raw_bytecode), ()):
+            zeroed_bytecode = _zero_byte_ranges(raw_bytecode, link_ranges)
+            if _get_raw_code_fingerprint(zeroed_bytecode) == fingerprint:
+                contract_names.add(contract_name)
+        return tuple(sorted(contract_names))
+
+
+def compare_bytecode(left, right):
+    """
+    Compare two hex encoded bytecodes, ignoring the contents of the metadata
+    section appended by the compiler since it differs between otherwise
+    identical builds.
+    """
+    try:
+        left_executable, left_metadata = split_bytecode_metadata(left)
+        right_executable, right_metadata = split_bytecode_metadata(right)
+    except ValueError:
+        return remove_0x_prefix(left or '') == remove_0x_prefix(right or '')
+
+    return (
+        left_executable == right_executable and
+        len(left_metadata) == len(right_metadata)
+    )
 
 
-def verify_contract_bytecode(web3, expected_bytecode, address):
+def verify_contract_bytecode(web3, expected_bytecode, address, chain_bytecode=None):
     """
-    TODO: write tests for this.
+    Raise `BytecodeMismatch` unless the code at `address` matches the
+    expected bytecode.  The code is fetched from the chain unless it is
+    provided as `chain_bytecode`.
     """
     from populus.contracts.exceptions import BytecodeMismatch
 
@@ -198,7 +405,8 @@ def verify_contract_bytecode(web3, expected_bytecode, address):
             "runtime bytecode"
         )
 
-    chain_bytecode = web3.eth.getCode(address)
+    if chain_bytecode is None:
+        chain_bytecode = web3.eth.getCode(address)
 
     if chain_bytecode in EMPTY_BYTECODE_VALUES:
         raise BytecodeMismatch(
@@ -1,11 +1,9 @@
-import itertools
 from collections import OrderedDict
 
 import toposort
 
 from populus.utils.contracts import (
     get_shallow_dependency_graph,
-    get_recursive_contract_dependencies,
 )
 
 
@@ -17,25 +15,95 @@ def compute_deploy_order(dependency_graph):
     return toposort.toposort_flatten(dependency_graph)
 
 
-def get_deploy_order(contracts_to_deploy, compiled_contracts):
-    # Extract and dependencies that exist due to library linking.
-    dependency_graph = get_shallow_dependency_graph(compiled_contracts)
-    global_deploy_order = compute_deploy_order(dependency_graph)
+class DependencyGraph(object):
+    """
+    The link dependency graph of a set of compiled contracts.  The topological
+    levels of the graph, the overall deploy order and the transitive closure
+    of each contract's dependencies are all computed once up front.
+    """
+    shallow_dependencies = None
+    levels = None
+    deploy_order = None
+
+    def __init__(self, shallow_dependency_graph):
+        self.shallow_dependencies = {
+            contract_name: frozenset(dependencies)
+            for contract_name, dependencies in shallow_dependency_graph.items()
+        }
+        self.levels = tuple(
+            frozenset(level)
+            for level in toposort.toposort(self.shallow_dependencies)
+        )
+        # Matches the ordering of `compute_deploy_order`.
+        self.deploy_order = tuple(
+            contract_name
+            for level in self.levels
+            for contract_name in sorted(level)
+        )
+
+        # Every dependency of a contract is in an earlier level so its
+        # closure is always known by the time the contract is reached.
+        self._recursive_dependencies = {}
+        for contract_name in self.deploy_order:
+            direct_dependencies = self.shallow_dependencies.get(contract_name, frozenset())
+            self._recursive_dependencies[contract_name] = direct_dependencies.union(*(
+                self._recursive_dependencies[dependency_name]
+                for dependency_name in direct_dependencies
+            ))
+        self._deploy_positions = {
+            contract_name: position
+            for position, contract_name in enumerate(self.deploy_order)
+        }
+
+    @classmethod
+    def from_compiled_contracts(cls, compiled_contracts, contract_name_index=None):
+        return cls(get_shallow_dependency_graph(compiled_contracts, contract_name_index))
 
-    # Compute the full set of dependencies needed to deploy the desired
-    # contracts.
-    all_deploy_dependencies = set(itertools.chain.from_iterable(
-        get_recursive_contract_dependencies(contract_name, dependency_graph)
-        for contract_name in contracts_to_deploy
-    ))
-    all_contracts_to_deploy = all_deploy_dependencies.union(contracts_to_deploy)
+    def get_dependencies(self, contract_name):
+        """
+        Return the set of all contracts which `contract_name` depends on either
+        directly or through its dependencies.
+        """
+        return self._recursive_dependencies.get(contract_name, frozenset())
+
+    def get_deploy_order(self, contract_names):
+        """
+        Return the names of the given contracts along with all of their
+        dependencies in the order they need to be deployed.  Contracts which
+        are not part of the graph are omitted.
+        """
+        contract_names = set(contract_names)
+        all_contract_names = contract_names.union(*(
+            self.get_dependencies(contract_name)
+            for contract_name in contract_names
+        ))
+        return tuple(sorted(
+            (
+                contract_name
+                for contract_name in all_contract_names
+                if contract_name in self._deploy_positions
+            ),
+            key=self._deploy_positions.get,
+        ))
+
+    def get_dependency_deploy_order(self, contract_name):
+        """
+        Return the dependencies of `contract_name` in the order they need to
+        be deployed.
+        """
+        return self.get_deploy_order(self.get_dependencies(contract_name))
+
+
+def get_deploy_order(contracts_to_deploy, compiled_contracts, dependency_graph=None):
+    # Extract and dependencies that exist due to library linking.
+    if dependency_graph is None:
+        dependency_graph = DependencyGraph.from_compiled_contracts(compiled_contracts)
 
     # Now compute the order that the contracts should be deployed based on
     # their dependencies.
     deploy_order = [
         (contract_name, compiled_contracts[contract_name])
         for contract_name
-        in global_deploy_order
-        if contract_name in all_contracts_to_deploy
+        in dependency_graph.get_deploy_order(contracts_to_deploy)
     ]
     return OrderedDict(deploy_order)
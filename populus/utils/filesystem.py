@@ -81,6 +81,47 @@ def is_executable_available(program):
     return False
 
 
+def _get_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# The permissions of a newly created file.  Reading the umask briefly changes
+# it for the whole process so it is only read once, at import time.
+DEFAULT_FILE_MODE = 0o666 & ~_get_umask()
+
+
+def write_file_atomically(file_path, content, mode='w'):
+    """
+    Write `content` to `file_path` through a temporary file in the same
+    directory which is then renamed over the destination so that readers never
+    observe a partially written file.  The file keeps the permissions of the
+    file it replaces, or those of a newly created file.
+    """
+    base_dir = os.path.dirname(os.path.abspath(file_path))
+    ensure_path_exists(base_dir)
+
+    try:
+        file_mode = os.stat(file_path).st_mode & 0o777
+    except OSError:
+        file_mode = DEFAULT_FILE_MODE
+
+    fd, temp_file_path = _tempfile.mkstemp(dir=base_dir, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, mode) as temp_file:
+            temp_file.write(content)
+        # `mkstemp` always creates the file readable only by its owner.
+        os.chmod(temp_file_path, file_mode)
+        if sys.platform == 'win32':
+            remove_file_if_exists(file_path)
+        os.rename(temp_file_path, file_path)
+    except Exception:
+        remove_file_if_exists(temp_file_path)
+        raise
+    return file_path
+
+
 @to_tuple
 def recursive_find_files(base_dir, pattern):
     for dirpath, _, filenames in os.walk(base_dir):
@@ -1,13 +1,18 @@
-import re
-import functools
+import bisect
 import collections
+import re
 
 from eth_utils import (
     coerce_args_to_text,
+    force_text,
     remove_0x_prefix,
     add_0x_prefix,
+    to_dict,
     to_tuple,
-    compose,
+)
+
+from populus.contracts.exceptions import (
+    InvalidLinkValue,
 )
 
 from .formatting import (
@@ -34,30 +39,103 @@ def remove_dunderscore_wrapper(value):
     return remove_dunderscore_prefix(value.rstrip('_'))
 
 
-@to_tuple
+# The contract data fields which store the link reference index for each
+# bytecode field.
+LINK_REFERENCE_INDEX_FIELDS = {
+    'bytecode': 'link_references',
+    'bytecode_runtime': 'link_references_runtime',
+}
+
+
 @coerce_args_to_text
+def get_link_reference_index(bytecode):
+    """
+    Compute the link reference index for the bytecode, a list of the
+    `name`, `offset` and `length` of each link placeholder with offsets and
+    lengths measured in hex characters of the unprefixed bytecode.  This is
+    computed once at compile time and stored alongside the bytecode.
+    """
+    unprefixed_bytecode = remove_0x_prefix(bytecode)
+    return [
+        {
+            'name': remove_dunderscore_wrapper(match.group()),
+            'offset': match.start(),
+            'length': match.end() - match.start(),
+        }
+        for match in re.finditer(DEPENDENCY_RE, unprefixed_bytecode)
+    ]
+
+
+@to_tuple
+def get_link_references_from_index(link_reference_index, full_reference_names):
+    """
+    Return the `LinkReference` for each entry of a stored link reference
+    index.
+    """
+    for link_reference in link_reference_index:
+        yield LinkReference(
+            reference_name=link_reference['name'],
+            full_name=expand_shortened_reference_name(
+                link_reference['name'],
+                full_reference_names,
+            ),
+            offset=link_reference['offset'],
+            length=link_reference['length'],
+        )
+
+
 def find_link_references(bytecode, full_reference_names):
     """
     Given bytecode, this will return all of the linked references from within
     the bytecode.
     """
-    unprefixed_bytecode = remove_0x_prefix(bytecode)
-
-    expand_fn = functools.partial(
-        expand_shortened_reference_name,
-        full_reference_names=full_reference_names,
+    return get_link_references_from_index(
+        get_link_reference_index(bytecode),
+        full_reference_names,
     )
 
-    link_references = tuple((
-        LinkReference(
-            reference_name=remove_dunderscore_wrapper(match.group()),
-            full_name=expand_fn(remove_dunderscore_wrapper(match.group())),
-            offset=match.start(),
-            length=match.end() - match.start(),
-        ) for match in re.finditer(DEPENDENCY_RE, unprefixed_bytecode)
-    ))
 
-    return link_references
+def get_contract_link_references(contract_data, full_reference_names, field='bytecode'):
+    """
+    Return the link references for the `field` bytecode of the contract,
+    reading them from the stored link reference index when the contract data
+    has one and only scanning the bytecode otherwise.
+    """
+    index_field = LINK_REFERENCE_INDEX_FIELDS[field]
+    if contract_data.get(index_field) is not None:
+        return get_link_references_from_index(
+            contract_data[index_field],
+            full_reference_names,
+        )
+    return find_link_references(contract_data[field], full_reference_names)
+
+
+class ContractNameIndex(object):
+    """
+    Sorted index of contract names which supports finding every name with a
+    given prefix by bisection rather than by scanning all of the names.  It
+    can be used anywhere a collection of full reference names is accepted.
+    """
+    def __init__(self, contract_names):
+        self._sorted_names = tuple(sorted(set(contract_names)))
+        self._names = frozenset(self._sorted_names)
+
+    def __contains__(self, contract_name):
+        return contract_name in self._names
+
+    def __iter__(self):
+        return iter(self._sorted_names)
+
+    def __len__(self):
+        return len(self._sorted_names)
+
+    @to_tuple
+    def get_names_with_prefix(self, prefix):
+        start = bisect.bisect_left(self._sorted_names, prefix)
+        for contract_name in self._sorted_names[start:]:
+            if not contract_name.startswith(prefix):
+                break
+            yield contract_name
 
 
 def expand_shortened_reference_name(short_name, full_reference_names):
@@ -67,14 +145,18 @@ def expand_shortened_reference_name(short_name, full_reference_names):
     double underscore prefix and suffix.
 
     This expands `short_name` to it's full name or raise a value error if it is
-    unable to find an appropriate expansion.
+    unable to find an appropriate expansion.  Passing a `ContractNameIndex` as
+    the `full_reference_names` avoids scanning every name.
     """
     if short_name in full_reference_names:
         return short_name
 
-    candidates = [
-        full_name for full_name in full_reference_names if full_name.startswith(short_name)
-    ]
+    if isinstance(full_reference_names, ContractNameIndex):
+        candidates = full_reference_names.get_names_with_prefix(short_name)
+    else:
+        candidates = [
+            full_name for full_name in full_reference_names if full_name.startswith(short_name)
+        ]
     if len(candidates) == 1:
         return candidates[0]
     elif len(candidates) > 1:
@@ -96,30 +178,63 @@ def expand_shortened_reference_name(short_name, full_reference_names):
         )
 
 
-def insert_link_value(bytecode, value, offset):
-    return add_0x_prefix(''.join((
-        remove_0x_prefix(bytecode)[:offset],
-        remove_0x_prefix(value),
-        remove_0x_prefix(bytecode)[offset + len(remove_0x_prefix(value)):]
-    )))
-
-
 def link_bytecode(bytecode, link_reference_values):
     """
     Given the bytecode for a contract, and it's dependencies in the form of
-    {contract_name: address} this functino returns the bytecode with all of the
-    link references replaced with the dependency addresses.
-    """
-    linker_fn = compose(*(
-        functools.partial(
-            insert_link_value,
-            value=value,
-            offset=link_reference.offset,
-        )
-        for link_reference, value in link_reference_values
-    ))
-    linked_bytecode = linker_fn(bytecode)
-    return linked_bytecode
+    `(link_reference, value)` pairs this function returns the bytecode with all
+    of the link references replaced with the dependency values.
+
+    All of the values are written into a single buffer in one pass over the
+    link references.
+    """
+    link_reference_values = tuple(link_reference_values)
+    if not link_reference_values:
+        return bytecode
+
+    linked_bytecode = bytearray(remove_0x_prefix(force_text(bytecode)).encode('ascii'))
+    for link_reference, value in link_reference_values:
+        unprefixed_value = remove_0x_prefix(force_text(value))
+        if len(unprefixed_value) != link_reference.length:
+            raise InvalidLinkValue(
+                "Cannot link '{0}' with a value of length {1}.  The link "
+                "reference requires a value of length {2}".format(
+                    link_reference.full_name,
+                    len(unprefixed_value),
+                    link_reference.length,
+                )
+            )
+        linked_bytecode[
+            link_reference.offset:link_reference.offset + link_reference.length
+        ] = unprefixed_value.encode('ascii')
+    return add_0x_prefix(linked_bytecode.decode('ascii'))
+
+
+@to_dict
+def link_bytecodes(bytecodes, link_values, link_references=None):
+    """
+    Link many bytecodes against the same mapping of link reference names to
+    values.  `bytecodes` is a mapping of arbitrary keys to bytecode and the
+    linked bytecode is returned under the same keys.  The `link_references` for
+    each key may be provided when they are already known, otherwise the
+    bytecode is scanned for them.  Bytecode which is `None` is returned as is.
+    """
+    if link_references is None:
+        link_references = {}
+
+    for key, bytecode in bytecodes.items():
+        if bytecode is None:
+            yield key, bytecode
+            continue
+
+        if key in link_references:
+            bytecode_link_references = link_references[key]
+        else:
+            bytecode_link_references = find_link_references(bytecode, link_values.keys())
+
+        yield key, link_bytecode(bytecode, (
+            (link_reference, link_values[link_reference.full_name])
+            for link_reference in bytecode_link_references
+        ))
 
 
 def link_bytecode_by_name(bytecode, **link_names_and_values):
@@ -6,10 +6,14 @@ if sys.version_info.major == 2:
         queue,
         configparser,
         parse,
+        Mapping,
+        socketserver,
     )
 else:
     from .six_py3 import (  # noqa: #401
         queue,
         configparser,
         parse,
+        Mapping,
+        socketserver,
     )
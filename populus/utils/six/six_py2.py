@@ -1,3 +1,5 @@
 import Queue as queue  # noqa: #401
 import ConfigParser as configparser # noqa: #401
 import urlparse as parse  # noqa: F401
+from collections import Mapping  # noqa: F401
+import SocketServer as socketserver  # noqa: F401
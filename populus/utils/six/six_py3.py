@@ -1,3 +1,5 @@
 import queue  # noqa: F401
 import configparser  # noqa: F401
 from urllib import parse  # noqa: F401
+from collections.abc import Mapping  # noqa: F401
+import socketserver  # noqa: F401
@@ -0,0 +1,252 @@
+import os
+
+import pytest
+
+from populus.utils.artifacts import (
+    ContractArtifactsMapping,
+    StaleArtifactError,
+    get_contract_artifact_path,
+    get_contract_artifacts_dir,
+    get_recorded_link_dependencies,
+    get_recorded_source_paths,
+    load_contract_artifact,
+    load_hot_contract_data,
+    write_contract_artifacts,
+)
+from populus.utils.contracts import (
+    get_contract_names_under_path,
+    get_shallow_dependency_graph,
+)
+
+
+CONTRACTS = {
+    'Math': {
+        'abi': [],
+        'bytecode': '0x1234',
+        'bytecode_runtime': '0x34',
+        'source_path': 'contracts/Math.sol',
+    },
+    'Library13': {
+        'abi': [],
+        'bytecode': '0x5678',
+        'bytecode_runtime': '0x78',
+        'source_path': 'contracts/Library13.sol',
+    },
+    'TestMath': {
+        'abi': [],
+        'bytecode': '0x9abc',
+        'bytecode_runtime': '0xbc',
+        'source_path': 'tests/TestMath.sol',
+    },
+}
+
+
+@pytest.fixture()
+def contract_artifacts(temporary_dir):
+    write_contract_artifacts(temporary_dir, CONTRACTS)
+    return ContractArtifactsMapping(temporary_dir)
+
+
+def test_mapping_knows_all_contract_names(contract_artifacts):
+    assert len(contract_artifacts) == 3
+    assert set(contract_artifacts) == {'Math', 'Library13', 'TestMath'}
+    assert 'Math' in contract_artifacts
+    assert 'Unknown' not in contract_artifacts
+    assert dict(contract_artifacts) == CONTRACTS
+
+
+def test_contract_data_is_loaded_on_first_access(temporary_dir, contract_artifacts):
+    math_path = get_contract_artifact_path(get_contract_artifacts_dir(temporary_dir), 'Math')
+    library_path = get_contract_artifact_path(
+        get_contract_artifacts_dir(temporary_dir),
+        'Library13',
+    )
+
+    # Removing an artifact is only noticed by the contract that uses it.
+    os.remove(library_path)
+
+    assert contract_artifacts['Math'] == CONTRACTS['Math']
+
+    # Once loaded the data is served from memory.
+    os.remove(math_path)
+    assert contract_artifacts['Math'] == CONTRACTS['Math']
+
+    with pytest.raises(IOError):
+        contract_artifacts['Library13']
+
+
+def test_resident_contracts_are_bounded(temporary_dir):
+    write_contract_artifacts(temporary_dir, CONTRACTS)
+    contract_artifacts = ContractArtifactsMapping(temporary_dir, max_resident=1)
+
+    contract_artifacts['Math']
+    contract_artifacts['Library13']
+
+    os.remove(get_contract_artifact_path(get_contract_artifacts_dir(temporary_dir), 'Math'))
+
+    assert contract_artifacts['Library13'] == CONTRACTS['Library13']
+    with pytest.raises(IOError):
+        contract_artifacts['Math']
+
+
+def test_unknown_contract_raises_key_error(contract_artifacts):
+    with pytest.raises(KeyError):
+        contract_artifacts['Unknown']
+
+
+def test_mapping_requires_artifacts_index(temporary_dir):
+    with pytest.raises(ValueError):
+        ContractArtifactsMapping(temporary_dir)
+
+
+def test_source_paths_are_read_from_the_index(temporary_dir, contract_artifacts):
+    for contract_name in CONTRACTS:
+        os.remove(get_contract_artifact_path(
+            get_contract_artifacts_dir(temporary_dir),
+            contract_name,
+        ))
+
+    assert get_recorded_source_paths(contract_artifacts) == {
+        'Math': 'contracts/Math.sol',
+        'Library13': 'contracts/Library13.sol',
+        'TestMath': 'tests/TestMath.sol',
+    }
+    assert get_contract_names_under_path('contracts', contract_artifacts) == (
+        'Library13',
+        'Math',
+    )
+    assert get_contract_names_under_path('tests', contract_artifacts) == ('TestMath',)
+
+
+def test_heavy_fields_are_loaded_on_demand(temporary_dir):
+    contracts = {
+        'Math': dict(
+            CONTRACTS['Math'],
+            metadata={'language': 'Solidity'},
+            userdoc={'methods': {}},
+        ),
+    }
+    write_contract_artifacts(temporary_dir, contracts)
+
+    contract_artifacts_dir = get_contract_artifacts_dir(temporary_dir)
+    assert sorted(os.listdir(contract_artifacts_dir)) == ['Math.extras.json', 'Math.json']
+    assert load_hot_contract_data(temporary_dir, 'Math') == CONTRACTS['Math']
+
+    contract_data = ContractArtifactsMapping(temporary_dir)['Math']
+    assert set(contract_data) == {
+        'abi',
+        'bytecode',
+        'bytecode_runtime',
+        'source_path',
+        'metadata',
+        'userdoc',
+    }
+    assert contract_data['bytecode'] == '0x1234'
+    assert not contract_data.is_heavy_data_loaded
+
+    assert contract_data['metadata'] == {'language': 'Solidity'}
+    assert contract_data.is_heavy_data_loaded
+    assert dict(contract_data) == contracts['Math']
+
+
+def test_unchanged_projected_data_is_not_reserialized(temporary_dir):
+    write_contract_artifacts(temporary_dir, CONTRACTS)
+    contract_artifacts = ContractArtifactsMapping(temporary_dir)
+
+    retained = {
+        contract_name: contract_artifacts[contract_name]
+        for contract_name in ('Math', 'TestMath')
+    }
+    retained['Library13'] = dict(CONTRACTS['Library13'], bytecode='0xabcd')
+
+    written = write_contract_artifacts(temporary_dir, retained)
+
+    assert written == ('Library13',)
+    assert retained['Math'].is_heavy_data_loaded is False
+    assert load_contract_artifact(temporary_dir, 'Math') == CONTRACTS['Math']
+
+
+def test_link_dependencies_are_read_from_the_index(temporary_dir):
+    contracts = dict(
+        CONTRACTS,
+        Multiply=dict(
+            CONTRACTS['Math'],
+            bytecode='0x60__Math____________________________________60__Library13_____________________________',
+        ),
+        Abstract={'abi': [], 'source_path': 'contracts/Abstract.sol'},
+    )
+    write_contract_artifacts(temporary_dir, contracts)
+    contract_artifacts = ContractArtifactsMapping(temporary_dir)
+
+    for contract_name in contracts:
+        os.remove(get_contract_artifact_path(
+            get_contract_artifacts_dir(temporary_dir),
+            contract_name,
+        ))
+
+    assert get_recorded_link_dependencies(contract_artifacts) == {
+        'Math': [],
+        'Library13': [],
+        'TestMath': [],
+        'Multiply': ['Library13', 'Math'],
+    }
+    assert get_shallow_dependency_graph(contract_artifacts) == {
+        'Math': set(),
+        'Library13': set(),
+        'TestMath': set(),
+        'Multiply': {'Library13', 'Math'},
+    }
+
+
+def test_rewritten_artifacts_reload_the_index(temporary_dir, contract_artifacts):
+    contract_artifacts['TestMath']
+
+    changed_contracts = dict(CONTRACTS)
+    changed_contracts['Math'] = dict(CONTRACTS['Math'], bytecode='0xabcd')
+    write_contract_artifacts(temporary_dir, changed_contracts)
+
+    assert contract_artifacts['Math'] == changed_contracts['Math']
+    assert contract_artifacts.artifacts_index['Math']['hash'] == (
+        ContractArtifactsMapping(temporary_dir).artifacts_index['Math']['hash']
+    )
+
+
+def test_artifact_which_does_not_match_the_index(temporary_dir, contract_artifacts):
+    math_path = get_contract_artifact_path(get_contract_artifacts_dir(temporary_dir), 'Math')
+    with open(math_path, 'w') as math_file:
+        math_file.write('{}')
+
+    with pytest.raises(StaleArtifactError):
+        contract_artifacts['Math']
+
+
+def test_heavy_fields_which_do_not_match_the_index(temporary_dir):
+    write_contract_artifacts(temporary_dir, {
+        'Math': dict(CONTRACTS['Math'], metadata={'language': 'Solidity'}),
+    })
+    contract_data = ContractArtifactsMapping(temporary_dir)['Math']
+
+    extras_path = os.path.join(get_contract_artifacts_dir(temporary_dir), 'Math.extras.json')
+    with open(extras_path, 'w') as extras_file:
+        extras_file.write('{"metadata":{}}')
+
+    with pytest.raises(KeyError):
+        contract_data['metadata']
+    assert contract_data.get('metadata') is None
+
+
+def test_rewritten_heavy_fields_reload_the_index(temporary_dir):
+    write_contract_artifacts(temporary_dir, {
+        'Math': dict(CONTRACTS['Math'], metadata={'language': 'Solidity'}),
+    })
+    contract_artifacts = ContractArtifactsMapping(temporary_dir)
+    contract_data = contract_artifacts['Math']
+
+    changed_contracts = {
+        'Math': dict(CONTRACTS['Math'], metadata={'language': 'Solidity', 'version': 1}),
+    }
+    write_contract_artifacts(temporary_dir, changed_contracts)
+
+    with pytest.raises(KeyError):
+        contract_data['metadata']
+    assert contract_artifacts['Math']['metadata'] == changed_contracts['Math']['metadata']
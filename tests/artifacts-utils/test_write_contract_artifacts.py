@@ -0,0 +1,105 @@
+import json
+import os
+
+from populus.utils.artifacts import (
+    ARTIFACTS_INDEX_VERSION,
+    get_contract_artifact_path,
+    get_contract_artifacts_dir,
+    get_contract_artifacts_index_path,
+    load_contract_artifact,
+    load_contract_artifacts,
+    load_contract_artifacts_compiler_info,
+    load_contract_artifacts_index,
+    write_contract_artifacts,
+)
+
+
+CONTRACTS = {
+    'Math': {
+        'abi': [],
+        'bytecode': '0x1234',
+        'bytecode_runtime': '0x34',
+        'source_path': 'contracts/Math.sol',
+    },
+    'Library13': {
+        'abi': [],
+        'bytecode': '0x5678',
+        'bytecode_runtime': '0x78',
+        'source_path': 'contracts/Library13.sol',
+    },
+}
+
+
+def test_writes_one_artifact_per_contract(temporary_dir):
+    written = write_contract_artifacts(temporary_dir, CONTRACTS)
+
+    assert set(written) == {'Math', 'Library13'}
+
+    artifacts_dir = get_contract_artifacts_dir(temporary_dir)
+    assert sorted(os.listdir(artifacts_dir)) == ['Library13.json', 'Math.json']
+    assert load_contract_artifact(temporary_dir, 'Math') == CONTRACTS['Math']
+    assert load_contract_artifacts(temporary_dir) == CONTRACTS
+
+
+def test_index_records_hash_and_source_path(temporary_dir):
+    write_contract_artifacts(temporary_dir, CONTRACTS)
+
+    with open(get_contract_artifacts_index_path(temporary_dir)) as index_file:
+        raw_index = json.load(index_file)
+    assert raw_index['version'] == ARTIFACTS_INDEX_VERSION
+
+    artifacts_index = load_contract_artifacts_index(temporary_dir)
+    assert set(artifacts_index.keys()) == {'Math', 'Library13'}
+    assert artifacts_index['Math']['source_path'] == 'contracts/Math.sol'
+    assert len(artifacts_index['Math']['hash']) == 64
+    assert len(artifacts_index['Math']['hot_hash']) == 64
+    assert artifacts_index['Math']['heavy_hash'] is None
+    assert artifacts_index['Math']['heavy_fields'] == []
+    assert artifacts_index['Math']['link_dependencies'] == []
+
+
+def test_only_changed_artifacts_are_rewritten(temporary_dir):
+    write_contract_artifacts(temporary_dir, CONTRACTS)
+    math_path = get_contract_artifact_path(get_contract_artifacts_dir(temporary_dir), 'Math')
+    os.utime(math_path, (1, 1))
+
+    changed_contracts = dict(CONTRACTS)
+    changed_contracts['Library13'] = dict(CONTRACTS['Library13'], bytecode='0xabcd')
+
+    written = write_contract_artifacts(temporary_dir, changed_contracts)
+
+    assert written == ('Library13',)
+    assert os.path.getmtime(math_path) == 1
+    assert load_contract_artifact(temporary_dir, 'Library13')['bytecode'] == '0xabcd'
+
+
+def test_removed_contracts_are_removed(temporary_dir):
+    write_contract_artifacts(temporary_dir, CONTRACTS)
+    write_contract_artifacts(temporary_dir, {'Math': CONTRACTS['Math']})
+
+    artifacts_dir = get_contract_artifacts_dir(temporary_dir)
+    assert os.listdir(artifacts_dir) == ['Math.json']
+    assert set(load_contract_artifacts_index(temporary_dir).keys()) == {'Math'}
+
+
+def test_missing_artifacts_index(temporary_dir):
+    assert load_contract_artifacts_index(temporary_dir) is None
+    assert load_contract_artifacts(temporary_dir) is None
+
+
+def test_index_records_compiler_info(temporary_dir):
+    compiler_info = {
+        'backend': 'populus.compilation.backends.solc.SolcCombinedJSONBackend',
+        'version': '0.4.11+commit.68ef5810.Linux.g++',
+        'settings': {'optimize': True},
+        'import_remappings': [],
+    }
+    write_contract_artifacts(temporary_dir, CONTRACTS, compiler_info=compiler_info)
+    assert load_contract_artifacts_compiler_info(temporary_dir) == compiler_info
+
+    # A change of compiler alone rewrites the index.
+    new_compiler_info = dict(compiler_info, settings={'optimize': False})
+    written = write_contract_artifacts(temporary_dir, CONTRACTS, compiler_info=new_compiler_info)
+
+    assert written == ()
+    assert load_contract_artifacts_compiler_info(temporary_dir) == new_compiler_info
@@ -0,0 +1,105 @@
+import json
+import os
+
+import pytest
+
+from populus.utils.binary_artifacts import (
+    BinaryArtifacts,
+    convert_binary_to_contracts_json,
+    convert_contracts_json_to_binary,
+    decode_bytecode,
+    encode_bytecode,
+    write_binary_artifacts,
+)
+
+
+LINKED_PLACEHOLDER = '__Library13' + '_' * 29
+
+CONTRACTS = {
+    'Math': {
+        'abi': [],
+        'bytecode': '0x6060604052',
+        'bytecode_runtime': '0x60606040',
+        'source_path': 'contracts/Math.sol',
+    },
+    'Multiply13': {
+        'abi': [{'type': 'function', 'name': 'multiply13'}],
+        'bytecode': '0x6060' + LINKED_PLACEHOLDER + '5050',
+        'bytecode_runtime': '0x73' + LINKED_PLACEHOLDER,
+        'source_path': 'contracts/Multiply13.sol',
+    },
+    'Abstract': {
+        'abi': [],
+        'bytecode': '0x',
+        'source_path': 'contracts/Abstract.sol',
+    },
+}
+
+
+def test_encode_bytecode_zeroes_link_placeholders():
+    raw_bytecode, link_placeholders = encode_bytecode(CONTRACTS['Multiply13']['bytecode'])
+
+    assert raw_bytecode == b'\x60\x60' + b'\x00' * 20 + b'\x50\x50'
+    assert link_placeholders == [[2, LINKED_PLACEHOLDER]]
+    assert decode_bytecode(raw_bytecode, link_placeholders) == CONTRACTS['Multiply13']['bytecode']
+
+
+def test_encode_bytecode_requires_aligned_placeholders():
+    with pytest.raises(ValueError):
+        encode_bytecode('0x606' + LINKED_PLACEHOLDER + '0')
+
+
+def test_binary_artifacts_round_trip(temporary_dir):
+    binary_artifacts_path = os.path.join(temporary_dir, 'contracts.bin')
+    write_binary_artifacts(binary_artifacts_path, CONTRACTS)
+
+    with BinaryArtifacts(binary_artifacts_path) as binary_artifacts:
+        assert set(binary_artifacts) == set(CONTRACTS)
+        assert len(binary_artifacts) == 3
+        assert dict(binary_artifacts) == CONTRACTS
+
+
+def test_bytecode_is_exposed_as_memoryview(temporary_dir):
+    binary_artifacts_path = os.path.join(temporary_dir, 'contracts.bin')
+    write_binary_artifacts(binary_artifacts_path, CONTRACTS)
+
+    binary_artifacts = BinaryArtifacts(binary_artifacts_path)
+
+    bytecode = binary_artifacts.get_bytecode('Math')
+    assert isinstance(bytecode, memoryview)
+    assert bytecode.tobytes() == b'\x60\x60\x60\x40\x52'
+    assert binary_artifacts.get_bytecode_runtime('Math').tobytes() == b'\x60\x60\x60\x40'
+    assert binary_artifacts.get_bytecode_runtime('Abstract') is None
+    assert binary_artifacts.get_bytecode('Abstract').tobytes() == b''
+
+    assert binary_artifacts.get_link_placeholders('Multiply13', 'bytecode_runtime') == (
+        (1, LINKED_PLACEHOLDER),
+    )
+    assert binary_artifacts.get_link_placeholders('Math') == tuple()
+
+    del bytecode
+    binary_artifacts.close()
+
+
+def test_not_a_binary_artifacts_file(temporary_dir):
+    path = os.path.join(temporary_dir, 'contracts.bin')
+    with open(path, 'wb') as f:
+        f.write(b'{"Math": {}} and some more bytes')
+
+    with pytest.raises(ValueError):
+        BinaryArtifacts(path)
+
+
+def test_convert_to_and_from_contracts_json(temporary_dir):
+    contracts_json_path = os.path.join(temporary_dir, 'contracts.json')
+    binary_artifacts_path = os.path.join(temporary_dir, 'contracts.bin')
+    round_trip_path = os.path.join(temporary_dir, 'round-trip.json')
+
+    with open(contracts_json_path, 'w') as contracts_json_file:
+        json.dump(CONTRACTS, contracts_json_file)
+
+    convert_contracts_json_to_binary(contracts_json_path, binary_artifacts_path)
+    convert_binary_to_contracts_json(binary_artifacts_path, round_trip_path)
+
+    with open(round_trip_path) as round_trip_file:
+        assert json.load(round_trip_file) == CONTRACTS
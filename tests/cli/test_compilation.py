@@ -1,3 +1,5 @@
+import os
+
 import pytest
 from click.testing import CliRunner
 
@@ -16,3 +18,29 @@ def test_compiling(project):
     assert 'owned.sol' in result.output
     assert 'mortal.sol' in result.output
     assert 'immortal.sol' in result.output
+
+
+@load_contract_fixture('owned.sol')
+@load_contract_fixture('mortal.sol')
+def test_compiling_writes_per_contract_artifacts(project):
+    runner = CliRunner()
+    result = runner.invoke(main, ['compile'])
+
+    assert result.exit_code == 0, result.output + str(result.exception)
+    assert os.path.exists(project.contract_artifacts_index_path)
+    assert os.path.exists(os.path.join(project.contract_artifacts_dir, 'owned.json'))
+    assert os.path.exists(os.path.join(project.contract_artifacts_dir, 'mortal.json'))
+    assert not os.path.exists(project.compiled_contracts_asset_path)
+
+
+@load_contract_fixture('owned.sol')
+def test_compiling_with_contracts_json(project):
+    project.config['compilation.write_contracts_json'] = True
+    project.write_config()
+
+    runner = CliRunner()
+    result = runner.invoke(main, ['compile'])
+
+    assert result.exit_code == 0, result.output + str(result.exception)
+    assert os.path.exists(os.path.join(project.contract_artifacts_dir, 'owned.json'))
+    assert os.path.exists(project.compiled_contracts_asset_path)
@@ -0,0 +1,118 @@
+import os
+
+from populus import Project
+
+from populus.compilation import (
+    compile_project_contracts,
+)
+from populus.compilation.cache import (
+    CompilationCache,
+)
+
+from populus.utils.testing import (
+    load_contract_fixture,
+)
+
+
+def test_compilation_cache_get_and_set(temporary_dir):
+    cache = CompilationCache(temporary_dir)
+
+    assert cache.get('some-key') is None
+
+    cache.set('some-key', {'Math': {'abi': []}})
+    assert cache.get('some-key') == {'Math': {'abi': []}}
+
+
+def test_compilation_cache_evicts_least_recently_used(temporary_dir):
+    cache = CompilationCache(temporary_dir, max_size=150)
+
+    cache.set('a', {'A': {'bytecode': '0x' + '00' * 20}})
+    os.utime(cache.get_entry_path('a'), (1, 1))
+    cache.set('b', {'B': {'bytecode': '0x' + '00' * 20}})
+    os.utime(cache.get_entry_path('b'), (2, 2))
+
+    # reading `a` marks it as recently used.
+    assert cache.get('a') is not None
+
+    cache.set('c', {'C': {'bytecode': '0x' + '00' * 20}})
+
+    assert cache.get('a') is not None
+    assert cache.get('b') is None
+    assert cache.get('c') is not None
+
+
+@load_contract_fixture('Math.sol')
+@load_contract_fixture('ImportTestA.sol')
+@load_contract_fixture('ImportTestB.sol')
+def test_compilation_uses_cache_across_projects(project, monkeypatch):
+    _, contract_data = compile_project_contracts(project)
+
+    assert os.listdir(project.compilation_cache_dir)
+
+    def compile_files(*args, **kwargs):
+        raise AssertionError("The compiler should not have been invoked")
+
+    monkeypatch.setattr('populus.compilation.backends.solc.compile_files', compile_files)
+
+    _, cached_contract_data = compile_project_contracts(Project())
+
+    assert cached_contract_data == contract_data
+
+
+@load_contract_fixture('ImportTestA.sol')
+@load_contract_fixture('ImportTestB.sol')
+def test_compilation_cache_misses_when_import_changes(project):
+    compile_project_contracts(project)
+    num_cache_entries = len(os.listdir(project.compilation_cache_dir))
+
+    with open('contracts/ImportTestA.sol', 'a') as source_file:
+        source_file.write('\ncontract ImportTestAChanged {}\n')
+
+    _, contract_data = compile_project_contracts(project)
+
+    assert 'ImportTestAChanged' in contract_data
+    assert len(os.listdir(project.compilation_cache_dir)) == num_cache_entries + 2
+
+
+@load_contract_fixture('Math.sol')
+def test_compilation_skips_cache_without_compiler_version(project, monkeypatch):
+    monkeypatch.setattr(
+        type(project.get_compiler_backend()),
+        'get_compiler_version',
+        lambda self: None,
+    )
+
+    _, contract_data = compile_project_contracts(project)
+
+    assert 'Math' in contract_data
+    assert not os.path.exists(project.compilation_cache_dir) or \
+        not os.listdir(project.compilation_cache_dir)
+
+
+def test_compilation_cache_only_scans_directory_when_full(temporary_dir, monkeypatch):
+    cache = CompilationCache(temporary_dir, max_size=1024)
+    cache.set('a', {'A': {'bytecode': '0x'}})
+
+    def listdir(*args, **kwargs):
+        raise AssertionError("The cache directory should not have been scanned")
+
+    monkeypatch.setattr('os.listdir', listdir)
+
+    cache.set('b', {'B': {'bytecode': '0x'}})
+    cache.set('b', {'B': {'bytecode': '0x1234'}})
+    assert cache.get_total_size() == sum(
+        os.path.getsize(cache.get_entry_path(key)) for key in ('a', 'b')
+    )
+
+
+def test_project_reuses_compilation_cache(project):
+    compilation_cache = project.compilation_cache
+
+    assert project.compilation_cache is compilation_cache
+
+    project.config['compilation.cache.max_size'] = 1024
+    assert project.compilation_cache is not compilation_cache
+    assert project.compilation_cache.max_size == 1024
+
+    project.config['compilation.cache.enabled'] = False
+    assert project.compilation_cache is None
@@ -0,0 +1,127 @@
+import os
+import socket
+import threading
+
+import pytest
+
+from populus import Project
+from populus.compilation.server import (
+    CompileServer,
+    CompileServerClient,
+    CompileServerError,
+    get_compile_server_client,
+    get_compile_server_socket_path,
+)
+from populus.utils.testing import (
+    load_contract_fixture,
+)
+
+
+@pytest.yield_fixture()
+def compile_server(project):
+    server = CompileServer(project)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_client_without_server(project_dir):
+    assert get_compile_server_client('build') is None
+
+    client = CompileServerClient(os.path.join(project_dir, 'missing.sock'))
+    with pytest.raises(CompileServerError):
+        client.ping()
+
+
+def test_client_removes_stale_socket(project_dir):
+    socket_path = os.path.join(project_dir, 'stale.sock')
+    stale_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale_socket.bind(socket_path)
+    stale_socket.close()
+
+    client = CompileServerClient(socket_path)
+    assert client.timeout is not None
+
+    with pytest.raises(CompileServerError):
+        client.ping()
+    assert not os.path.exists(socket_path)
+
+
+@load_contract_fixture('Math.sol')
+def test_compile_server_sync(project, compile_server):
+    client = get_compile_server_client(project.build_asset_dir)
+    assert client is not None
+
+    assert client.ping()['status'] == 'ok'
+
+    first_response = client.sync()
+    second_response = client.sync()
+    assert first_response['build_id'] == second_response['build_id']
+    assert first_response['source_mtime'] == project.get_source_modification_time()
+
+
+@load_contract_fixture('Math.sol')
+def test_project_uses_compile_server(project, compile_server):
+    client_project = Project()
+
+    assert 'Math' in client_project.compiled_contract_data
+    assert client_project._compile_server_build_id is not None
+    assert 'bytecode' in client_project.compiled_contract_data['Math']
+
+    # The contract data is reused until the server reports a new build.
+    compiled_contract_data = client_project.compiled_contract_data
+    assert client_project.compiled_contract_data is compiled_contract_data
+
+
+@load_contract_fixture('Math.sol')
+def test_project_syncs_once_per_source_index_generation(project, compile_server, monkeypatch):
+    client_project = Project()
+    compiled_contract_data = client_project.compiled_contract_data
+
+    sync_calls = []
+
+    def sync(client):
+        sync_calls.append(client)
+        return original_sync(client)
+
+    original_sync = CompileServerClient.sync
+    monkeypatch.setattr(CompileServerClient, 'sync', sync)
+
+    assert client_project.compiled_contract_data is compiled_contract_data
+    assert sync_calls == []
+
+    client_project.source_index.invalidate()
+    assert client_project.compiled_contract_data is compiled_contract_data
+    assert len(sync_calls) == 1
+
+
+def test_socket_path_is_normalized():
+    assert get_compile_server_socket_path('build') == os.path.join('build', 'compile-server.sock')
+
+
+@load_contract_fixture('Math.sol')
+def test_only_one_compile_server_per_project(project, compile_server):
+    with pytest.raises(CompileServerError):
+        CompileServer(Project())
+
+
+@load_contract_fixture('Math.sol')
+def test_stale_socket_is_replaced(project):
+    socket_path = get_compile_server_socket_path(project.build_asset_dir)
+    with open(socket_path, 'w'):
+        pass
+
+    server = CompileServer(project)
+    try:
+        assert server.handle_command('ping') == {'status': 'ok'}
+        assert server.handle_command('unknown')['status'] == 'error'
+    finally:
+        server.server_close()
+
+    assert not os.path.exists(socket_path)
@@ -0,0 +1,85 @@
+import os
+
+from populus.compilation import (
+    compile_project_contracts,
+    compile_project_contracts_incrementally,
+)
+
+from populus.utils.testing import (
+    load_contract_fixture,
+)
+
+
+def touch(path, mtime):
+    os.utime(path, (mtime, mtime))
+
+
+@load_contract_fixture('Math.sol')
+@load_contract_fixture('ImportTestA.sol')
+@load_contract_fixture('ImportTestB.sol')
+@load_contract_fixture('ImportTestC.sol')
+def test_compiled_contracts_record_source_path(project):
+    _, contract_data = compile_project_contracts(project)
+
+    assert contract_data['Math']['source_path'] == 'contracts/Math.sol'
+    assert contract_data['ImportTestA']['source_path'] == 'contracts/ImportTestA.sol'
+    assert contract_data['ImportTestB']['source_path'] == 'contracts/ImportTestB.sol'
+
+
+@load_contract_fixture('Math.sol')
+@load_contract_fixture('ImportTestA.sol')
+@load_contract_fixture('ImportTestB.sol')
+def test_incremental_compilation_with_no_changes(project):
+    _, contract_data = compile_project_contracts(project)
+    compiled_mtime = project.get_source_modification_time() + 10
+
+    compiled_paths, incremental_contract_data = compile_project_contracts_incrementally(
+        project,
+        contract_data,
+        compiled_mtime,
+    )
+
+    assert compiled_paths == tuple()
+    assert incremental_contract_data == contract_data
+
+
+@load_contract_fixture('Math.sol')
+@load_contract_fixture('ImportTestA.sol')
+@load_contract_fixture('ImportTestB.sol')
+def test_incremental_compilation_recompiles_importers(project):
+    _, contract_data = compile_project_contracts(project)
+    compiled_mtime = project.get_source_modification_time() + 10
+
+    touch('contracts/ImportTestA.sol', compiled_mtime + 10)
+
+    compiled_paths, incremental_contract_data = compile_project_contracts_incrementally(
+        project,
+        contract_data,
+        compiled_mtime,
+    )
+
+    assert set(compiled_paths) == {
+        'contracts/ImportTestA.sol',
+        'contracts/ImportTestB.sol',
+    }
+    assert incremental_contract_data == contract_data
+
+
+@load_contract_fixture('Math.sol')
+@load_contract_fixture('ImportTestA.sol')
+@load_contract_fixture('ImportTestB.sol')
+def test_incremental_compilation_drops_removed_sources(project):
+    _, contract_data = compile_project_contracts(project)
+    compiled_mtime = project.get_source_modification_time() + 10
+
+    os.remove('contracts/Math.sol')
+
+    compiled_paths, incremental_contract_data = compile_project_contracts_incrementally(
+        project,
+        contract_data,
+        compiled_mtime,
+    )
+
+    assert compiled_paths == tuple()
+    assert 'Math' not in incremental_contract_data
+    assert 'ImportTestA' in incremental_contract_data
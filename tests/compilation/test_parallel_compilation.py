@@ -0,0 +1,42 @@
+from populus.compilation.backends import (
+    SolcCombinedJSONBackend,
+)
+from populus.compilation import (
+    find_project_source_paths,
+)
+
+from populus.utils.testing import (
+    load_contract_fixture,
+)
+
+
+BACKEND_SETTINGS = {
+    'optimize': True,
+    'output_values': ['abi', 'bin', 'bin-runtime', 'devdoc', 'metadata', 'userdoc'],
+}
+
+
+def test_workers_setting_is_not_passed_to_compiler():
+    backend = SolcCombinedJSONBackend(dict(BACKEND_SETTINGS, workers=4))
+
+    assert backend.workers == 4
+    assert 'workers' not in backend.compiler_settings
+
+
+@load_contract_fixture('Math.sol')
+@load_contract_fixture('Emitter.sol')
+@load_contract_fixture('ImportTestA.sol')
+@load_contract_fixture('ImportTestB.sol')
+@load_contract_fixture('ImportTestC.sol')
+@load_contract_fixture('Abstract.sol')
+@load_contract_fixture('UsesAbstract.sol')
+def test_parallel_compilation_matches_serial_compilation(project):
+    source_paths = find_project_source_paths(project)
+
+    serial_backend = SolcCombinedJSONBackend(dict(BACKEND_SETTINGS, workers=1))
+    parallel_backend = SolcCombinedJSONBackend(dict(BACKEND_SETTINGS, workers=4))
+
+    serial_contract_data = serial_backend.get_compiled_contract_data(source_paths, None)
+    parallel_contract_data = parallel_backend.get_compiled_contract_data(source_paths, None)
+
+    assert parallel_contract_data == serial_contract_data
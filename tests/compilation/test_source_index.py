@@ -0,0 +1,118 @@
+import os
+import time
+
+import pytest
+
+from populus.compilation.source_index import (
+    SourceIndex,
+    scan_source_files,
+)
+
+
+@pytest.fixture()
+def source_dirs(temporary_dir, monkeypatch):
+    monkeypatch.chdir(temporary_dir)
+    for path in ('contracts/Math.sol', 'contracts/lib/Library.sol', 'contracts/README.md',
+                 'tests/TestMath.sol', 'tests/test_math.py'):
+        if not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'w') as source_file:
+            source_file.write('')
+    return 'contracts', 'tests'
+
+
+def test_scan_source_files(source_dirs):
+    source_files = scan_source_files('contracts')
+
+    assert set(source_files) == {'contracts/Math.sol', 'contracts/lib/Library.sol'}
+    assert source_files['contracts/Math.sol'] == os.path.getmtime('contracts/Math.sol')
+
+
+def test_scan_missing_dir(source_dirs):
+    assert scan_source_files('not-a-dir') == {}
+
+
+def test_source_index_paths_and_mtime(source_dirs):
+    source_index = SourceIndex(source_dirs)
+
+    assert source_index.get_source_paths('contracts') == (
+        'contracts/Math.sol',
+        'contracts/lib/Library.sol',
+    )
+    assert source_index.get_source_paths('tests') == ('tests/TestMath.sol',)
+
+    os.utime('tests/TestMath.sol', (2000000000, 2000000000))
+    source_index.invalidate()
+    assert source_index.get_modification_time() == 2000000000
+
+
+def test_unwatched_index_is_kept_until_invalidated(source_dirs):
+    source_index = SourceIndex(source_dirs)
+    assert source_index.get_source_paths('contracts') == (
+        'contracts/Math.sol',
+        'contracts/lib/Library.sol',
+    )
+    generation = source_index.generation
+
+    os.remove('contracts/Math.sol')
+
+    assert source_index.get_source_paths('contracts') == (
+        'contracts/Math.sol',
+        'contracts/lib/Library.sol',
+    )
+
+    source_index.invalidate()
+
+    assert source_index.generation > generation
+    assert source_index.get_source_paths('contracts') == ('contracts/lib/Library.sol',)
+
+
+def test_watched_index_is_invalidated_by_changes(source_dirs):
+    source_index = SourceIndex(source_dirs)
+    source_index.watch()
+    try:
+        source_files = source_index.get_source_files()
+        assert source_index.get_source_files() == source_files
+
+        with open('contracts/Token.sol', 'w') as source_file:
+            source_file.write('')
+
+        start = time.time()
+        while 'contracts/Token.sol' not in source_index.get_source_files():
+            assert time.time() - start < 5, "Source index was not invalidated"
+            time.sleep(0.05)
+    finally:
+        source_index.stop_watching()
+
+
+def test_invalidated_index_only_lists_modified_directories(source_dirs, monkeypatch):
+    for dir_path in ('contracts', 'contracts/lib', 'tests'):
+        os.utime(dir_path, (1000000000, 1000000000))
+
+    source_index = SourceIndex(source_dirs)
+    source_files = source_index.get_source_files()
+
+    listed_dirs = []
+
+    def iter_directory(dir_path):
+        listed_dirs.append(dir_path)
+        return original_iter_directory(dir_path)
+
+    from populus.compilation import source_index as source_index_module
+    original_iter_directory = source_index_module._iter_directory
+    monkeypatch.setattr(source_index_module, '_iter_directory', iter_directory)
+
+    os.utime('contracts/Math.sol', (2000000000, 2000000000))
+    source_index.invalidate()
+    assert source_index.get_source_files() == dict(
+        source_files,
+        **{'contracts/Math.sol': 2000000000}
+    )
+    assert listed_dirs == []
+
+    with open('contracts/lib/Token.sol', 'w') as source_file:
+        source_file.write('')
+    source_index.invalidate()
+
+    assert 'contracts/lib/Token.sol' in source_index.get_source_files()
+    assert listed_dirs == ['contracts/lib']
@@ -0,0 +1,130 @@
+import pytest
+
+from populus.compilation import (
+    compile_project_contracts,
+)
+from populus.compilation.backends import (
+    SolcStandardJSONBackend,
+)
+from populus.compilation.backends.solc import (
+    _normalize_standard_json_contract_data,
+)
+
+from populus.utils.testing import (
+    load_contract_fixture,
+)
+
+
+@pytest.fixture()
+def standard_json_project(project):
+    project.config['compilation.backend'] = {
+        'class': 'populus.compilation.backends.SolcStandardJSONBackend',
+        'settings': {
+            'optimize': True,
+        },
+    }
+    return project
+
+
+@load_contract_fixture('Math.sol')
+def test_compiling_with_standard_json_backend(standard_json_project):
+    _, contract_data = compile_project_contracts(standard_json_project)
+
+    assert 'Math' in contract_data
+    assert set(contract_data['Math'].keys()) == {
+        'abi',
+        'bytecode',
+        'bytecode_runtime',
+        'link_references',
+        'link_references_runtime',
+        'source_path',
+    }
+    assert contract_data['Math']['source_path'] == 'contracts/Math.sol'
+    assert contract_data['Math']['bytecode'].startswith('0x')
+    assert contract_data['Math']['link_references'] == []
+
+
+@load_contract_fixture('ImportTestA.sol')
+@load_contract_fixture('ImportTestB.sol')
+def test_standard_json_backend_only_selects_requested_sources(standard_json_project):
+    backend = SolcStandardJSONBackend({})
+
+    contract_data = backend.get_compiled_contract_data(
+        source_file_paths=('contracts/ImportTestB.sol',),
+        import_remappings=None,
+    )
+
+    assert set(contract_data.keys()) == {'ImportTestB'}
+
+
+@load_contract_fixture('Math.sol')
+def test_standard_json_backend_with_custom_output_selection(standard_json_project):
+    backend = SolcStandardJSONBackend({
+        'output_selection': ['abi', 'evm.bytecode.object', 'metadata'],
+    })
+
+    contract_data = backend.get_compiled_contract_data(
+        source_file_paths=('contracts/Math.sol',),
+        import_remappings=None,
+    )
+
+    assert set(contract_data['Math'].keys()) == {
+        'abi',
+        'bytecode',
+        'link_references',
+        'metadata',
+        'source_path',
+    }
+    assert contract_data['Math']['metadata']['language'] == 'Solidity'
+
+
+def test_standard_json_backend_honors_import_remappings(project_dir, write_project_file):
+    write_project_file('vendor/lib/Owned.sol', 'pragma solidity ^0.4.0;\ncontract Owned {}')
+    write_project_file(
+        'contracts/Uses.sol',
+        'pragma solidity ^0.4.0;\nimport "lib/Owned.sol";\ncontract Uses is Owned {}',
+    )
+    backend = SolcStandardJSONBackend({})
+
+    contract_data = backend.get_compiled_contract_data(
+        source_file_paths=('contracts/Uses.sol',),
+        import_remappings=['lib/=vendor/lib/'],
+    )
+
+    assert 'Uses' in contract_data
+
+
+def test_standard_json_link_references_are_normalized():
+    contract_data = _normalize_standard_json_contract_data(
+        {
+            'evm': {
+                'bytecode': {
+                    'object': '6060__MathLib_______________________________6060',
+                    'linkReferences': {
+                        'contracts/MathLib.sol': {
+                            'MathLib': [{'start': 2, 'length': 20}],
+                        },
+                    },
+                },
+                'deployedBytecode': {
+                    'object': '6060__MathLib_______________________________6060',
+                },
+            },
+        },
+        'contracts/UsesMath.sol',
+    )
+
+    expected = [{'name': 'MathLib', 'offset': 4, 'length': 40}]
+    assert contract_data['link_references'] == expected
+    assert contract_data['link_references_runtime'] == expected
+
+
+def test_standard_json_backend_ignores_combined_json_settings():
+    backend = SolcStandardJSONBackend({
+        'optimize': True,
+        'output_values': ['abi', 'bin'],
+        'workers': 4,
+        'solc_binary': '/usr/local/bin/solc',
+    })
+
+    assert backend._get_solc_kwargs() == {'solc_binary': '/usr/local/bin/solc'}
@@ -0,0 +1,38 @@
+import pytest
+
+from populus.utils.compile import (
+    get_source_import_components,
+)
+
+
+@pytest.mark.parametrize(
+    'import_graph,expected',
+    (
+        (
+            {'A.sol': set(), 'B.sol': set(), 'C.sol': set()},
+            (('A.sol',), ('B.sol',), ('C.sol',)),
+        ),
+        (
+            {'A.sol': set(), 'B.sol': {'A.sol'}, 'C.sol': set()},
+            (('A.sol', 'B.sol'), ('C.sol',)),
+        ),
+        (
+            # B and C are connected through a shared import of A
+            {'A.sol': set(), 'B.sol': {'A.sol'}, 'C.sol': {'A.sol'}},
+            (('A.sol', 'B.sol', 'C.sol'),),
+        ),
+        (
+            # B and C are connected through a shared import outside of the source set
+            {'B.sol': {'lib/L.sol'}, 'C.sol': {'lib/L.sol'}, 'lib/L.sol': set(), 'A.sol': set()},
+            (('A.sol',), ('B.sol', 'C.sol')),
+        ),
+        (
+            {'A.sol': {'B.sol'}, 'B.sol': {'C.sol'}, 'C.sol': {'A.sol'}},
+            (('A.sol', 'B.sol', 'C.sol'),),
+        ),
+    ),
+)
+def test_get_source_import_components(import_graph, expected):
+    source_paths = tuple(sorted(path for path in import_graph if not path.startswith('lib/')))
+    actual = get_source_import_components(source_paths, import_graph)
+    assert actual == expected
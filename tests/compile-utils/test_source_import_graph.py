@@ -0,0 +1,93 @@
+import pytest
+
+from populus.utils.compile import (
+    find_solidity_imports,
+    get_dependent_source_paths,
+    get_source_import_graph,
+    resolve_solidity_import_path,
+)
+
+
+SOURCE = '''pragma solidity ^0.4.0;
+
+import "./A.sol";
+import * as B from './B.sol';
+import {C, D as E} from "lib/C.sol";
+import "F.sol" as F;
+// import "./Commented.sol";
+/*
+import "./BlockCommented.sol";
+*/
+'''
+
+
+def test_find_solidity_imports():
+    assert find_solidity_imports(SOURCE) == (
+        './A.sol',
+        './B.sol',
+        'lib/C.sol',
+        'F.sol',
+    )
+
+
+@pytest.mark.parametrize(
+    'import_path,source_path,import_remappings,expected',
+    (
+        ('./A.sol', 'contracts/B.sol', None, 'contracts/A.sol'),
+        ('../A.sol', 'contracts/sub/B.sol', None, 'contracts/A.sol'),
+        ('contracts/A.sol', 'contracts/sub/B.sol', None, 'contracts/A.sol'),
+        ('lib/A.sol', 'contracts/B.sol', ['lib/=vendor/lib/'], 'vendor/lib/A.sol'),
+        ('lib/A.sol', 'contracts/B.sol', ['ctx:lib/=vendor/lib/'], 'vendor/lib/A.sol'),
+        ('other/A.sol', 'contracts/B.sol', ['lib/=vendor/lib/'], 'other/A.sol'),
+    ),
+)
+def test_resolve_solidity_import_path(import_path, source_path, import_remappings, expected):
+    actual = resolve_solidity_import_path(import_path, source_path, import_remappings)
+    assert actual == expected
+
+
+def test_get_source_import_graph(project_dir, write_project_file):
+    write_project_file('contracts/A.sol', 'contract A {}')
+    write_project_file('contracts/B.sol', 'import "./A.sol";\ncontract B is A {}')
+    write_project_file('contracts/C.sol', 'import {B} from "./B.sol";\ncontract C is B {}')
+
+    import_graph = get_source_import_graph((
+        'contracts/A.sol',
+        'contracts/B.sol',
+        'contracts/C.sol',
+    ))
+
+    assert import_graph == {
+        'contracts/A.sol': set(),
+        'contracts/B.sol': {'contracts/A.sol'},
+        'contracts/C.sol': {'contracts/B.sol'},
+    }
+
+
+#
+# A <- B <- C
+# A <- D
+# E
+#
+IMPORT_GRAPH = {
+    'A.sol': set(),
+    'B.sol': {'A.sol'},
+    'C.sol': {'B.sol'},
+    'D.sol': {'A.sol'},
+    'E.sol': set(),
+}
+
+
+@pytest.mark.parametrize(
+    'source_paths,expected',
+    (
+        (['A.sol'], {'A.sol', 'B.sol', 'C.sol', 'D.sol'}),
+        (['B.sol'], {'B.sol', 'C.sol'}),
+        (['C.sol'], {'C.sol'}),
+        (['E.sol'], {'E.sol'}),
+        (['C.sol', 'D.sol'], {'C.sol', 'D.sol'}),
+        ([], set()),
+    ),
+)
+def test_get_dependent_source_paths(source_paths, expected):
+    assert get_dependent_source_paths(source_paths, IMPORT_GRAPH) == expected
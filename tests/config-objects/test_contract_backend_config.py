@@ -33,6 +33,7 @@ def test_backend_class_property():
         ('project', 'populus.contracts.backends.project.ProjectContractsBackend'),
         ('memory', 'populus.contracts.backends.memory.MemoryBackend'),
         ('jsonfile', 'populus.contracts.backends.filesystem.JSONFileBackend'),
+        ('sqlite', 'populus.contracts.backends.sqlite.SQLiteBackend'),
         ('populus.contracts.backends.project.ProjectContractsBackend', 'populus.contracts.backends.project.ProjectContractsBackend'),
         ('populus.contracts.backends.memory.MemoryBackend', 'populus.contracts.backends.memory.MemoryBackend'),
         ('populus.contracts.backends.filesystem.JSONFileBackend', 'populus.contracts.backends.filesystem.JSONFileBackend'),
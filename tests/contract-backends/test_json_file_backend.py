@@ -35,6 +35,7 @@ def test_is_provider_and_registrar_by_default(project_dir, chain, backend_config
 
 def test_setting_an_address(project_dir, backend, web3):
     backend.set_contract_address('some-key', '0xd3cda913deb6f67967b99d67acdfa1712c293601')
+    backend.compact()
 
     with open(os.path.join(project_dir, FILE_NAME)) as registrar_file:
         registrar_data = json.load(registrar_file)
@@ -63,3 +64,149 @@ def test_getting_an_address(project_dir, backend, web3):
 def test_getting_an_unknown_address(project_dir, backend, web3):
     with pytest.raises(NoKnownAddress):
         backend.get_contract_addresses('some-key')
+
+
+def test_deploy_info(project_dir, backend, web3):
+    backend.set_contract_address('some-key', '0xd3cda913deb6f67967b99d67acdfa1712c293601')
+    assert backend.get_deploy_info('some-key', '0xd3cda913deb6f67967b99d67acdfa1712c293601') is None
+
+    backend.set_deploy_info('some-key', '0xd3cda913deb6f67967b99d67acdfa1712c293601', {
+        'block_number': 12,
+        'transaction_hash': '0xabcd',
+    })
+
+    assert backend.get_deploy_info('some-key', '0xd3cda913deb6f67967b99d67acdfa1712c293601') == {
+        'block_number': 12,
+        'transaction_hash': '0xabcd',
+    }
+    assert backend.get_contract_addresses('some-key') == (
+        '0xd3cda913deb6f67967b99d67acdfa1712c293601',
+    )
+
+
+def test_repeated_lookups_do_not_reload_the_file(project_dir, backend, web3, monkeypatch):
+    from populus.contracts.backends import filesystem
+
+    backend.set_contract_address('some-key', '0xd3cda913deb6f67967b99d67acdfa1712c293601')
+
+    load_calls = []
+    original_load = json.load
+
+    def load(*args, **kwargs):
+        load_calls.append(args)
+        return original_load(*args, **kwargs)
+
+    monkeypatch.setattr(filesystem.json, 'load', load)
+
+    for _ in range(3):
+        assert backend.get_contract_addresses('some-key') == (
+            '0xd3cda913deb6f67967b99d67acdfa1712c293601',
+        )
+    assert load_calls == []
+
+
+def test_external_changes_are_picked_up(project_dir, backend, web3):
+    backend.set_contract_address('some-key', '0xd3cda913deb6f67967b99d67acdfa1712c293601')
+    assert backend.get_contract_addresses('some-key') == (
+        '0xd3cda913deb6f67967b99d67acdfa1712c293601',
+    )
+
+    backend.compact()
+
+    registrar_path = os.path.join(project_dir, FILE_NAME)
+    with open(registrar_path) as registrar_file:
+        registrar_data = json.load(registrar_file)
+    for chain_deployments in registrar_data['deployments'].values():
+        chain_deployments['other-key'] = '0xd3cda913deb6f67967b99d67acdfa1712c293602'
+    with open(registrar_path, 'w') as registrar_file:
+        json.dump(registrar_data, registrar_file)
+
+    assert backend.get_contract_addresses('other-key') == (
+        '0xd3cda913deb6f67967b99d67acdfa1712c293602',
+    )
+
+
+def test_cache_version_changes_with_writes_from_other_instances(project_dir,
+                                                                chain,
+                                                                backend,
+                                                                backend_config,
+                                                                web3):
+    other_backend = JSONFileBackend(chain, backend_config)
+
+    cache_version = backend.get_cache_version()
+    assert backend.get_cache_version() == cache_version
+
+    other_backend.set_contract_address(
+        'some-key',
+        '0xd3cda913deb6f67967b99d67acdfa1712c293601',
+    )
+
+    assert backend.get_cache_version() != cache_version
+
+
+def test_writes_are_appended_to_the_journal(project_dir, backend, web3):
+    backend.set_contract_address('some-key', '0xd3cda913deb6f67967b99d67acdfa1712c293601')
+
+    assert not os.path.exists(os.path.join(project_dir, FILE_NAME))
+    with open(os.path.join(project_dir, FILE_NAME + '.journal')) as journal_file:
+        assert len(journal_file.readlines()) == 1
+
+    reloaded_backend = JSONFileBackend(backend.chain, backend.config)
+    assert reloaded_backend.get_contract_addresses('some-key') == (
+        '0xd3cda913deb6f67967b99d67acdfa1712c293601',
+    )
+
+
+def test_batched_writes_are_flushed_once(project_dir, backend, web3, monkeypatch):
+    from populus.contracts.backends import filesystem
+
+    fsync_calls = []
+    monkeypatch.setattr(filesystem.os, 'fsync', fsync_calls.append)
+
+    with backend.batch():
+        backend.set_contract_address('key-a', '0xd3cda913deb6f67967b99d67acdfa1712c293601')
+        backend.set_contract_address('key-b', '0xd3cda913deb6f67967b99d67acdfa1712c293602')
+        assert backend.get_contract_addresses('key-a') == (
+            '0xd3cda913deb6f67967b99d67acdfa1712c293601',
+        )
+        assert fsync_calls == []
+
+    assert len(fsync_calls) == 1
+    assert backend.get_contract_addresses('key-b') == (
+        '0xd3cda913deb6f67967b99d67acdfa1712c293602',
+    )
+
+
+def test_journal_is_compacted_at_threshold(project_dir, chain, web3):
+    backend = JSONFileBackend(chain, Config({
+        'file_path': FILE_NAME,
+        'journal_compaction_threshold': 2,
+    }))
+
+    backend.set_contract_address('key-a', '0xd3cda913deb6f67967b99d67acdfa1712c293601')
+    assert os.path.exists(os.path.join(project_dir, FILE_NAME + '.journal'))
+
+    backend.set_contract_address('key-b', '0xd3cda913deb6f67967b99d67acdfa1712c293602')
+    assert not os.path.exists(os.path.join(project_dir, FILE_NAME + '.journal'))
+
+    with open(os.path.join(project_dir, FILE_NAME)) as registrar_file:
+        registrar_data = json.load(registrar_file)
+    chain_deployments = tuple(registrar_data['deployments'].values())[0]
+    assert set(chain_deployments) == {'key-a', 'key-b'}
+
+
+def test_partially_written_journal_entry_is_ignored(project_dir, backend, web3):
+    backend.set_contract_address('some-key', '0xd3cda913deb6f67967b99d67acdfa1712c293601')
+
+    with open(os.path.join(project_dir, FILE_NAME + '.journal'), 'a') as journal_file:
+        journal_file.write('{"key": "deployments.')
+
+    reloaded_backend = JSONFileBackend(backend.chain, backend.config)
+    assert reloaded_backend.get_contract_addresses('some-key') == (
+        '0xd3cda913deb6f67967b99d67acdfa1712c293601',
+    )
+
+    reloaded_backend.set_contract_address('other-key', '0xd3cda913deb6f67967b99d67acdfa1712c293602')
+    assert backend.get_contract_addresses('other-key') == (
+        '0xd3cda913deb6f67967b99d67acdfa1712c293602',
+    )
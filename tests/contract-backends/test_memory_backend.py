@@ -0,0 +1,38 @@
+import pytest
+
+from populus.config import Config
+from populus.contracts.exceptions import NoKnownAddress
+from populus.contracts.backends.memory import MemoryBackend
+
+
+ADDRESS = '0xd3cda913deb6f67967b99d67acdfa1712c293601'
+
+
+@pytest.fixture
+def backend():
+    return MemoryBackend(None, Config({}))
+
+
+def test_setting_and_getting_an_address(backend):
+    backend.set_contract_address('some-key', ADDRESS)
+
+    assert backend.get_contract_addresses('some-key') == {ADDRESS}
+
+    with pytest.raises(NoKnownAddress):
+        backend.get_contract_addresses('other-key')
+
+
+def test_deploy_info(backend):
+    backend.set_contract_address('some-key', ADDRESS)
+    assert backend.get_deploy_info('some-key', ADDRESS) is None
+
+    backend.set_deploy_info('some-key', ADDRESS, {
+        'block_number': 12,
+        'transaction_hash': '0xabcd',
+    })
+
+    assert backend.get_deploy_info('some-key', ADDRESS) == {
+        'block_number': 12,
+        'transaction_hash': '0xabcd',
+    }
+    assert backend.get_deploy_info('other-key', ADDRESS) is None
@@ -0,0 +1,126 @@
+import pytest
+
+import json
+import os
+
+from populus.config import Config
+from populus.contracts.exceptions import NoKnownAddress
+from populus.contracts.backends.sqlite import SQLiteBackend
+
+
+FILE_NAME = './registrar.sqlite3'
+
+ADDRESS_A = '0xd3cda913deb6f67967b99d67acdfa1712c293601'
+ADDRESS_B = '0xd3cda913deb6f67967b99d67acdfa1712c293602'
+
+
+@pytest.fixture
+def backend_config():
+    return Config({
+        'file_path': FILE_NAME,
+    })
+
+
+@pytest.fixture
+def backend(project_dir, chain, backend_config):
+    sqlite_backend = SQLiteBackend(chain, backend_config)
+    yield sqlite_backend
+    sqlite_backend.teardown_backend()
+
+
+def test_is_registrar_only(backend):
+    assert backend.is_provider is False
+    assert backend.is_registrar is True
+
+
+def test_setting_and_getting_an_address(project_dir, backend, web3):
+    backend.set_contract_address('some-key', ADDRESS_A)
+
+    assert os.path.exists(os.path.join(project_dir, FILE_NAME))
+    assert backend.get_contract_addresses('some-key') == (ADDRESS_A,)
+
+
+def test_getting_an_unknown_address(project_dir, backend, web3):
+    with pytest.raises(NoKnownAddress):
+        backend.get_contract_addresses('some-key')
+
+
+def test_database_uses_wal_mode(project_dir, backend, web3):
+    journal_mode = backend.connection.execute('PRAGMA journal_mode').fetchone()[0]
+    assert journal_mode.lower() == 'wal'
+
+
+def test_deploy_info(project_dir, backend, web3):
+    backend.set_contract_address('some-key', ADDRESS_A)
+    assert backend.get_deploy_info('some-key', ADDRESS_A) is None
+
+    backend.set_deploy_info('some-key', ADDRESS_A, {
+        'block_number': 12,
+        'transaction_hash': '0xabcd',
+    })
+
+    assert backend.get_deploy_info('some-key', ADDRESS_A) == {
+        'block_number': 12,
+        'transaction_hash': '0xabcd',
+    }
+
+
+def test_batched_writes_are_visible_to_other_connections_on_exit(project_dir,
+                                                                 chain,
+                                                                 backend,
+                                                                 backend_config):
+    other_backend = SQLiteBackend(chain, backend_config)
+
+    with backend.batch():
+        backend.set_contract_address('key-a', ADDRESS_A)
+        backend.set_contract_address('key-b', ADDRESS_B)
+
+        assert backend.get_contract_addresses('key-a') == (ADDRESS_A,)
+        with pytest.raises(NoKnownAddress):
+            other_backend.get_contract_addresses('key-a')
+
+    assert other_backend.get_contract_addresses('key-a') == (ADDRESS_A,)
+    assert other_backend.get_contract_addresses('key-b') == (ADDRESS_B,)
+    other_backend.teardown_backend()
+
+
+def test_cache_version_changes_with_writes_from_other_connections(project_dir,
+                                                                  chain,
+                                                                  backend,
+                                                                  backend_config):
+    other_backend = SQLiteBackend(chain, backend_config)
+
+    cache_version = backend.get_cache_version()
+    assert backend.get_cache_version() == cache_version
+
+    other_backend.set_contract_address('some-key', ADDRESS_A)
+
+    assert backend.get_cache_version() != cache_version
+    other_backend.teardown_backend()
+
+
+def test_registrar_json_round_trip(project_dir, chain, backend):
+    backend.set_contract_address('some-key', ADDRESS_A)
+    backend.set_deploy_info('some-key', ADDRESS_A, {
+        'block_number': 12,
+        'transaction_hash': '0xabcd',
+    })
+
+    registrar_path = backend.export_registrar_file(os.path.join(project_dir, 'registrar.json'))
+    with open(registrar_path) as registrar_file:
+        registrar_data = json.load(registrar_file)
+
+    assert len(registrar_data['deployments']) == 1
+    chain_deployments = tuple(registrar_data['deployments'].values())[0]
+    assert chain_deployments == {'some-key': ADDRESS_A}
+
+    imported_backend = SQLiteBackend(chain, Config({'file_path': './imported.sqlite3'}))
+    imported_backend.import_registrar_file(registrar_path)
+
+    assert imported_backend.get_contract_addresses('some-key') == (ADDRESS_A,)
+    assert imported_backend.get_deploy_info('some-key', ADDRESS_A) == {
+        'block_number': 12,
+        'transaction_hash': '0xabcd',
+    }
+    assert imported_backend.export_registrar_data() == registrar_data
+    imported_backend.teardown_backend()
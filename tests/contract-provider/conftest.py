@@ -9,3 +9,28 @@ def inject_contracts(request):
     for fixture_path in ('Math.sol', 'Library13.sol', 'Multiply13.sol'):
         if fixture_path not in test_fn._populus_contract_fixtures:
             test_fn._populus_contract_fixtures.append(fixture_path)
+
+
+class FakeEth(object):
+    def __init__(self):
+        self.blockNumber = 1
+        self.code = '0x'
+        self.get_code_calls = []
+
+    def getCode(self, address, block_identifier=None):
+        self.get_code_calls.append((address, block_identifier))
+        return self.code
+
+
+class FakeWeb3(object):
+    def __init__(self):
+        self.eth = FakeEth()
+
+
+@pytest.fixture()
+def fake_web3():
+    """
+    Stand-in for `web3` which serves `fake_web3.eth.code` for every address
+    and records each `getCode` call in `fake_web3.eth.get_code_calls`.
+    """
+    return FakeWeb3()
@@ -0,0 +1,97 @@
+import pytest
+
+from populus.contracts.cache import (
+    BytecodeVerificationCache,
+)
+from populus.contracts.exceptions import (
+    BytecodeMismatch,
+)
+
+
+ADDRESS = '0xd3cda913deb6f67967b99d67acdfa1712c293601'
+BYTECODE = '0x606060405260e060020a6000350463'
+
+
+def test_verdict_is_reused_within_a_block(fake_web3):
+    web3 = fake_web3
+    web3.eth.code = BYTECODE
+    verification_cache = BytecodeVerificationCache(confirmations=None)
+
+    verification_cache.verify_contract_bytecode(web3, BYTECODE, ADDRESS)
+    verification_cache.verify_contract_bytecode(web3, BYTECODE, ADDRESS)
+    assert len(web3.eth.get_code_calls) == 1
+
+    web3.eth.blockNumber += 1
+    verification_cache.verify_contract_bytecode(web3, BYTECODE, ADDRESS)
+    assert len(web3.eth.get_code_calls) == 2
+
+
+def test_mismatch_is_recorded_and_rechecked_in_later_blocks(fake_web3):
+    web3 = fake_web3
+    verification_cache = BytecodeVerificationCache()
+
+    for _ in range(2):
+        with pytest.raises(BytecodeMismatch):
+            verification_cache.verify_contract_bytecode(web3, BYTECODE, ADDRESS)
+    assert len(web3.eth.get_code_calls) == 1
+
+    # The contract is deployed in a later block.
+    web3.eth.blockNumber += 1
+    web3.eth.code = BYTECODE
+    verification_cache.verify_contract_bytecode(web3, BYTECODE, ADDRESS)
+    assert len(web3.eth.get_code_calls) == 2
+
+
+def test_match_is_final_after_confirmations(fake_web3):
+    web3 = fake_web3
+    web3.eth.code = BYTECODE
+    verification_cache = BytecodeVerificationCache(confirmations=2)
+
+    verification_cache.verify_contract_bytecode(web3, BYTECODE, ADDRESS)
+    web3.eth.blockNumber += 2
+    verification_cache.verify_contract_bytecode(web3, BYTECODE, ADDRESS)
+    assert len(web3.eth.get_code_calls) == 2
+
+    # Neither the block number nor the code are looked at again.
+    web3.eth.blockNumber += 1
+    web3.eth.code = '0x'
+    verification_cache.verify_contract_bytecode(web3, BYTECODE, ADDRESS)
+    assert len(web3.eth.get_code_calls) == 2
+
+
+def test_verdicts_are_keyed_by_expected_bytecode(fake_web3):
+    web3 = fake_web3
+    web3.eth.code = BYTECODE
+    verification_cache = BytecodeVerificationCache()
+
+    verification_cache.verify_contract_bytecode(web3, BYTECODE, ADDRESS)
+    with pytest.raises(BytecodeMismatch):
+        verification_cache.verify_contract_bytecode(web3, '0x6060', ADDRESS)
+
+
+def test_confirmations_are_counted_from_the_deploy_block(fake_web3):
+    web3 = fake_web3
+    web3.eth.code = BYTECODE
+    web3.eth.blockNumber = 20
+    verification_cache = BytecodeVerificationCache(confirmations=12)
+
+    verification_cache.verify_contract_bytecode(web3, BYTECODE, ADDRESS, lambda: 5)
+    assert len(web3.eth.get_code_calls) == 1
+
+    # The match is final the first time it is seen.
+    web3.eth.blockNumber += 1
+    web3.eth.code = '0x'
+    verification_cache.verify_contract_bytecode(web3, BYTECODE, ADDRESS, lambda: 5)
+    assert len(web3.eth.get_code_calls) == 1
+
+
+def test_unknown_deploy_block_counts_from_the_first_match(fake_web3):
+    web3 = fake_web3
+    web3.eth.code = BYTECODE
+    web3.eth.blockNumber = 20
+    verification_cache = BytecodeVerificationCache(confirmations=12)
+
+    verification_cache.verify_contract_bytecode(web3, BYTECODE, ADDRESS, lambda: None)
+    web3.eth.blockNumber += 1
+    verification_cache.verify_contract_bytecode(web3, BYTECODE, ADDRESS, lambda: None)
+    assert len(web3.eth.get_code_calls) == 2
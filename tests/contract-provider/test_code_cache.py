@@ -0,0 +1,58 @@
+from populus.contracts.cache import (
+    BytecodeVerificationCache,
+    CodeCache,
+)
+
+
+ADDRESS = '0xd3cda913deb6f67967b99d67acdfa1712c293601'
+BYTECODE = '0x606060405260e060020a6000350463'
+
+
+def test_code_is_fetched_once_per_block(fake_web3):
+    web3 = fake_web3
+    web3.eth.code = BYTECODE
+    code_cache = CodeCache()
+
+    assert code_cache.get_code(web3, ADDRESS) == BYTECODE
+    assert code_cache.get_code(web3, ADDRESS, 1) == BYTECODE
+    assert web3.eth.get_code_calls == [(ADDRESS, 1)]
+
+    web3.eth.blockNumber += 1
+    assert code_cache.get_code(web3, ADDRESS) == BYTECODE
+    assert web3.eth.get_code_calls == [(ADDRESS, 1), (ADDRESS, 2)]
+
+
+def test_verification_cache_reads_code_through_code_cache(fake_web3):
+    web3 = fake_web3
+    web3.eth.code = BYTECODE
+    code_cache = CodeCache()
+    code_cache.get_code(web3, ADDRESS)
+
+    verification_cache = BytecodeVerificationCache(code_cache=code_cache)
+    verification_cache.verify_contract_bytecode(web3, BYTECODE, ADDRESS)
+
+    assert len(web3.eth.get_code_calls) == 1
+
+
+def test_resolving_a_name_fetches_code_once_per_address(chain, monkeypatch):
+    provider = chain.provider
+
+    math_1, _ = provider.deploy_contract('Math')
+    math_2, _ = provider.deploy_contract('Math')
+
+    get_code_calls = []
+    original_get_code = chain.web3.eth.getCode
+
+    def getCode(address, *args, **kwargs):
+        get_code_calls.append(address)
+        return original_get_code(address, *args, **kwargs)
+
+    monkeypatch.setattr(chain.web3.eth, 'getCode', getCode)
+    chain.code_cache.clear()
+    provider.bytecode_verification_cache.clear()
+    chain.registrar.clear_caches()
+
+    math = provider.get_contract('Math')
+
+    assert math.address == math_2.address
+    assert sorted(get_code_calls) == sorted([math_1.address, math_2.address])
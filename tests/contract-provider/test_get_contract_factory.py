@@ -21,6 +21,17 @@ def test_get_contract_factory_with_no_dependencies(chain):
     assert Math.bytecode_runtime == MATH['bytecode_runtime']
 
 
+def test_get_contract_factory_heavy_fields_are_read_on_access(chain):
+    provider = chain.provider
+
+    MATH = chain.project.compiled_contract_data['Math']
+    Math = provider.get_contract_factory('Math')
+
+    assert 'metadata' not in vars(Math)
+    assert Math.metadata == MATH['metadata']
+    assert Math.src_map is None
+
+
 def test_get_contract_factory_with_missing_dependency(chain):
     provider = chain.provider
 
@@ -62,3 +73,28 @@ def test_get_contract_factory_with_dependency_bytecode_mismatch(chain,
 
     with pytest.raises(BytecodeMismatch):
         provider.get_contract_factory('Multiply13')
+
+
+def test_get_contract_factory_uses_linked_bytecode_cache(chain,
+                                                        library_13,
+                                                        monkeypatch):
+    chain.registrar.set_contract_address('Library13', library_13.address)
+
+    Multiply13 = chain.provider.get_contract_factory('Multiply13')
+
+    def link_bytecodes(*args, **kwargs):
+        raise AssertionError("Bytecode should not be linked on a cache hit")
+
+    def get_contract(*args, **kwargs):
+        raise AssertionError("Dependencies should not be resolved on a cache hit")
+
+    monkeypatch.setattr('populus.contracts.provider.link_bytecodes', link_bytecodes)
+
+    # With an empty factory cache the bytecode is taken from the linked
+    # bytecode cache without resolving the dependencies again.
+    chain.provider.clear_caches()
+    monkeypatch.setattr(chain.provider, 'get_contract', get_contract)
+    CachedMultiply13 = chain.provider.get_contract_factory('Multiply13')
+
+    assert CachedMultiply13.bytecode == Multiply13.bytecode
+    assert CachedMultiply13.bytecode_runtime == Multiply13.bytecode_runtime
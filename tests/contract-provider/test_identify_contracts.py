@@ -0,0 +1,29 @@
+def test_identify_contracts(chain):
+    provider = chain.provider
+
+    math, _ = provider.deploy_contract('Math')
+    library_13, _ = provider.deploy_contract('Library13')
+    multiply_13, _ = provider.deploy_contract('Multiply13')
+
+    unknown_address = chain.web3.eth.coinbase
+
+    assert provider.identify_contracts([
+        math.address,
+        library_13.address,
+        multiply_13.address,
+        unknown_address,
+        math.address,
+    ]) == {
+        math.address: ('Math',),
+        library_13.address: ('Library13',),
+        multiply_13.address: ('Multiply13',),
+        unknown_address: tuple(),
+    }
+
+
+def test_code_fingerprint_index_is_cached(chain):
+    provider = chain.provider
+
+    code_fingerprint_index = provider.get_code_fingerprint_index()
+
+    assert provider.get_code_fingerprint_index() is code_fingerprint_index
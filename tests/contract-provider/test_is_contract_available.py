@@ -65,3 +65,37 @@ def test_contract_availability_with_dependency(chain,
 
     is_available = provider.is_contract_available('Multiply13')
     assert is_available is True
+
+
+def test_contract_availability_is_resolved_once_per_block(chain,
+                                                          library_13,
+                                                          multiply_13,
+                                                          monkeypatch):
+    provider = chain.provider
+    registrar = chain.registrar
+
+    registrar.set_contract_address('Library13', library_13.address)
+    registrar.set_contract_address('Multiply13', multiply_13.address)
+
+    checked_contracts = []
+    is_contract_deployed = type(provider)._is_contract_deployed
+
+    def _is_contract_deployed(self, contract_identifier):
+        checked_contracts.append(contract_identifier)
+        return is_contract_deployed(self, contract_identifier)
+
+    monkeypatch.setattr(type(provider), '_is_contract_deployed', _is_contract_deployed)
+
+    assert provider.resolve_contract_availability(['Multiply13']) == {
+        'Library13': True,
+        'Multiply13': True,
+    }
+    assert provider.is_contract_available('Multiply13') is True
+    assert provider.are_contract_dependencies_available('Multiply13') is True
+
+    assert checked_contracts == ['Library13', 'Multiply13']
+
+    # Setting an address discards the recorded results.
+    registrar.set_contract_address('Math', library_13.address)
+    assert provider.is_contract_available('Library13') is True
+    assert checked_contracts == ['Library13', 'Multiply13', 'Library13']
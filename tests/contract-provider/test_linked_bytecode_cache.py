@@ -0,0 +1,45 @@
+from populus.contracts.cache import (
+    LinkedBytecodeCache,
+    get_linked_bytecode_cache_key,
+)
+
+
+LINKED_BYTECODES = {
+    'bytecode': '0x6060d3cda913deb6f67967b99d67acdfa1712c293601',
+    'bytecode_runtime': '0x60d3cda913deb6f67967b99d67acdfa1712c293601',
+}
+
+ARTIFACT_HASHES = {
+    'Multiply13': 'multiply-13-hash',
+    'Library13': 'library-13-hash',
+}
+
+
+def test_cache_key_covers_artifacts_addresses_and_block():
+    cache_key = get_linked_bytecode_cache_key('Multiply13', ARTIFACT_HASHES, 1, 10)
+
+    assert cache_key == get_linked_bytecode_cache_key(
+        'Multiply13',
+        dict(ARTIFACT_HASHES),
+        1,
+        10,
+    )
+    assert cache_key != get_linked_bytecode_cache_key(
+        'Multiply13',
+        dict(ARTIFACT_HASHES, Library13='other-library-13-hash'),
+        1,
+        10,
+    )
+    assert cache_key != get_linked_bytecode_cache_key('Multiply13', ARTIFACT_HASHES, 2, 10)
+    assert cache_key != get_linked_bytecode_cache_key('Multiply13', ARTIFACT_HASHES, 1, 11)
+
+
+def test_linked_bytecode_cache():
+    linked_bytecode_cache = LinkedBytecodeCache()
+
+    assert linked_bytecode_cache.get('key') is None
+    linked_bytecode_cache.set('key', LINKED_BYTECODES)
+    assert linked_bytecode_cache.get('key') == LINKED_BYTECODES
+
+    linked_bytecode_cache.clear()
+    assert linked_bytecode_cache.get('key') is None
@@ -0,0 +1,69 @@
+from populus.config import Config
+from populus.contracts.backends.filesystem import JSONFileBackend
+from populus.contracts.registrar import Registrar
+
+
+def test_chain_owns_provider_and_registrar(chain):
+    assert chain.provider is chain.provider
+    assert chain.registrar is chain.registrar
+
+
+def test_contract_factories_are_cached(chain):
+    Math = chain.provider.get_contract_factory('Math')
+
+    assert chain.provider.get_contract_factory('Math') is Math
+
+
+def test_factory_cache_invalidated_by_set_contract_address(chain, library_13):
+    Math = chain.provider.get_contract_factory('Math')
+
+    chain.registrar.set_contract_address('Library13', library_13.address)
+
+    assert chain.provider.get_contract_factory('Math') is not Math
+
+
+def test_factory_cache_invalidated_by_new_compiled_data(chain):
+    Math = chain.provider.get_contract_factory('Math')
+
+    project = chain.project
+    source_mtime = project.get_source_modification_time()
+    project.fill_contracts_cache(project.compiled_contract_data, source_mtime - 10)
+
+    assert chain.provider.get_contract_factory('Math') is not Math
+
+
+def test_registrar_address_cache_invalidated_by_set_contract_address(chain,
+                                                                     math,
+                                                                     library_13):
+    registrar = chain.registrar
+
+    registrar.set_contract_address('Math', math.address)
+    assert registrar.get_contract_addresses('Math') == (math.address,)
+
+    address_version = registrar.address_version
+    registrar.set_contract_address('Math', library_13.address)
+
+    assert registrar.address_version > address_version
+    assert set(registrar.get_contract_addresses('Math')) == {
+        math.address,
+        library_13.address,
+    }
+
+
+def test_registrar_address_cache_invalidated_by_other_processes(project_dir,
+                                                               chain,
+                                                               math,
+                                                               library_13):
+    backend_config = Config({'file_path': './registrar.json'})
+    registrar = Registrar(chain, {'JSONFile': JSONFileBackend(chain, backend_config)})
+    # Stands in for another process writing to the same registrar file.
+    other_backend = JSONFileBackend(chain, backend_config)
+
+    registrar.set_contract_address('Math', math.address)
+    assert registrar.get_contract_addresses('Math') == (math.address,)
+    address_version = registrar.get_cache_version()
+
+    other_backend.set_contract_address('Math', library_13.address)
+
+    assert registrar.get_cache_version() > address_version
+    assert registrar.get_contract_addresses('Math') == (library_13.address,)
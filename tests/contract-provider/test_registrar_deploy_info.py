@@ -0,0 +1,50 @@
+from populus.contracts import registrar as registrar_module
+
+
+def test_deploy_info_is_recorded_on_deploy(chain):
+    math, deploy_txn_hash = chain.provider.deploy_contract('Math')
+    deploy_receipt = chain.web3.eth.getTransactionReceipt(deploy_txn_hash)
+
+    assert chain.registrar.get_deploy_info('Math', math.address) == {
+        'block_number': deploy_receipt['blockNumber'],
+        'transaction_hash': deploy_txn_hash,
+    }
+
+
+def test_addresses_sorted_by_recorded_deploy_block(chain, monkeypatch):
+    provider = chain.provider
+
+    math_1, _ = provider.deploy_contract('Math')
+    math_2, _ = provider.deploy_contract('Math')
+
+    def find_deploy_block_number(web3, address):
+        raise AssertionError("Deploy block should not be searched for")
+
+    monkeypatch.setattr(registrar_module, 'find_deploy_block_number', find_deploy_block_number)
+
+    assert chain.registrar.get_contract_addresses('Math')[0] == math_2.address
+
+
+def test_legacy_entries_are_backfilled_once(chain, monkeypatch):
+    math_1, _ = chain.provider.deploy_contract('Math')
+    math_2, _ = chain.provider.deploy_contract('Math')
+
+    registrar = chain.registrar
+    for backend in registrar.registrar_backends.values():
+        backend.deploy_info.clear()
+
+    search_count = []
+    original_find_deploy_block_number = registrar_module.find_deploy_block_number
+
+    def find_deploy_block_number(web3, address):
+        search_count.append(address)
+        return original_find_deploy_block_number(web3, address)
+
+    monkeypatch.setattr(registrar_module, 'find_deploy_block_number', find_deploy_block_number)
+
+    assert registrar.get_contract_addresses('Math')[0] == math_2.address
+    assert len(search_count) == 2
+
+    registrar.clear_caches()
+    assert registrar.get_contract_addresses('Math')[0] == math_2.address
+    assert len(search_count) == 2
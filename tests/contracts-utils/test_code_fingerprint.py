@@ -0,0 +1,121 @@
+import pytest
+
+from populus.utils.contracts import (
+    CodeFingerprintIndex,
+    compare_bytecode,
+    get_code_fingerprint,
+    get_metadata_length,
+    split_bytecode_metadata,
+)
+
+
+CODE = "6060604052346000575b5b5b60358060186000396000f30060606040525b60005600"
+
+SWARM_METADATA = "a165627a7a72305820" + "ff" * 32 + "0029"
+# A map of `bzzr0` and `solc` entries as emitted by newer compilers.
+SOLC_METADATA = (
+    "a265627a7a72305820" + "ee" * 32 + "64736f6c6343" + "000506" + "0032"
+)
+
+
+@pytest.mark.parametrize(
+    "bytecode,expected",
+    (
+        ("0x", 0),
+        ("0x00", 0),
+        ("0x" + CODE, 0),
+        ("0x" + CODE + SWARM_METADATA, 43),
+        ("0x" + CODE + SOLC_METADATA, 52),
+        ("0x" + SWARM_METADATA, 43),
+        # length bytes which do not point at a CBOR map
+        ("0x" + CODE + SWARM_METADATA[:-4] + "0028", 0),
+        # map which does not fill the section
+        ("0x" + CODE + SWARM_METADATA[:-4] + "ff" + "002a", 0),
+    ),
+)
+def test_get_metadata_length(bytecode, expected):
+    executable, metadata = split_bytecode_metadata(bytecode)
+    assert len(metadata) == expected
+    assert get_metadata_length(executable + metadata) == expected
+
+
+def test_fingerprint_ignores_metadata_contents():
+    left = "0x" + CODE + SWARM_METADATA
+    right = "0x" + CODE + SWARM_METADATA.replace("ff", "11")
+
+    assert get_code_fingerprint(left) == get_code_fingerprint(right)
+    assert get_code_fingerprint(left) == get_code_fingerprint(left[2:])
+    assert compare_bytecode(left, right) is True
+
+
+def test_fingerprint_detects_code_and_metadata_length_changes():
+    fingerprint = get_code_fingerprint("0x" + CODE + SWARM_METADATA)
+
+    assert get_code_fingerprint("0x" + CODE[:-2] + "01" + SWARM_METADATA) != fingerprint
+    assert get_code_fingerprint("0x" + CODE + SOLC_METADATA) != fingerprint
+    assert get_code_fingerprint("0x" + CODE) != fingerprint
+
+
+def test_unlinked_bytecode_is_compared_as_text():
+    unlinked = "0x60__Math____________________________________60"
+
+    with pytest.raises(ValueError):
+        get_code_fingerprint(unlinked)
+
+    assert compare_bytecode(unlinked, unlinked) is True
+    assert compare_bytecode(unlinked, "0x6060") is False
+
+
+LIBRARY_ADDRESS = "d3cda913deb6f67967b99d67acdfa1712c293601"
+
+INDEXED_CONTRACTS = {
+    'Math': {'bytecode_runtime': "0x" + CODE + SWARM_METADATA},
+    'MathCopy': {'bytecode_runtime': "0x" + CODE + SOLC_METADATA.replace("ee", "22")},
+    'Multiply13': {
+        'bytecode_runtime': "0x73__Library13_____________________________" + CODE + SWARM_METADATA,
+    },
+    'Abstract': {'bytecode_runtime': "0x"},
+    'Interface': {},
+}
+
+
+def test_code_fingerprint_index_identifies_linked_code():
+    code_fingerprint_index = CodeFingerprintIndex(INDEXED_CONTRACTS)
+
+    assert code_fingerprint_index.identify("0x" + CODE + SWARM_METADATA.replace("ff", "11")) == (
+        'Math',
+    )
+    assert code_fingerprint_index.identify("0x" + CODE + SOLC_METADATA) == ('MathCopy',)
+    assert code_fingerprint_index.identify(
+        "0x73" + LIBRARY_ADDRESS + CODE + SWARM_METADATA
+    ) == ('Multiply13',)
+
+
+def test_code_fingerprint_index_uses_stored_link_references():
+    contracts = {
+        'Multiply13': dict(
+            INDEXED_CONTRACTS['Multiply13'],
+            link_references_runtime=[{'name': 'Library13', 'offset': 2, 'length': 40}],
+        ),
+    }
+    code_fingerprint_index = CodeFingerprintIndex(contracts)
+
+    assert code_fingerprint_index.identify(
+        "0x73" + LIBRARY_ADDRESS + CODE + SWARM_METADATA
+    ) == ('Multiply13',)
+
+
+@pytest.mark.parametrize(
+    "bytecode",
+    (
+        None,
+        "0x",
+        "0x" + CODE,
+        "0x74" + LIBRARY_ADDRESS + CODE + SWARM_METADATA,
+        "0x__Library13_____________________________",
+    ),
+)
+def test_code_fingerprint_index_unknown_code(bytecode):
+    code_fingerprint_index = CodeFingerprintIndex(INDEXED_CONTRACTS)
+
+    assert code_fingerprint_index.identify(bytecode) == tuple()
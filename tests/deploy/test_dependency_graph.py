@@ -0,0 +1,75 @@
+import pytest
+
+from populus.utils.deploy import (
+    DependencyGraph,
+    compute_deploy_order,
+)
+
+
+#
+# A -> (B, C)
+# B -> null
+# C -> (E,)
+# D -> (B, E)
+# E -> (B,)
+#
+SHALLOW_DEPENDENCY_GRAPH = {
+    'A': {'B', 'C'},
+    'B': set(),
+    'C': {'E'},
+    'D': {'B', 'E'},
+    'E': {'B'},
+}
+
+
+@pytest.fixture()
+def dependency_graph():
+    return DependencyGraph(SHALLOW_DEPENDENCY_GRAPH)
+
+
+def test_dependency_graph_levels(dependency_graph):
+    assert dependency_graph.levels == (
+        frozenset({'B'}),
+        frozenset({'E'}),
+        frozenset({'C', 'D'}),
+        frozenset({'A'}),
+    )
+    assert list(dependency_graph.deploy_order) == compute_deploy_order(
+        SHALLOW_DEPENDENCY_GRAPH,
+    )
+
+
+@pytest.mark.parametrize(
+    'contract_name,expected',
+    (
+        ('A', {'B', 'C', 'E'}),
+        ('B', set()),
+        ('C', {'B', 'E'}),
+        ('D', {'B', 'E'}),
+        ('E', {'B'}),
+        ('Unknown', set()),
+    ),
+)
+def test_dependency_graph_transitive_closure(dependency_graph, contract_name, expected):
+    assert dependency_graph.get_dependencies(contract_name) == expected
+
+
+def test_dependency_graph_deploy_order(dependency_graph):
+    assert dependency_graph.get_deploy_order(['A']) == ('B', 'E', 'C', 'A')
+    assert dependency_graph.get_deploy_order(['D', 'C']) == ('B', 'E', 'C', 'D')
+    assert dependency_graph.get_dependency_deploy_order('A') == ('B', 'E', 'C')
+    assert dependency_graph.get_dependency_deploy_order('B') == tuple()
+
+
+def test_dependency_graph_closure_of_a_wide_graph():
+    # Every contract depends on every contract before it, which would expand
+    # exponentially without memoization.
+    contract_names = ['C{0}'.format(index) for index in range(60)]
+    shallow_dependency_graph = {
+        contract_name: set(contract_names[:index])
+        for index, contract_name in enumerate(contract_names)
+    }
+    dependency_graph = DependencyGraph(shallow_dependency_graph)
+
+    assert dependency_graph.get_dependencies('C59') == set(contract_names[:59])
+    assert dependency_graph.get_deploy_order(['C59']) == tuple(contract_names)
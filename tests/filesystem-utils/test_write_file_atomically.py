@@ -0,0 +1,36 @@
+import os
+import stat
+
+from populus.utils.filesystem import (
+    DEFAULT_FILE_MODE,
+    write_file_atomically,
+)
+
+
+def test_write_file_atomically(temporary_dir):
+    file_path = os.path.join(temporary_dir, 'sub-dir', 'file.json')
+
+    write_file_atomically(file_path, '{"a": 1}')
+
+    with open(file_path) as written_file:
+        assert written_file.read() == '{"a": 1}'
+    assert os.listdir(os.path.dirname(file_path)) == ['file.json']
+
+
+def test_write_file_atomically_uses_default_file_mode(temporary_dir):
+    file_path = os.path.join(temporary_dir, 'file.json')
+
+    write_file_atomically(file_path, '{}')
+
+    assert stat.S_IMODE(os.stat(file_path).st_mode) == DEFAULT_FILE_MODE
+
+
+def test_write_file_atomically_keeps_existing_file_mode(temporary_dir):
+    file_path = os.path.join(temporary_dir, 'file.json')
+    with open(file_path, 'w') as existing_file:
+        existing_file.write('{}')
+    os.chmod(file_path, 0o640)
+
+    write_file_atomically(file_path, '{"a": 1}')
+
+    assert stat.S_IMODE(os.stat(file_path).st_mode) == 0o640
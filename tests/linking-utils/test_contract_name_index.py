@@ -0,0 +1,58 @@
+import pytest
+
+from populus.utils.linking import (
+    ContractNameIndex,
+    expand_shortened_reference_name,
+)
+
+
+ALL_FULL_NAMES = (
+    'ShortName',
+    '__ShortName',
+    'ShortName__',
+    '__ShortName__',
+    '_LongNameStartsWithUnderscore1234567890123456789012345678901234567890',
+    'LongName1234567890123456789012345678901234567890123456789012345678901',
+    'EndsWithUnderscores__________________________________________________',
+    '____StartsAndEndsWithUnderscores_____________________________________',
+)
+
+
+@pytest.fixture()
+def contract_name_index():
+    return ContractNameIndex(ALL_FULL_NAMES)
+
+
+def test_contract_name_index_membership(contract_name_index):
+    assert len(contract_name_index) == len(ALL_FULL_NAMES)
+    assert tuple(contract_name_index) == tuple(sorted(ALL_FULL_NAMES))
+    assert 'ShortName' in contract_name_index
+    assert 'Short' not in contract_name_index
+
+
+def test_get_names_with_prefix(contract_name_index):
+    assert contract_name_index.get_names_with_prefix('ShortName') == (
+        'ShortName',
+        'ShortName__',
+    )
+    assert contract_name_index.get_names_with_prefix('LongName123') == (
+        'LongName1234567890123456789012345678901234567890123456789012345678901',
+    )
+    assert contract_name_index.get_names_with_prefix('Missing') == tuple()
+
+
+@pytest.mark.parametrize(
+    'name',
+    ALL_FULL_NAMES,
+)
+def test_expand_shortened_reference_names_with_index(contract_name_index, name):
+    short_name = name[:36]
+    assert expand_shortened_reference_name(short_name, contract_name_index) == name
+
+
+def test_expand_with_index_rejects_ambiguous_names():
+    contract_name_index = ContractNameIndex(('MathLibrary', 'MathLibraryV2'))
+    with pytest.raises(ValueError):
+        expand_shortened_reference_name('MathLib', contract_name_index)
+    with pytest.raises(ValueError):
+        expand_shortened_reference_name('Unknown', contract_name_index)
@@ -0,0 +1,79 @@
+import pytest
+
+from populus.contracts.exceptions import (
+    InvalidLinkValue,
+)
+from populus.utils.linking import (
+    find_link_references,
+    link_bytecode,
+    link_bytecode_by_name,
+    link_bytecodes,
+)
+
+
+MATH_ADDRESS = '0xd3cda913deb6f67967b99d67acdfa1712c293601'
+LIBRARY_ADDRESS = '0x5b2063246f2191f18f2675cedb8b28102e957458'
+
+BYTECODE = '0x6060__MathLib_______________________________6060__Library13_____________________________'
+BYTECODE_RUNTIME = '0x60__Library13_____________________________'
+
+FULL_NAMES = ('MathLib', 'Library13')
+
+
+def test_link_bytecode_replaces_all_references():
+    link_references = find_link_references(BYTECODE, FULL_NAMES)
+    linked_bytecode = link_bytecode(BYTECODE, (
+        (link_references[0], MATH_ADDRESS),
+        (link_references[1], LIBRARY_ADDRESS),
+    ))
+    assert linked_bytecode == (
+        '0x6060d3cda913deb6f67967b99d67acdfa1712c29360160605b2063246f2191f18f2675cedb8b28102e957458'
+    )
+
+
+def test_link_bytecode_by_name():
+    assert link_bytecode_by_name(
+        BYTECODE,
+        MathLib=MATH_ADDRESS,
+        Library13=LIBRARY_ADDRESS,
+    ) == (
+        '0x6060d3cda913deb6f67967b99d67acdfa1712c29360160605b2063246f2191f18f2675cedb8b28102e957458'
+    )
+
+
+def test_link_bytecode_without_references_is_unchanged():
+    assert link_bytecode('0x606060', ()) == '0x606060'
+
+
+def test_link_bytecode_rejects_values_of_the_wrong_length():
+    link_references = find_link_references(BYTECODE_RUNTIME, FULL_NAMES)
+    with pytest.raises(InvalidLinkValue):
+        link_bytecode(BYTECODE_RUNTIME, ((link_references[0], '0x1234'),))
+
+
+def test_link_bytecodes_links_against_shared_values():
+    linked_bytecodes = link_bytecodes(
+        {'bytecode': BYTECODE, 'bytecode_runtime': BYTECODE_RUNTIME, 'abstract': None},
+        {'MathLib': MATH_ADDRESS, 'Library13': LIBRARY_ADDRESS},
+    )
+    assert linked_bytecodes == {
+        'bytecode': link_bytecode_by_name(
+            BYTECODE,
+            MathLib=MATH_ADDRESS,
+            Library13=LIBRARY_ADDRESS,
+        ),
+        'bytecode_runtime': '0x605b2063246f2191f18f2675cedb8b28102e957458',
+        'abstract': None,
+    }
+
+
+def test_link_bytecodes_uses_provided_link_references():
+    link_references = {'bytecode_runtime': find_link_references(BYTECODE_RUNTIME, FULL_NAMES)}
+    linked_bytecodes = link_bytecodes(
+        {'bytecode_runtime': BYTECODE_RUNTIME},
+        {'Library13': LIBRARY_ADDRESS},
+        link_references,
+    )
+    assert linked_bytecodes == {
+        'bytecode_runtime': '0x605b2063246f2191f18f2675cedb8b28102e957458',
+    }
@@ -0,0 +1,57 @@
+import pytest
+
+from populus.utils.linking import (
+    find_link_references,
+    get_contract_link_references,
+    get_link_reference_index,
+    get_link_references_from_index,
+)
+
+
+FULL_NAMES = ('MathLib', 'Library13', 'Close', 'Together')
+
+BYTECODE = '0x6060__MathLib_______________________________6060__Library13_____________________________'
+
+
+def test_get_link_reference_index():
+    assert get_link_reference_index(BYTECODE) == [
+        {'name': 'MathLib', 'offset': 4, 'length': 40},
+        {'name': 'Library13', 'offset': 48, 'length': 40},
+    ]
+    assert get_link_reference_index('0x606060') == []
+
+
+@pytest.mark.parametrize(
+    'bytecode',
+    (
+        BYTECODE,
+        '0x__Close____________________________________Together__',
+        '0x',
+    ),
+)
+def test_index_round_trips_to_link_references(bytecode):
+    link_reference_index = get_link_reference_index(bytecode)
+    assert get_link_references_from_index(link_reference_index, FULL_NAMES) == (
+        find_link_references(bytecode, FULL_NAMES)
+    )
+
+
+def test_contract_link_references_use_stored_index():
+    # The stored index is trusted over the bytecode.
+    contract_data = {
+        'bytecode': BYTECODE,
+        'link_references': [{'name': 'MathLib', 'offset': 4, 'length': 40}],
+    }
+    link_references = get_contract_link_references(contract_data, FULL_NAMES)
+    assert len(link_references) == 1
+    assert link_references[0].full_name == 'MathLib'
+
+
+def test_contract_link_references_fall_back_to_bytecode():
+    contract_data = {'bytecode_runtime': BYTECODE, 'link_references_runtime': None}
+    link_references = get_contract_link_references(
+        contract_data,
+        FULL_NAMES,
+        field='bytecode_runtime',
+    )
+    assert link_references == find_link_references(BYTECODE, FULL_NAMES)
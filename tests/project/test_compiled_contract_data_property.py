@@ -30,3 +30,51 @@ def test_project_fill_contracts_cache(project):
     # fill with code from the past -> recompilation
     project.fill_contracts_cache(project.compiled_contract_data, source_mtime - 10)
     assert not id(project.compiled_contract_data) == compiled_contract_data_object_id
+
+
+@load_contract_fixture('Math.sol')
+def test_contract_name_index_follows_compiled_contract_data_version(project):
+    contract_name_index = project.contract_name_index
+    version = project.compiled_contract_data_version
+
+    assert 'Math' in contract_name_index
+    assert project.contract_name_index is contract_name_index
+
+    source_mtime = project.get_source_modification_time()
+    project.fill_contracts_cache(project.compiled_contract_data, source_mtime - 10)
+
+    assert project.contract_name_index is not contract_name_index
+    assert project.compiled_contract_data_version > version
+    assert 'Math' in project.contract_name_index
+
+
+@load_contract_fixture('Math.sol')
+def test_dependency_graph_is_computed_once_per_version(project):
+    dependency_graph = project.dependency_graph
+
+    assert 'Math' in dependency_graph.deploy_order
+    assert project.dependency_graph is dependency_graph
+
+    source_mtime = project.get_source_modification_time()
+    project.fill_contracts_cache(project.compiled_contract_data, source_mtime - 10)
+
+    assert project.dependency_graph is not dependency_graph
+
+
+@load_contract_fixture('Math.sol')
+def test_changing_compiler_settings_rebuilds_artifacts(project):
+    assert 'Math' in project.compiled_contract_data
+    assert project.is_built_with_project_compiler()
+
+    other_project = Project()
+    other_project.config['compilation.backend'] = {
+        'class': 'populus.compilation.backends.SolcCombinedJSONBackend',
+        'settings': {
+            'optimize': False,
+        },
+    }
+    assert not other_project.is_built_with_project_compiler()
+
+    assert 'Math' in other_project.compiled_contract_data
+    assert other_project.is_built_with_project_compiler()
+    assert not project.is_built_with_project_compiler()